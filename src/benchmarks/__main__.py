@@ -0,0 +1,70 @@
+from __future__ import annotations
+import argparse
+import sys
+from pathlib import Path
+
+"""
+Microbenchmark suite.
+
+Run from src/:
+    python -m benchmarks run                       # print timings
+    python -m benchmarks run --save-baseline       # store as this machine's baseline
+    python -m benchmarks run --out new.json -k room
+    python -m benchmarks compare                   # this machine's baseline vs a fresh run
+    python -m benchmarks compare old.json new.json
+
+compare exits with status 1 when any case regressed significantly.
+"""
+
+from benchmarks import harness
+from benchmarks.cases import CASES
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_run = sub.add_parser("run", help="run the suite")
+    p_run.add_argument("-k", dest="names", action="append", help="only cases containing this")
+    p_run.add_argument("--repeat", type=int, default=harness.DEFAULT_REPEAT)
+    p_run.add_argument("--out", type=Path, help="write results to this file")
+    p_run.add_argument("--save-baseline", action="store_true",
+                       help=f"write to {harness.BASELINE_DIR.name}/<machine>.json")
+
+    p_cmp = sub.add_parser("compare", help="compare two runs")
+    p_cmp.add_argument("old", type=Path, nargs="?", help="default: this machine's baseline")
+    p_cmp.add_argument("new", type=Path, nargs="?", help="default: run the suite now")
+    p_cmp.add_argument("--min-slowdown", type=float, default=harness.MIN_SLOWDOWN)
+    p_cmp.add_argument("-k", dest="names", action="append")
+
+    args = parser.parse_args(argv)
+
+    if args.cmd == "run":
+        print(f"machine: {harness.machine_key()}")
+        data = harness.run(CASES, args.names, args.repeat)
+        if args.out:
+            harness.save(data, args.out)
+        if args.save_baseline:
+            harness.save(data, harness.baseline_path())
+            print(f"baseline saved to {harness.baseline_path()}")
+        return 0
+
+    old_path = args.old or harness.baseline_path()
+    if not old_path.exists():
+        print(f"no baseline at {old_path}, run with --save-baseline first")
+        return 2
+    old = harness.load(old_path)
+    if args.new:
+        new = harness.load(args.new)
+    else:
+        names = args.names or None
+        new = harness.run(CASES, names)
+    regressions = harness.compare(old, new, args.min_slowdown)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
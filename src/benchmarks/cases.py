@@ -0,0 +1,192 @@
+from __future__ import annotations
+import os
+import random
+from typing import Callable
+
+"""
+Benchmark cases. Each case is a setup function returning the callable to
+time; setup cost is not measured. Rendering runs on the SDL dummy driver.
+"""
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+SCREEN = (960, 540)
+
+CASES: dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def case(name: str):
+    def register(fn):
+        CASES[name] = fn
+        return fn
+    return register
+
+
+def init_display() -> pygame.Surface:
+    if not pygame.display.get_init():
+        pygame.display.init()
+    if not pygame.font.get_init():
+        pygame.font.init()
+    screen = pygame.display.get_surface()
+    if screen is None:
+        screen = pygame.display.set_mode(SCREEN)
+    return screen
+
+
+def _room(num_enemies: int = 0, num_walls: int = 0):
+    from main.room import Room, RoomType, Direction
+    from main.entities import Enemy, Wall, EnemyType
+    from main.layout_templates import NORMAL_ROOM_TEMPLATES
+
+    rng = random.Random(0)
+    types = (EnemyType.BASIC, EnemyType.FAST, EnemyType.HEAVY)
+    template = NORMAL_ROOM_TEMPLATES[4]
+    walls = list(template.walls) + [
+        Wall(rng.randrange(16, 900), rng.randrange(16, 480), 24, 24) for _ in range(num_walls)
+    ]
+    enemies = [
+        Enemy(rng.randrange(40, 920), rng.randrange(40, 500), rng.choice(types))
+        for _ in range(num_enemies)
+    ]
+    room = Room(1, RoomType.NORMAL, (0, 0), *SCREEN,
+                walls=walls, hazards=template.hazards, enemies=enemies)
+    for i, d in enumerate(Direction):
+        room.add_door(d, i + 2)
+    room.build_border_walls()
+    return room
+
+
+def _player():
+    from main.player import Player
+    from main.keybindings import KeyBindings
+    return Player((SCREEN[0] // 2, SCREEN[1] // 2), KeyBindings())
+
+
+# --- Generation ---
+
+@case("dungeon.generate")
+def bench_generate():
+    from main.dungeon_generator import DungeonGenerator
+    seeds = iter(range(10**9))
+    return lambda: DungeonGenerator(seed=next(seeds), num_normal_rooms=6).generate()
+
+
+@case("room.build_border_walls")
+def bench_border_walls():
+    room = _room()
+    return room.build_border_walls
+
+
+# --- Simulation ---
+
+@case("room.update_500_enemies")
+def bench_room_update():
+    room   = _room(num_enemies=500)
+    player = _player()
+    return lambda: room.update(1 / 60, player)
+
+
+@case("room.update_500_enemies_scheduled")
+def bench_room_update_scheduled():
+    from main.ai_scheduler import AIScheduler
+    room   = _room(num_enemies=500)
+    player = _player()
+    ai     = AIScheduler()
+    return lambda: room.update(1 / 60, player, ai)
+
+
+@case("player.wall_collisions_1000")
+def bench_wall_collisions():
+    room   = _room(num_walls=1000)
+    player = _player()
+    walls  = room.all_walls
+    start  = pygame.Vector2(player.pos)
+
+    def run():
+        player.pos.update(start)
+        player.rect.center = (round(start.x), round(start.y))
+        player.wall_collisions(walls)
+    return run
+
+
+@case("room.collide_1000_walls")
+def bench_room_collide():
+    room   = _room(num_walls=1000)
+    player = _player()
+    start  = pygame.Vector2(player.pos)
+    room.collide(player)
+
+    def run():
+        player.pos.update(start)
+        player.rect.center = (round(start.x), round(start.y))
+        room.collide(player)
+    return run
+
+
+# --- Rendering ---
+
+@case("room.build_surface")
+def bench_build_surface():
+    # every static layer tile painted from scratch, plus the one draw
+    screen = init_display()
+    room   = _room()
+
+    def run():
+        room.invalidate_surface()
+        room.draw(screen)
+    return run
+
+
+@case("room.draw")
+def bench_room_draw():
+    screen = init_display()
+    room   = _room(num_enemies=50)
+    room.draw(screen)
+    return lambda: room.draw(screen)
+
+
+@case("room.draw_boss_camera")
+def bench_room_draw_boss_camera():
+    # a 2x2-screen room with enemies all over it, scrolled one step a frame
+    from main.room import Room, RoomType, BOSS_W, BOSS_H
+    from main.entities import Enemy, EnemyType
+    from main.camera import Camera
+    screen = init_display()
+    rng    = random.Random(0)
+    room   = Room(1, RoomType.BOSS, (0, 0), BOSS_W, BOSS_H, enemies=[
+        Enemy(rng.randrange(40, BOSS_W - 40), rng.randrange(40, BOSS_H - 40), EnemyType.BASIC)
+        for _ in range(400)
+    ])
+    room.build_border_walls()
+    camera = Camera(*SCREEN)
+    path   = [(x, BOSS_H // 2) for x in range(0, BOSS_W, 8)]
+    state  = {"i": 0}
+
+    def run():
+        camera.follow(path[state["i"] % len(path)], BOSS_W, BOSS_H)
+        state["i"] += 1
+        room.draw(screen, view=camera.view(1.0), area=camera.area)
+    run()
+    return run
+
+
+@case("ui.title_draw")
+def bench_title_draw():
+    from main.ui import TitleScreen
+    from main.fonts import get_font
+    screen = init_display()
+    title  = TitleScreen(*SCREEN, get_font(24))
+    return lambda: title.draw(screen, [])
+
+
+@case("ui.settings_draw")
+def bench_settings_draw():
+    from main.ui import SettingsMenu
+    from main.keybindings import KeyBindings
+    from main.fonts import get_font
+    screen = init_display()
+    menu   = SettingsMenu(*SCREEN, get_font(24), KeyBindings())
+    return lambda: menu.draw(screen, [])
@@ -0,0 +1,147 @@
+from __future__ import annotations
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+"""
+Timing, baseline storage and run comparison.
+
+Each case is timed as `repeat` samples of `number` calls; `number` is
+calibrated so one sample takes about TARGET_SAMPLE_S. Results store the
+per-call time of every sample so two runs can be compared with Welch's
+t-test.
+"""
+
+BASELINE_DIR    = Path(__file__).resolve().parent / "baselines"
+TARGET_SAMPLE_S = 0.02
+DEFAULT_REPEAT  = 15
+
+# a regression must be statistically significant AND at least this much slower
+MIN_SLOWDOWN = 0.05
+
+# two-sided 95% critical values of Student's t by degrees of freedom
+_T_CRIT = {1: 12.71, 2: 4.30, 3: 3.18, 4: 2.78, 5: 2.57, 6: 2.45, 7: 2.36, 8: 2.31,
+           9: 2.26, 10: 2.23, 12: 2.18, 15: 2.13, 20: 2.09, 25: 2.06, 30: 2.04}
+
+
+def machine_key() -> str:
+    node = platform.node().split(".")[0] or "unknown"
+    py   = f"py{sys.version_info.major}{sys.version_info.minor}"
+    return f"{node}-{platform.system().lower()}-{platform.machine()}-{py}"
+
+
+def time_case(fn: Callable[[], object], repeat: int = DEFAULT_REPEAT) -> dict:
+    fn()    # warm up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= TARGET_SAMPLE_S or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(TARGET_SAMPLE_S / elapsed) + 1))
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+
+    return {
+        "number":  number,
+        "samples": samples,
+        "mean":    statistics.fmean(samples),
+        "median":  statistics.median(samples),
+        "stdev":   statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def run(cases: dict, names: Optional[list[str]] = None, repeat: int = DEFAULT_REPEAT) -> dict:
+    results = {}
+    for name, setup in cases.items():
+        if names and not any(n in name for n in names):
+            continue
+        results[name] = time_case(setup(), repeat)
+        r = results[name]
+        print(f"  {name:<36} {r['median'] * 1e6:12.2f} us  (+-{r['stdev'] * 1e6:.2f}, n={r['number']})")
+    return {
+        "machine": machine_key(),
+        "python":  platform.python_version(),
+        "time":    time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+# --- Storage ---
+
+def baseline_path(key: Optional[str] = None) -> Path:
+    return BASELINE_DIR / f"{key or machine_key()}.json"
+
+
+def save(data: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2))
+
+
+def load(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+# --- Comparison ---
+
+def _t_crit(df: float) -> float:
+    for k in sorted(_T_CRIT):
+        if df <= k:
+            return _T_CRIT[k]
+    return 1.96
+
+
+def welch(a: list[float], b: list[float]) -> tuple[float, float]:
+    # (t statistic, degrees of freedom); positive t means b is slower.
+    # A run with one sample (--repeat 1) has no variance: t = 0, never significant
+    if len(a) < 2 or len(b) < 2:
+        return 0.0, 0.0
+    ma, mb = statistics.fmean(a), statistics.fmean(b)
+    va, vb = statistics.variance(a), statistics.variance(b)
+    na, nb = len(a), len(b)
+    se2 = va / na + vb / nb
+    if se2 == 0:
+        return (math.inf if mb > ma else -math.inf if mb < ma else 0.0), na + nb - 2
+    t  = (mb - ma) / math.sqrt(se2)
+    df = se2 ** 2 / ((va / na) ** 2 / (na - 1) + (vb / nb) ** 2 / (nb - 1))
+    return t, df
+
+
+def compare(old: dict, new: dict, min_slowdown: float = MIN_SLOWDOWN) -> list[str]:
+    # prints a table, returns the names of significant regressions
+    if old.get("machine") != new.get("machine"):
+        print(f"warning: comparing runs from different machines "
+              f"({old.get('machine')} vs {new.get('machine')})")
+
+    regressions = []
+    print(f"  {'case':<36} {'old us':>10} {'new us':>10} {'change':>8}  verdict")
+    for name, n in new["results"].items():
+        o = old["results"].get(name)
+        if o is None:
+            print(f"  {name:<36} {'-':>10} {n['median'] * 1e6:10.2f} {'':>8}  new")
+            continue
+        change = n["median"] / o["median"] - 1 if o["median"] else 0.0
+        t, df  = welch(o["samples"], n["samples"])
+        significant = abs(t) > _t_crit(df)
+        if significant and change > min_slowdown:
+            verdict = "REGRESSION"
+            regressions.append(name)
+        elif significant and change < -min_slowdown:
+            verdict = "faster"
+        else:
+            verdict = "same"
+        print(f"  {name:<36} {o['median'] * 1e6:10.2f} {n['median'] * 1e6:10.2f} "
+              f"{change * 100:+7.1f}%  {verdict}")
+    return regressions
@@ -0,0 +1,91 @@
+from __future__ import annotations
+import gc
+import os
+import sys
+import tracemalloc
+
+"""
+Memory benchmark: bytes per room and regeneration churn, with and without
+the EntityPool.
+
+Run from src/:
+    python -m benchmarks.room_memory [rounds]
+"""
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from main.dungeon_generator import DungeonGenerator
+from main.entities import Wall, Hazard, Enemy
+from main.pools import EntityPool
+
+NUM_NORMALS = 6
+
+
+def bytes_per_room(seed: int = 1) -> float:
+    # retained heap for one freshly generated dungeon
+    gc.collect()
+    tracemalloc.start()
+    before  = tracemalloc.take_snapshot()
+    dungeon = DungeonGenerator(seed=seed, num_normal_rooms=NUM_NORMALS).generate()
+    after   = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    return total / len(dungeon.rooms)
+
+
+def regenerate(rounds: int, pooled: bool) -> dict[str, float]:
+    # simulates mashing R: drop the old dungeon, generate a new one
+    pool = EntityPool() if pooled else None
+    gc.collect()
+    gen2_before = gc.get_stats()[2]["collections"]
+    tracemalloc.start()
+    dungeon = None
+    rooms   = 0
+    for seed in range(rounds):
+        if dungeon is not None and pool is not None:
+            pool.release_dungeon(dungeon)
+        dungeon = DungeonGenerator(seed=seed, num_normal_rooms=NUM_NORMALS,
+                                   pool=pool).generate()
+        rooms += len(dungeon.rooms)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "peak_bytes":       peak,
+        "gen2_collections": gc.get_stats()[2]["collections"] - gen2_before,
+        "entities_created": pool.created if pool else -1,
+        "entities_reused":  pool.reused  if pool else -1,
+        "rooms":            rooms,
+    }
+
+
+def entity_sizes() -> dict[str, int]:
+    sizes = {}
+    for name, obj in (("Wall", Wall(0, 0, 1, 1)),
+                      ("Hazard", Hazard(0, 0, 1, 1)),
+                      ("Enemy", Enemy(0, 0))):
+        size = sys.getsizeof(obj)
+        if hasattr(obj, "__dict__"):
+            size += sys.getsizeof(obj.__dict__)
+        sizes[name] = size
+    return sizes
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print("entity object sizes (bytes, excluding Rect/Vector2 members):")
+    for name, size in entity_sizes().items():
+        print(f"  {name:<7} {size}")
+
+    print(f"\nretained bytes per room : {bytes_per_room():.0f}")
+
+    for pooled in (False, True):
+        r = regenerate(rounds, pooled)
+        label = "pooled" if pooled else "fresh "
+        print(f"{label} x{rounds}: peak {r['peak_bytes'] / 1024:.1f} KiB, "
+              f"gen2 GCs {r['gen2_collections']}, "
+              f"created {r['entities_created']}, reused {r['entities_reused']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,82 @@
+from main.startup import STARTUP      # first, so it can time the imports below
+
+import logging
+import sys
 import pygame
+STARTUP.mark("import pygame")
 
 from main.game import Game
+from main.frame_monitor import FRAME_MONITOR
+from main.assets import ASSETS
+from main.memory_telemetry import MEMORY
+from main.profiler import PROFILER
+from main.config import CONFIG
+STARTUP.mark("import game")
+
+
+def _arg_value(name: str, default: str = "") -> str:
+    # --name=value
+    for arg in sys.argv[1:]:
+        if arg.startswith(name + "="):
+            return arg.split("=", 1)[1]
+    return default
 
 
 def main() -> None:
-    pygame.init()
-    pygame.mixer.init()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    # Only what the title screen needs. The mixer is started on first use
+    # and the dungeon is generated when a run starts.
+    pygame.display.init()
+    pygame.font.init()
     pygame.display.set_caption("Temp Name")
+    STARTUP.mark("pygame init")
+    CONFIG.load()
+    STARTUP.mark("settings")
+
+    net  = None
+    host = _arg_value("--host", "")
+    join = _arg_value("--join", "")
+    if host or join:
+        from main.lockstep import LockstepPeer, DEFAULT_DELAY, DEFAULT_PORT
+        if host:
+            delay = int(_arg_value("--input-delay", str(DEFAULT_DELAY)))
+            net = LockstepPeer.host(int(host), delay=delay)
+        else:
+            address, _, port = join.partition(":")
+            net = LockstepPeer.join(address, int(port or DEFAULT_PORT))
 
-    game = Game()
-    clock = pygame.time.Clock()
+    # flags left out fall back to settings.json (main/config.py)
+    window = _arg_value("--window")
+    scale  = _arg_value("--render-scale")
+    seed   = _arg_value("--seed")
+    game = Game(
+        pacing       = _arg_value("--pacing") or None,
+        window_size  = tuple(int(v) for v in window.split("x")) if window else None,
+        render_scale = float(scale) if scale else None,
+        scale_filter = _arg_value("--scale-filter") or None,
+        net          = net,
+        procedural_rooms = False if "--handmade-rooms" in sys.argv else None,
+        hot_reload       = "--hot-reload" in sys.argv,
+        seed             = int(seed) if seed else None,
+    )
+    FRAME_MONITOR.budget_ms = 1000.0 / game.fps
+    FRAME_MONITOR.manage_gc()
+    if "--memtrace" in sys.argv:
+        MEMORY.start()
+    if "--profile" in sys.argv:
+        PROFILER.capture()
+    elif _arg_value("--profile"):
+        PROFILER.capture(int(_arg_value("--profile")))
 
     running = True
     while running:
-        dt = clock.tick(game.fps) / 1000.0
+        dt = game.pacer.tick(game.fps) / 1000.0
         dt = min(dt, 0.05)
+        FRAME_MONITOR.begin_frame()
+        # profiles are tagged with the state and, in a run, the room type
+        playing = game.state == "playing" and game.dungeon is not None
+        PROFILER.begin_frame(game.state, game.dungeon.current_room.type.value if playing else None)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -25,7 +87,20 @@ def main() -> None:
         game.update(dt)
         game.draw()
         pygame.display.flip()
+        PROFILER.end_frame()
+        FRAME_MONITOR.end_frame()
+        STARTUP.first_frame()
 
+    logging.getLogger("main.pacing").info(game.pacer.report())
+    PROFILER.flush()            # quit mid-capture: keep what was recorded
+    if net is not None:
+        net.close()
+    FRAME_MONITOR.release_gc()
+    ASSETS.shutdown()
+    CONFIG.close()
+    if game.procedural_rooms:
+        from main.interior_generator import INTERIORS
+        INTERIORS.shutdown()
     pygame.quit()
 
 
@@ -0,0 +1,115 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional
+import time
+import numpy as np
+from main.ecs import Archetype, World, ENEMY
+from main import systems
+
+"""
+Time-sliced enemy AI.
+
+Enemy AI is split into two systems (see systems.py):
+    think : expensive decision (target selection, pathing, LOS...)
+    move  : cheap per-frame integration of the last decision
+
+move runs for every enemy every frame. think only re-runs for enemies whose
+decision is older than 1 / decision_hz; the due rows are taken round-robin
+in batches of BATCH until the per-frame microsecond budget is spent.
+Anything left over is deferred to the next frame and shows up in the stats.
+budget_us=None turns the budget off so decisions never depend on wall-clock
+time (lockstep co-op needs both peers to make identical decisions).
+
+To use:
+    ai = AIScheduler(decision_hz=10, budget_us=1500)
+    ai.update(dt, room.world, player_pos)       # once per frame
+    ai.stats.deferred, ai.stats.max_staleness
+"""
+
+DEFAULT_DECISION_HZ = 10.0
+DEFAULT_BUDGET_US   = 1500
+BATCH               = 32       # rows per think() call between budget checks
+
+
+@dataclass
+class AIStats:
+    decisions:       int   = 0     # think() calls this frame
+    deferred:        int   = 0     # due decisions pushed to a later frame
+    total_decisions: int   = 0
+    total_deferred:  int   = 0
+    max_staleness:   float = 0.0   # seconds since the oldest live decision
+    mean_staleness:  float = 0.0
+    used_us:         int   = 0     # time spent in think() this frame
+
+
+class AIScheduler:
+
+    def __init__(
+        self,
+        decision_hz: float = DEFAULT_DECISION_HZ,
+        budget_us:   int | None = DEFAULT_BUDGET_US,
+    ) -> None:
+        self.decision_hz = decision_hz
+        self.budget_us   = budget_us
+        self.clock       = 0.0     # seconds of simulated time
+        self.cursor      = 0       # round-robin start index
+        self.stats       = AIStats()
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.decision_hz if self.decision_hz > 0 else 0.0
+
+    def update(self, dt: float, world: World, player_pos) -> None:
+        self.clock += dt
+        enemies = world.find(ENEMY)
+        self._decide(enemies, player_pos)
+        if enemies is not None:
+            systems.move(enemies, dt)
+
+    # --- Decisions ---
+
+    def _decide(self, enemies: Optional[Archetype], player_pos) -> None:
+        stats    = self.stats
+        clock    = self.clock
+        n        = enemies.count if enemies is not None else 0
+
+        stats.decisions = 0
+        stats.deferred  = 0
+        if n == 0:
+            stats.max_staleness = stats.mean_staleness = 0.0
+            stats.used_us = 0
+            return
+
+        start    = time.perf_counter_ns()
+        deadline = start + self.budget_us * 1000 if self.budget_us is not None else None
+        cursor   = self.cursor % n
+
+        # live rows in round-robin order from the cursor
+        order   = np.roll(np.arange(n), -cursor)
+        live    = order[enemies["alive"][order]]
+        decided = enemies["decided_at"][live]
+        age     = np.where(np.isnan(decided), 0.0, clock - decided)
+        due     = np.isnan(decided) | (age >= self.interval)
+        due_rows = live[due]
+
+        # always make at least one batch of decisions so nobody starves
+        done = 0
+        while done < len(due_rows):
+            if done and deadline is not None and time.perf_counter_ns() >= deadline:
+                break
+            systems.think(enemies, player_pos, due_rows[done:done + BATCH])
+            done += BATCH
+        done = min(done, len(due_rows))
+        enemies["decided_at"][due_rows[:done]] = clock
+        age[np.flatnonzero(due)[:done]] = 0.0
+
+        stats.decisions = done
+        stats.deferred  = len(due_rows) - done
+        # resume from the first deferred enemy, otherwise keep rotating
+        self.cursor = int(due_rows[done]) if stats.deferred else (cursor + 1) % n
+
+        stats.used_us          = (time.perf_counter_ns() - start) // 1000
+        stats.total_decisions += stats.decisions
+        stats.total_deferred  += stats.deferred
+        stats.max_staleness    = float(age.max()) if len(live) else 0.0
+        stats.mean_staleness   = float(age.mean()) if len(live) else 0.0
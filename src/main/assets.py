@@ -0,0 +1,268 @@
+from __future__ import annotations
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+import logging
+import pygame
+
+"""
+Asset manager: background image loading, atlas packing and display-format
+normalisation.
+
+* Files are decoded on a worker thread; pump() (main thread, once a frame)
+  finishes them: convert()/convert_alpha() to the display format, then small
+  sprites are shelf-packed into shared atlas pages.
+* get() hands out SpriteHandles. A handle is (texture, area), which is exactly
+  what Surface.blits() wants, so many sprites from one atlas go out in one
+  batched call:
+        screen.blits([h.blit_args(pos) for h, pos in sprites])
+* Textures are tracked against a byte budget. When it is exceeded the least
+  recently used textures with no acquire()d handles are evicted.
+
+To use:
+    ASSETS.request("player.png")          # start loading early
+    handle = ASSETS.get("player.png")     # None until it has been pumped in
+"""
+
+log = logging.getLogger(__name__)
+
+ASSET_ROOT         = Path("assets")
+DEFAULT_BUDGET     = 64 * 1024 * 1024   # bytes of texture memory
+ATLAS_PAGE_SIZE    = 1024
+MAX_ATLAS_SPRITE   = 128                # larger images get their own texture
+ATLAS_PADDING      = 1
+PUMP_PER_FRAME     = 8
+
+
+def normalize_surface(surface: pygame.Surface) -> pygame.Surface:
+    # Convert once to the display pixel format so blits skip the conversion
+    if pygame.display.get_surface() is None:
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+@dataclass(eq=False)
+class _Texture:
+    surface:  pygame.Surface
+    is_atlas: bool
+    names:    list[str] = field(default_factory=list)
+    refs:     int = 0
+    # shelf packer state, atlas pages only: [y, height, next_x]
+    shelves:  list[list[int]] = field(default_factory=list)
+    next_y:   int = 0
+
+    @property
+    def bytes(self) -> int:
+        return self.surface.get_width() * self.surface.get_height() * self.surface.get_bytesize()
+
+
+@dataclass(eq=False)
+class SpriteHandle:
+    name:    str
+    texture: pygame.Surface
+    area:    pygame.Rect
+    _owner:  _Texture
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.area.size
+
+    def blit_args(self, pos) -> tuple[pygame.Surface, object, pygame.Rect]:
+        return self.texture, pos, self.area
+
+    def subsurface(self) -> pygame.Surface:
+        return self.texture.subsurface(self.area)
+
+
+class AssetManager:
+
+    def __init__(
+        self,
+        root:         Path = ASSET_ROOT,
+        budget_bytes: int  = DEFAULT_BUDGET,
+        page_size:    int  = ATLAS_PAGE_SIZE,
+    ) -> None:
+        self.root         = root
+        self.budget_bytes = budget_bytes
+        self.page_size    = page_size
+
+        self._handles: dict[str, SpriteHandle] = {}
+        self._pending: dict[str, Future] = {}
+        self._lru: OrderedDict[int, _Texture] = OrderedDict()   # id -> texture, oldest first
+        self._pages: list[_Texture] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.evictions = 0
+
+    # --- Loading ---
+
+    def request(self, name: str) -> None:
+        if name in self._handles or name in self._pending:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assets")
+        self._pending[name] = self._executor.submit(pygame.image.load, str(self.root / name))
+
+    def load(self, name: str) -> SpriteHandle:
+        # blocking load, for things needed right now
+        handle = self._handles.get(name)
+        if handle is not None:
+            self._touch(handle._owner)
+            return handle
+        future = self._pending.pop(name, None)
+        surface = future.result() if future is not None else pygame.image.load(str(self.root / name))
+        return self.add(name, surface)
+
+    def get(self, name: str) -> Optional[SpriteHandle]:
+        handle = self._handles.get(name)
+        if handle is None:
+            self.request(name)
+            return None
+        self._touch(handle._owner)
+        return handle
+
+    def pump(self, limit: int = PUMP_PER_FRAME) -> None:
+        # finish background loads on the main thread
+        if not self._pending:
+            return
+        done = [n for n, f in self._pending.items() if f.done()][:limit]
+        for name in done:
+            future = self._pending.pop(name)
+            try:
+                surface = future.result()
+            except (pygame.error, OSError) as e:
+                log.warning("asset %r failed to load: %s", name, e)
+                continue
+            self.add(name, surface)
+
+    # --- Registration ---
+
+    def add(self, name: str, surface: pygame.Surface) -> SpriteHandle:
+        surface = normalize_surface(surface)
+        w, h = surface.get_size()
+
+        if w <= MAX_ATLAS_SPRITE and h <= MAX_ATLAS_SPRITE:
+            page, area = self._pack(w, h)
+            page.surface.blit(surface, area)
+            owner = page
+        else:
+            owner = _Texture(surface, is_atlas=False)
+            area  = surface.get_rect()
+            self._lru[id(owner)] = owner
+
+        owner.names.append(name)
+        handle = SpriteHandle(name, owner.surface, area, owner)
+        self._handles[name] = handle
+        self._touch(owner)
+        self._evict()
+        return handle
+
+    def placeholder(self, name: str, size: tuple[int, int], color) -> SpriteHandle:
+        # solid-colour stand-in until real art exists
+        handle = self._handles.get(name)
+        if handle is not None:
+            return handle
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        surf.fill(pygame.Color(color))
+        return self.add(name, surf)
+
+    # --- Atlas packing ---
+
+    def _new_page(self) -> _Texture:
+        surf = normalize_surface(pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA))
+        surf.fill((0, 0, 0, 0))
+        page = _Texture(surf, is_atlas=True)
+        self._pages.append(page)
+        self._lru[id(page)] = page
+        return page
+
+    def _pack(self, w: int, h: int) -> tuple[_Texture, pygame.Rect]:
+        pw = w + ATLAS_PADDING
+        ph = h + ATLAS_PADDING
+        for page in self._pages:
+            spot = self._place(page, pw, ph)
+            if spot is not None:
+                return page, pygame.Rect(spot[0], spot[1], w, h)
+        page = self._new_page()
+        x, y = self._place(page, pw, ph)
+        return page, pygame.Rect(x, y, w, h)
+
+    def _place(self, page: _Texture, w: int, h: int) -> Optional[tuple[int, int]]:
+        size = self.page_size
+        # best fitting existing shelf
+        best = None
+        for shelf in page.shelves:
+            y, sh, nx = shelf
+            if h <= sh and nx + w <= size and (best is None or sh < best[1]):
+                best = shelf
+        if best is not None:
+            x = best[2]
+            best[2] += w
+            return x, best[0]
+        # the open (last) shelf can still grow taller
+        if page.shelves:
+            last = page.shelves[-1]
+            if last[2] + w <= size and last[0] + h <= size:
+                x = last[2]
+                last[1] = max(last[1], h)
+                last[2] += w
+                page.next_y = last[0] + last[1]
+                return x, last[0]
+        if page.next_y + h <= size:
+            y = page.next_y
+            page.shelves.append([y, h, w])
+            page.next_y += h
+            return 0, y
+        return None
+
+    # --- Budget ---
+
+    def acquire(self, handle: SpriteHandle) -> None:
+        # pin the texture, e.g. while a room that uses it is active
+        handle._owner.refs += 1
+
+    def release(self, handle: SpriteHandle) -> None:
+        handle._owner.refs = max(0, handle._owner.refs - 1)
+
+    @property
+    def used_bytes(self) -> int:
+        return sum(t.bytes for t in self._lru.values())
+
+    def _touch(self, texture: _Texture) -> None:
+        self._lru.move_to_end(id(texture))
+
+    def _evict(self) -> None:
+        used = self.used_bytes
+        if used <= self.budget_bytes:
+            return
+        for key in list(self._lru):
+            if used <= self.budget_bytes:
+                break
+            texture = self._lru[key]
+            if texture.refs > 0 or texture.surface is self._newest_surface():
+                continue
+            del self._lru[key]
+            if texture.is_atlas:
+                self._pages.remove(texture)
+            for name in texture.names:
+                self._handles.pop(name, None)
+            used -= texture.bytes
+            self.evictions += 1
+
+    def _newest_surface(self) -> Optional[pygame.Surface]:
+        # never evict what was just added
+        if not self._lru:
+            return None
+        return next(reversed(self._lru.values())).surface
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+ASSETS = AssetManager()
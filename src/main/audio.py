@@ -0,0 +1,189 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+import logging
+import pygame
+
+"""
+Sound effects and music.
+
+* Every effect in SOUND_FILES is decoded once into a pygame Sound by
+  preload(). play() never touches the disk: unknown or missing names are
+  ignored.
+* play() only queues. flush() (once a frame) coalesces identical requests
+  from the same frame into a single voice, slightly louder, and hands them
+  to a fixed pool of channels. When the pool is full, the lowest priority,
+  oldest voice is stolen if the new sound outranks it.
+* Music streams from disk through pygame.mixer.music.
+* The mixer is only started on first use (see startup.py). If there's no
+  audio device everything here becomes a no-op.
+
+To use:
+    AUDIO.preload()
+    AUDIO.play("hit", priority=1)      # from gameplay code, any number of times
+    AUDIO.flush()                      # once per frame
+    AUDIO.play_music("music/theme.ogg")
+"""
+
+log = logging.getLogger(__name__)
+
+SOUND_ROOT   = Path("assets") / "sounds"
+NUM_CHANNELS = 16
+
+# channels play at CHANNEL_VOLUME, leaving headroom so coalesced duplicates
+# can come out louder (+COALESCE_GAIN each, capped at 1.0)
+CHANNEL_VOLUME = 0.75
+COALESCE_GAIN  = 0.15
+
+
+@dataclass(frozen=True)
+class SoundDef:
+    file:        str
+    volume:      float = 1.0
+    priority:    int   = 0
+    cooldown_ms: int   = 0     # ignore retriggers within this window
+
+
+SOUND_FILES: dict[str, SoundDef] = {
+    "shoot":  SoundDef("shoot.wav",  volume=0.6, priority=1),
+    "hit":    SoundDef("hit.wav",    volume=0.7, priority=2),
+    "hazard": SoundDef("hazard.wav", volume=0.5, priority=0, cooldown_ms=250),
+}
+
+
+class AudioManager:
+
+    def __init__(self, num_channels: int = NUM_CHANNELS) -> None:
+        self.num_channels = num_channels
+        self.enabled      = False
+        self._started     = False
+
+        self._sounds:   dict[str, pygame.mixer.Sound] = {}
+        self._defs:     dict[str, SoundDef] = {}
+        self._last_ms:  dict[str, int] = {}
+        # name -> [count, priority] for this frame
+        self._queued:   dict[str, list[int]] = {}
+
+        self._channels:  list[pygame.mixer.Channel] = []
+        self._chan_prio: list[int] = []
+        self._chan_time: list[int] = []
+
+        self.played    = 0
+        self.coalesced = 0
+        self.stolen    = 0
+        self.dropped   = 0
+
+    # --- Setup ---
+
+    def start(self) -> bool:
+        if self._started:
+            return self.enabled
+        self._started = True
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error as e:
+            log.warning("audio disabled: %s", e)
+            return False
+
+        pygame.mixer.set_num_channels(self.num_channels)
+        self._channels  = [pygame.mixer.Channel(i) for i in range(self.num_channels)]
+        self._chan_prio = [0] * self.num_channels
+        self._chan_time = [0] * self.num_channels
+        self.enabled = True
+        return True
+
+    def preload(self, sounds: dict[str, SoundDef] = SOUND_FILES, root: Path = SOUND_ROOT) -> None:
+        if not self.start():
+            return
+        for name, sdef in sounds.items():
+            if name in self._sounds:
+                continue
+            path = root / sdef.file
+            if not path.exists():
+                continue
+            try:
+                sound = pygame.mixer.Sound(str(path))
+            except pygame.error as e:
+                log.warning("sound %r failed to load: %s", name, e)
+                continue
+            sound.set_volume(sdef.volume)
+            self._sounds[name] = sound
+            self._defs[name]   = sdef
+
+    # --- Effects ---
+
+    def play(self, name: str, priority: Optional[int] = None) -> None:
+        if name not in self._sounds:
+            return
+        if priority is None:
+            priority = self._defs[name].priority
+        queued = self._queued.get(name)
+        if queued is None:
+            self._queued[name] = [1, priority]
+        else:
+            queued[0] += 1
+            if priority > queued[1]:
+                queued[1] = priority
+
+    def flush(self) -> None:
+        if not self._queued:
+            return
+        now = pygame.time.get_ticks()
+        # highest priority first so the steals go to what matters
+        for name, (count, priority) in sorted(self._queued.items(), key=lambda kv: -kv[1][1]):
+            sdef = self._defs[name]
+            if sdef.cooldown_ms and now - self._last_ms.get(name, -sdef.cooldown_ms) < sdef.cooldown_ms:
+                self.dropped += 1
+                continue
+
+            idx = self._pick_channel(priority)
+            if idx is None:
+                self.dropped += 1
+                continue
+
+            channel = self._channels[idx]
+            channel.set_volume(min(1.0, CHANNEL_VOLUME * (1.0 + COALESCE_GAIN * (count - 1))))
+            channel.play(self._sounds[name])
+            self._chan_prio[idx] = priority
+            self._chan_time[idx] = now
+            self._last_ms[name]  = now
+            self.played    += 1
+            self.coalesced += count - 1
+        self._queued.clear()
+
+    def _pick_channel(self, priority: int) -> Optional[int]:
+        victim = None
+        for i, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return i
+            # lowest priority, then oldest
+            if victim is None or (self._chan_prio[i], self._chan_time[i]) < \
+                    (self._chan_prio[victim], self._chan_time[victim]):
+                victim = i
+        if victim is not None and self._chan_prio[victim] < priority:
+            self._channels[victim].stop()
+            self.stolen += 1
+            return victim
+        return None
+
+    # --- Music ---
+
+    def play_music(self, path: str, loops: int = -1, volume: float = 0.5) -> None:
+        if not self.start():
+            return
+        try:
+            pygame.mixer.music.load(path)
+        except pygame.error as e:
+            log.warning("music %r failed to load: %s", path, e)
+            return
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(loops)
+
+    def stop_music(self) -> None:
+        if self.enabled:
+            pygame.mixer.music.stop()
+
+
+AUDIO = AudioManager()
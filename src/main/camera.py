@@ -0,0 +1,124 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Callable, Optional
+import pygame
+from main.render import View
+from main.assets import normalize_surface
+
+"""
+Camera and chunked static layer, for rooms larger than the screen.
+
+The Camera is a screen-sized window onto the current room. It centres on
+the players and stops at the room's edges, and gives draw code a View
+(render scale plus scroll). A room that fits the screen is never scrolled,
+so at render scale 1 it still draws with no View at all.
+
+A room's static layer (floor, walls, doors, label) is cut into
+CHUNK_SIZE tiles. A tile is painted and scaled the first time it comes
+into view and then kept in an LRU cache of MAX_CHUNKS. Drawing blits only
+the tiles the camera overlaps. Room.draw also skips hazards and enemies
+outside the camera, so a frame in the 4-screen boss room costs about the
+same as one in a normal room.
+
+To use:
+    camera = Camera(960, 540)
+    camera.follow(player.rect.center, room.screen_w, room.screen_h)
+    view   = camera.view(render_scale)          # None: identity
+    room.draw(canvas, view=view, area=camera.area)
+"""
+
+CHUNK_SIZE = 256        # logical px per tile side
+MAX_CHUNKS = 64         # cached tiles per layer, all render scales together
+
+
+class Camera:
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width  = width
+        self.height = height
+        self.x      = 0         # logical top left of what is on screen
+        self.y      = 0
+        self._view  = View()
+
+    @property
+    def area(self) -> pygame.Rect:
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def follow(self, target, room_w: int, room_h: int) -> None:
+        # centre on `target` without showing anything past the room's edges
+        self.x = max(0, min(round(target[0]) - self.width // 2, room_w - self.width))
+        self.y = max(0, min(round(target[1]) - self.height // 2, room_h - self.height))
+
+    def view(self, scale: float) -> Optional[View]:
+        if scale == 1.0 and self.x == 0 and self.y == 0:
+            return None
+        view = self._view
+        view.scale = scale
+        view.x     = round(self.x * scale)
+        view.y     = round(self.y * scale)
+        return view
+
+
+class StaticLayer:
+    """
+    The static part of a room as tiles built on demand. `paint(surface, area)`
+    draws the logical rect `area` of the layer onto `surface`, whose top left
+    is area.topleft.
+    """
+
+    def __init__(
+        self,
+        width:      int,
+        height:     int,
+        paint:      Callable[[pygame.Surface, pygame.Rect], None],
+        chunk_size: int = CHUNK_SIZE,
+        max_chunks: int = MAX_CHUNKS,
+    ) -> None:
+        self.width      = width
+        self.height     = height
+        self.paint      = paint
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self._chunks: OrderedDict[tuple[float, int, int], pygame.Surface] = OrderedDict()
+        self.built = 0          # tiles painted so far, evicted ones included
+
+    def draw(self, surface: pygame.Surface, view: Optional[View], area: pygame.Rect) -> int:
+        # blit the tiles overlapping the logical rect `area`; returns how many were built
+        area = area.clip(0, 0, self.width, self.height)
+        if not area.w or not area.h:
+            return 0
+        c = self.chunk_size
+        scale, ox, oy = (1.0, 0, 0) if view is None else (view.scale, view.x, view.y)
+        built = self.built
+        for j in range(area.top // c, (area.bottom - 1) // c + 1):
+            for i in range(area.left // c, (area.right - 1) // c + 1):
+                surface.blit(self._chunk(i, j, scale), (round(i * c * scale) - ox, round(j * c * scale) - oy))
+        return self.built - built
+
+    def _chunk(self, i: int, j: int, scale: float) -> pygame.Surface:
+        key   = (scale, i, j)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+        c    = self.chunk_size
+        area = pygame.Rect(i * c, j * c, c, c).clip(0, 0, self.width, self.height)
+        chunk = pygame.Surface(area.size)
+        self.paint(chunk, area)
+        if scale != 1.0:
+            # tile edges land where View.rect puts them, so tiles never gap
+            size = (max(1, round(area.right * scale) - round(area.left * scale)),
+                    max(1, round(area.bottom * scale) - round(area.top * scale)))
+            chunk = pygame.transform.smoothscale(chunk, size)
+        chunk = normalize_surface(chunk)
+        self._chunks[key] = chunk
+        if len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+        self.built += 1
+        return chunk
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def nbytes(self) -> int:
+        return sum(s.get_width() * s.get_height() * s.get_bytesize() for s in self._chunks.values())
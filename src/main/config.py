@@ -0,0 +1,273 @@
+from __future__ import annotations
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Callable, Optional
+import json
+import logging
+import os
+import threading
+import time
+from main.keybindings import DEFAULT_BINDINGS
+from main.pacing import STRATEGIES
+from main.render import SCALE_FILTERS
+
+"""
+One typed settings store for key bindings, video and gameplay settings,
+persisted to settings.json.
+
+load() checks every value against its section's dataclass field and
+CHECKS: a wrong type, out of range value or unknown key is logged and
+that one setting falls back to its default, the rest still load. A file
+that isn't valid JSON is kept as settings.json.bad. The old
+bindings-only settings.json is read as the bindings section.
+
+set() / set_bindings() only swap in the new values and hand a snapshot to
+a background writer thread. The writer waits until nothing has changed for
+DEBOUNCE_S (so holding a key in a menu is one write, not dozens), then
+writes a temp file next to settings.json and os.replace()s it over the old
+one; a crash mid-write never leaves a truncated file, and no frame ever
+waits on the disk. close() flushes whatever is still pending.
+
+Command line flags override the stored values for one run and are never
+written back.
+
+To use:
+    CONFIG.load()
+    CONFIG.video.fps, CONFIG.gameplay.num_normal_rooms, CONFIG.bindings
+    CONFIG.set("gameplay", show_minimap=False)      # written in the background
+    CONFIG.close()                                  # on exit
+"""
+
+log = logging.getLogger(__name__)
+
+SETTINGS_PATH = Path("settings.json")
+VERSION       = 1
+DEBOUNCE_S    = 0.5
+
+
+@dataclass(frozen=True)
+class VideoConfig:
+    fps:          int                        = 60
+    window:       Optional[tuple[int, int]] = None      # None: the logical size
+    render_scale: float                      = 1.0
+    scale_filter: str                        = "smooth"
+    pacing:       str                        = "sleep"
+
+
+@dataclass(frozen=True)
+class GameplayConfig:
+    num_normal_rooms: int  = 6
+    procedural_rooms: bool = True
+    show_minimap:     bool = True
+
+
+SECTIONS = {"video": VideoConfig, "gameplay": GameplayConfig}
+
+# extra per-field rules on top of the type check
+CHECKS: dict[tuple[str, str], tuple[Callable[[object], bool], str]] = {
+    ("video", "fps"):                 (lambda v: 15 <= v <= 480,         "15..480"),
+    ("video", "window"):              (lambda v: v is None or (len(v) == 2 and min(v) >= 160), "[w, h], at least 160"),
+    ("video", "render_scale"):        (lambda v: 0.25 <= v <= 2.0,       "0.25..2.0"),
+    ("video", "scale_filter"):        (lambda v: v in SCALE_FILTERS,     f"one of {SCALE_FILTERS}"),
+    ("video", "pacing"):              (lambda v: v in STRATEGIES,        f"one of {STRATEGIES}"),
+    ("gameplay", "num_normal_rooms"): (lambda v: 1 <= v <= 24,           "1..24"),
+}
+
+
+# --- Validation ---
+
+def _coerce(section: str, name: str, default, value):
+    # the value in its field's type, or ValueError
+    if isinstance(default, bool):
+        ok = isinstance(value, bool)
+    elif isinstance(default, int):
+        ok = isinstance(value, int) and not isinstance(value, bool)
+    elif isinstance(default, float):
+        ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+        value = float(value) if ok else value
+    elif isinstance(default, str):
+        ok = isinstance(value, str)
+    else:   # Optional[tuple[int, int]]
+        ok = value is None or (isinstance(value, (list, tuple))
+                               and all(isinstance(v, int) and not isinstance(v, bool) for v in value))
+        value = tuple(value) if ok and value is not None else value
+    if not ok:
+        expected = "[w, h] or null" if default is None else type(default).__name__
+        raise ValueError(f"{section}.{name}: expected {expected}, got {value!r}")
+    check = CHECKS.get((section, name))
+    if check is not None and not check[0](value):
+        raise ValueError(f"{section}.{name}: {value!r} is not {check[1]}")
+    return value
+
+
+def _load_section(section: str, data) -> object:
+    cls = SECTIONS[section]
+    if not isinstance(data, dict):
+        log.warning("settings: %s should be an object, using defaults", section)
+        return cls()
+    defaults = cls()
+    values   = {}
+    for f in fields(cls):
+        if f.name not in data:
+            continue
+        try:
+            values[f.name] = _coerce(section, f.name, getattr(defaults, f.name), data[f.name])
+        except ValueError as e:
+            log.warning("settings: %s, using the default", e)
+    for name in data.keys() - {f.name for f in fields(cls)}:
+        log.warning("settings: unknown setting %s.%s ignored", section, name)
+    return cls(**values)
+
+
+def _load_bindings(data) -> dict[str, dict[str, int]]:
+    bindings = {group: dict(keys) for group, keys in DEFAULT_BINDINGS.items()}
+    if not isinstance(data, dict):
+        log.warning("settings: bindings should be an object, using defaults")
+        return bindings
+    for group, keys in data.items():
+        if group not in bindings or not isinstance(keys, dict):
+            log.warning("settings: unknown binding group %r ignored", group)
+            continue
+        for action, key in keys.items():
+            if action not in bindings[group]:
+                log.warning("settings: unknown binding %s.%s ignored", group, action)
+            elif not isinstance(key, int) or isinstance(key, bool):
+                log.warning("settings: binding %s.%s = %r is not a key code, using the default",
+                            group, action, key)
+            else:
+                bindings[group][action] = key
+    return bindings
+
+
+# --- Store ---
+
+class ConfigStore:
+
+    def __init__(self, path: Path = SETTINGS_PATH, debounce: float = DEBOUNCE_S) -> None:
+        self.path     = Path(path)
+        self.debounce = debounce
+        self.video    = VideoConfig()
+        self.gameplay = GameplayConfig()
+        self.bindings: dict[str, dict[str, int]] = _load_bindings({})
+
+        self._cond       = threading.Condition()
+        self._pending: Optional[dict] = None    # snapshot waiting to be written
+        self._changed_at = 0.0
+        self._closing    = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.writes  = 0
+        self.last_ms = 0.0      # duration of the last write, on the writer thread
+
+    # --- Load ---
+
+    def load(self) -> "ConfigStore":
+        if not self.path.exists():
+            return self
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            bad = self.path.with_name(self.path.name + ".bad")
+            log.error("settings: could not read %s (%s), kept as %s, using defaults", self.path, e, bad.name)
+            try:
+                os.replace(self.path, bad)
+            except OSError:
+                pass
+            return self
+        if not isinstance(data, dict):
+            log.error("settings: %s is not a JSON object, using defaults", self.path)
+            return self
+
+        if "version" not in data and data.keys() <= DEFAULT_BINDINGS.keys():
+            data = {"bindings": data}       # bindings-only file from before the store
+        for key in data.keys() - {"version", "bindings", *SECTIONS}:
+            log.warning("settings: unknown section %r ignored", key)
+        self.video    = _load_section("video", data.get("video", {}))
+        self.gameplay = _load_section("gameplay", data.get("gameplay", {}))
+        self.bindings = _load_bindings(data.get("bindings", {}))
+        return self
+
+    # --- Change ---
+
+    def set(self, section: str, **changes) -> None:
+        # validated like load(), but a bad value raises instead of defaulting
+        current = getattr(self, section)
+        values  = {name: _coerce(section, name, getattr(SECTIONS[section](), name), v)
+                   for name, v in changes.items()}
+        updated = replace(current, **values)
+        if updated != current:
+            setattr(self, section, updated)
+            self._schedule()
+
+    def set_bindings(self, bindings: dict[str, dict[str, int]]) -> None:
+        fresh = {group: dict(keys) for group, keys in bindings.items()}
+        if fresh != self.bindings:
+            self.bindings = fresh
+            self._schedule()
+
+    def snapshot(self) -> dict:
+        return {
+            "version":  VERSION,
+            "video":    {f.name: getattr(self.video, f.name) for f in fields(VideoConfig)},
+            "gameplay": {f.name: getattr(self.gameplay, f.name) for f in fields(GameplayConfig)},
+            "bindings": {group: dict(keys) for group, keys in self.bindings.items()},
+        }
+
+    # --- Background writer ---
+
+    def _schedule(self) -> None:
+        snapshot = self.snapshot()
+        with self._cond:
+            self._pending    = snapshot
+            self._changed_at = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="config-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        with self._cond:
+            while True:
+                while self._pending is None and not self._closing:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                # debounce: wait until the settings have been quiet for a while
+                while not self._closing:
+                    remaining = self._changed_at + self.debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                snapshot, self._pending = self._pending, None
+                self._cond.release()
+                try:
+                    self._write(snapshot)
+                finally:
+                    self._cond.acquire()
+
+    def _write(self, snapshot: dict) -> None:
+        start = time.perf_counter()
+        tmp   = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp, "w") as f:
+                f.write(json.dumps(snapshot, indent=2))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except OSError:
+            log.exception("settings: could not write %s", self.path)
+            return
+        self.writes += 1
+        self.last_ms = (time.perf_counter() - start) * 1000
+
+    def close(self, timeout: float = 2.0) -> None:
+        # write anything pending now and stop the writer
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+CONFIG = ConfigStore()
@@ -1,42 +1,79 @@
 from __future__ import annotations
 import random
 from collections import deque
-from typing import Optional
+from dataclasses import dataclass
+from typing import Optional, Sequence
 import pygame
-from main.room import Room, RoomType, Direction
+from main.room import Room, RoomType, Direction, Door, ENTRY_PAD, BOSS_SCALE
+from main.room_graph import RoomGraph, UNREACHABLE
 from main.entities import Wall, Hazard, Enemy
-from main.room_layouts import NORMAL_ROOM_LAYOUTS
+from main.layout_templates import LayoutTemplate, NORMAL_ROOM_TEMPLATES
+from main.ai_scheduler import AIScheduler
+from main.pools import EntityPool
+from main.frame_monitor import FRAME_MONITOR
+from main.minimap import Minimap
+from main.interior_generator import InteriorGenerator
 
 """
 * Every dungeon has exactly one START room, one BOSS room, one MINI_GAME room,
   and a configurable number of NORMAL rooms.
-* The BOSS room has exactly ONE door (entrance only).
+* The BOSS room has exactly ONE door (entrance only), and is BOSS_SCALE
+  screens wide and tall; the Game's Camera scrolls it.
 * START and BOSS rooms are placed as far apart as possible on the grid.
 * Only one room is ever active / displayed at a time.
+* The Dungeon keeps the door graph with all-pairs distances and next hops
+  (room_graph.py): route() names the door to take towards any room.
 * Rooms connect through doors which is loading zone triggered by player walking through.
 * NORMAL rooms are assigned a random preset layout (walls, hazards, enemies).
+  Layouts are precompiled templates (layout_templates.py); rooms share the
+  template's walls/hazards and only own their enemies.
+* With an InteriorGenerator, NORMAL rooms get procedural interiors instead
+  (interior_generator.py), filled in as the player reaches them while the
+  neighbouring rooms generate in the background.
 
 To use:
     gen     = DungeonGenerator(seed=12345, num_normal_rooms=8)
     dungeon = gen.generate()
+    plan    = DungeonGenerator(seed=12345, num_normal_rooms=8).plan()   # graph only
 
     # In game loop:
     dungeon.draw(screen, debug=False)
     dungeon.update(dt, player)
+
+    door, arrive = dungeon.route(room_id, target_id)   # None when already there
+    dungeon.distance_to_boss()
 """
 
 GRID_COLS        = 8
 GRID_ROWS        = 8
 DEFAULT_NORMALS  = 8
 MAX_GEN_ATTEMPTS = 200
-
-
-def _build_layout(layout: dict) -> tuple[list[Wall], list[Hazard], list[Enemy]]:
-    """Instantiate entity objects from a raw layout dict."""
-    walls   = [Wall(*w)    for w in layout["walls"]]
-    hazards = [Hazard(*h)  for h in layout["hazards"]]
-    enemies = [Enemy(*e)   for e in layout["enemies"]]
-    return walls, hazards, enemies
+ENTRY_SPREAD     = 48      # px between co-op players entering a room
+
+
+def _build_layout(
+    template: LayoutTemplate,
+    pool:     Optional[EntityPool] = None,
+) -> tuple[tuple[Wall, ...], tuple[Hazard, ...], list[Enemy]]:
+    """Share the template's static entities and spawn this room's enemies."""
+    make    = pool.enemy if pool is not None else Enemy
+    enemies = [
+        make(x, y, t)
+        for x, y, t in zip(template.spawn_xs, template.spawn_ys, template.spawn_types)
+    ]
+    return template.walls, template.hazards, enemies
+
+
+@dataclass
+class DungeonPlan:
+    """The room graph of a dungeon, before any Room is built."""
+    pos_by_id:    dict[int, tuple[int, int]]
+    adjacency:    list[tuple[int, int]]
+    neighbors_of: dict[int, list[int]]
+    types:        dict[int, RoomType]
+    start_id:     int
+    boss_id:      int
+    mini_id:      int
 
 
 class Dungeon:
@@ -49,10 +86,27 @@ class Dungeon:
         rooms:       dict[int, Room],
         start_id:    int,
         screen_size: tuple[int, int] = (960, 540),
+        seed:        int = 0,
+        interiors:   Optional[InteriorGenerator] = None,
+        pool:        Optional[EntityPool] = None,
     ) -> None:
         self.rooms      = rooms
         self.current_id = start_id
         self.screen_w, self.screen_h = screen_size
+        self.ai         = AIScheduler()
+        self.minimap    = Minimap(rooms, start_id)
+        self.graph      = RoomGraph(rooms)
+        self.boss_id    = next((rid for rid, r in rooms.items() if r.type == RoomType.BOSS), None)
+
+        self.seed       = seed
+        self.interiors  = interiors
+        self.pool       = pool
+        # NORMAL rooms still waiting for their procedural interior
+        self._unfilled: set[int] = set()
+        if interiors is not None:
+            self._unfilled = {rid for rid, r in rooms.items()
+                              if r.type == RoomType.NORMAL and r.template is None}
+        self._enter(start_id)
 
     @property
     def current_room(self) -> Room:
@@ -60,36 +114,112 @@ class Dungeon:
 
     # --- Update ---
 
-    def update(self, player, dt: float = 0.0) -> bool:
-        # Update enemies and hazards in the current room
-        self.current_room.update(dt, player)
-
-        result = self.current_room.check_transition(player.rect)
-        if result is None:
+    def update(self, player, dt: float = 0.0, others: Sequence = ()) -> bool:
+        # Update enemies and hazards in the current room. Enemies chase
+        # `player`; co-op partners in `others` take hazard damage and can
+        # also trigger a transition, which brings everyone along.
+        room = self.current_room
+        room.update(dt, player, self.ai)
+        for other in others:
+            room.apply_hazards(other)
+
+        for p in (player, *others):
+            result = room.check_transition(p.rect)
+            if result is not None:
+                break
+        else:
             return False
 
         direction, target_id = result
+        FRAME_MONITOR.mark("room_transition")
         self.current_id = target_id
-        player.pos = self._entry_position(direction.opposite())
-        player.rect.center = (round(player.pos.x), round(player.pos.y))
+        self.minimap.enter(target_id)
+        self._enter(target_id)
+        for slot, p in enumerate((player, *others)):
+            p.pos = self._entry_position(direction.opposite(), slot)
+            p.rect.center = (round(p.pos.x), round(p.pos.y))
         return True
 
-    def _entry_position(self, entry_dir: Direction) -> pygame.Vector2:
-        cx  = self.screen_w  // 2
-        cy  = self.screen_h  // 2
-        pad = 80
+    def _entry_position(self, entry_dir: Direction, slot: int = 0,
+                        room_id: Optional[int] = None) -> pygame.Vector2:
+        # where players arrive through `entry_dir` (default: the current room)
+        room = self.current_room if room_id is None else self.rooms[room_id]
+        cx  = room.screen_w  // 2
+        cy  = room.screen_h  // 2
+        pad = ENTRY_PAD
+        # extra players line up along the entry wall
+        spread = ENTRY_SPREAD * slot
 
         return {
-            Direction.NORTH: pygame.Vector2(cx, pad),
-            Direction.SOUTH: pygame.Vector2(cx, self.screen_h - pad),
-            Direction.WEST:  pygame.Vector2(pad, cy),
-            Direction.EAST:  pygame.Vector2(self.screen_w - pad, cy),
+            Direction.NORTH: pygame.Vector2(cx + spread, pad),
+            Direction.SOUTH: pygame.Vector2(cx + spread, room.screen_h - pad),
+            Direction.WEST:  pygame.Vector2(pad, cy + spread),
+            Direction.EAST:  pygame.Vector2(room.screen_w - pad, cy + spread),
         }[entry_dir]
 
+    # --- Routing ---
+
+    def route(self, from_id: int, to_id: int) -> Optional[tuple[Door, pygame.Vector2]]:
+        # the door in `from_id` on the shortest way to `to_id`, and where
+        # whoever takes it arrives in the next room. None if already there
+        # or unreachable; in-room navigation to the door is up to the caller
+        direction = self.graph.exit_towards(from_id, to_id)
+        if direction is None:
+            return None
+        door = self.rooms[from_id].doors[direction]
+        return door, self._entry_position(direction.opposite(), room_id=door.target_room_id)
+
+    def distance_to_boss(self, room_id: Optional[int] = None) -> int:
+        # doors between `room_id` (default: the current room) and the boss room, -1 if none
+        if self.boss_id is None:
+            return UNREACHABLE
+        return self.graph.distance(self.current_id if room_id is None else room_id, self.boss_id)
+
+    # --- Procedural interiors ---
+
+    def _enter(self, room_id: int) -> None:
+        if self.interiors is None:
+            return
+        self._fill_interior(room_id)
+        # run ahead: everything one door away generates in the background
+        for door in self.rooms[room_id].doors.values():
+            if door.target_room_id in self._unfilled:
+                self.interiors.prefetch(self.seed, self.rooms[door.target_room_id])
+
+    def _fill_interior(self, room_id: int) -> None:
+        if room_id not in self._unfilled:
+            return
+        room     = self.rooms[room_id]
+        template = self.interiors.get(self.seed, room)
+        room.set_layout(template, *_build_layout(template, self.pool))
+        self._unfilled.discard(room_id)
+
+    # --- Layout reloads ---
+
+    def apply_templates(self, templates: dict[int, LayoutTemplate]) -> int:
+        # swap recompiled preset layouts into the rooms that use them. The
+        # graph, doors and player are untouched; enemies are kept unless
+        # their spawns changed. Returns how many rooms were rebuilt.
+        rebuilt = 0
+        for room in self.rooms.values():
+            old = room.template
+            if old is None or old.index < 0 or old.index not in templates:
+                continue
+            new = templates[old.index]
+            enemies = room.enemies
+            if (new.spawn_xs, new.spawn_ys, new.spawn_types) != (old.spawn_xs, old.spawn_ys, old.spawn_types):
+                if self.pool is not None:
+                    self.pool.release(enemies)
+                enemies = _build_layout(new, self.pool)[2]
+            room.set_layout(new, new.walls, new.hazards, enemies)
+            rebuilt += 1
+        return rebuilt
+
     # --- Draw ---
 
-    def draw(self, surface: pygame.Surface, debug: bool = False) -> None:
-        self.current_room.draw(surface, debug=debug)
+    def draw(self, surface: pygame.Surface, debug: bool = False, hp_bars: bool = True,
+             view=None, area: Optional[pygame.Rect] = None) -> None:
+        self.current_room.draw(surface, debug=debug, hp_bars=hp_bars, view=view, area=area)
 
     def __repr__(self) -> str:
         lines = ["Dungeon:"]
@@ -104,9 +234,11 @@ class DungeonGenerator:
     ----------
     seed             : RNG seed (int or None for random)
     num_normal_rooms : how many NORMAL rooms to include
-    screen_size      : pixel dimensions of the screen / room
+    screen_size      : pixel dimensions of the screen / a normal room
     grid_cols        : width of the logical grid
     grid_rows        : height of the logical grid
+    pool             : optional EntityPool to draw walls/hazards/enemies from
+    interiors        : optional InteriorGenerator for procedural NORMAL rooms
     """
 
     def __init__(
@@ -116,6 +248,8 @@ class DungeonGenerator:
         screen_size:      tuple[int, int] = (960, 540),
         grid_cols:        int             = GRID_COLS,
         grid_rows:        int             = GRID_ROWS,
+        pool:             Optional[EntityPool] = None,
+        interiors:        Optional[InteriorGenerator] = None,
     ) -> None:
         self.seed             = seed if seed is not None else random.randrange(0, 2**32)
         self.rng              = random.Random(self.seed)
@@ -123,12 +257,26 @@ class DungeonGenerator:
         self.screen_size      = screen_size
         self.grid_cols        = grid_cols
         self.grid_rows        = grid_rows
+        self.pool             = pool
+        self.interiors        = interiors
 
     def generate(self) -> Dungeon:
         for attempt in range(MAX_GEN_ATTEMPTS):
             dungeon = self._try_generate()
             if dungeon is not None:
                 return dungeon
+        self._give_up()
+
+    def plan(self) -> DungeonPlan:
+        # graph only: same rng draws as generate() up to the room layouts,
+        # so the plan matches what generate() builds for this seed
+        for attempt in range(MAX_GEN_ATTEMPTS):
+            plan = self._try_plan()
+            if plan is not None:
+                return plan
+        self._give_up()
+
+    def _give_up(self) -> None:
         raise RuntimeError(
             f"DungeonGenerator failed after {MAX_GEN_ATTEMPTS} attempts "
             f"(seed={self.seed}, normals={self.num_normal_rooms}, "
@@ -136,7 +284,7 @@ class DungeonGenerator:
             "Try a larger grid or fewer rooms."
         )
 
-    def _try_generate(self) -> Optional[Dungeon]:
+    def _try_plan(self) -> Optional[DungeonPlan]:
         total_special = 3   # START + BOSS + MINI_GAME
         total_rooms   = total_special + self.num_normal_rooms
         grid_capacity = self.grid_cols * self.grid_rows
@@ -226,28 +374,42 @@ class DungeonGenerator:
             if rid not in type_map:
                 type_map[rid] = RoomType.NORMAL
 
+        return DungeonPlan(pos_by_id, adjacency, neighbors_of, type_map, start_id, boss_id, mini_id)
+
+    def _try_generate(self) -> Optional[Dungeon]:
+        plan = self._try_plan()
+        if plan is None:
+            return None
+        pos_by_id, adjacency, type_map = plan.pos_by_id, plan.adjacency, plan.types
+        start_id, boss_id = plan.start_id, plan.boss_id
+        all_ids = list(pos_by_id)
+
         sw, sh = self.screen_size
         rooms: dict[int, Room] = {}
 
         for rid in all_ids:
             rtype = type_map[rid]
 
-            # Pick a random preset layout for normal rooms
-            if rtype == RoomType.NORMAL and NORMAL_ROOM_LAYOUTS:
-                layout = self.rng.choice(NORMAL_ROOM_LAYOUTS)
-                walls, hazards, enemies = _build_layout(layout)
+            # Pick a random preset layout for normal rooms, unless they
+            # are procedural (filled in by the Dungeon once doors exist)
+            template = None
+            if rtype == RoomType.NORMAL and NORMAL_ROOM_TEMPLATES and self.interiors is None:
+                template = self.rng.choice(NORMAL_ROOM_TEMPLATES)
+                walls, hazards, enemies = _build_layout(template, self.pool)
             else:
                 walls, hazards, enemies = [], [], []
 
+            scale = BOSS_SCALE if rtype == RoomType.BOSS else 1
             rooms[rid] = Room(
                 room_id   = rid,
                 room_type = rtype,
                 grid_pos  = pos_by_id[rid],
-                screen_w  = sw,
-                screen_h  = sh,
+                screen_w  = sw * scale,
+                screen_h  = sh * scale,
                 walls     = walls,
                 hazards   = hazards,
                 enemies   = enemies,
+                template  = template,
             )
 
         for a, b in adjacency:
@@ -261,12 +423,17 @@ class DungeonGenerator:
             rooms[b].add_door(dir_b_to_a, a)
             
         for room in rooms.values():
-            room.build_border_walls()
+            room.build_border_walls(self.pool)
 
         if len(rooms[boss_id].doors) != 1:
+            # hand this attempt's entities back before retrying
+            if self.pool is not None:
+                for room in rooms.values():
+                    self.pool.release_room(room)
             return None
 
-        return Dungeon(rooms=rooms, start_id=start_id, screen_size=self.screen_size)
+        return Dungeon(rooms=rooms, start_id=start_id, screen_size=self.screen_size,
+                       seed=self.seed, interiors=self.interiors, pool=self.pool)
 
     def _empty_neighbors(
         self,
@@ -0,0 +1,191 @@
+from __future__ import annotations
+from typing import Iterator, Optional
+import numpy as np
+
+"""
+Entity-component storage for room simulation.
+
+A component is a fixed-size numpy field (COMPONENTS). An archetype is a
+fixed set of components; each entity of that archetype is one row of the
+archetype's packed column arrays, so a system handles every entity of a
+kind with a few array operations instead of a Python method call per
+object (see systems.py). Despawning moves the last row into the hole, so
+the columns stay dense and a system only ever looks at [:count].
+
+Entity ids are plain ints, stable for the entity's life in one World;
+rows are not. Each Room owns a World. The classes in entities.py stay as
+the single-object API (room_layouts, DungeonGenerator, EntityPool, the
+lockstep hash): Enemy is a thin facade over one ENEMY row, Wall and
+Hazard are the static layout data the room packs into WALL / HAZARD rows.
+
+New kinds of entity (projectiles, pickups, status effects) are a new
+archetype tuple plus a system, not a new class with its own update().
+
+To use:
+    world = World()
+    eid   = world.spawn(ENEMY, pos=(100.0, 200.0), hp=40)
+    arch  = world.archetype(ENEMY)
+    arch["pos"] += arch["heading"] * dt         # every enemy at once
+    world.despawn(eid)
+"""
+
+INITIAL_CAPACITY = 16
+
+# name -> (dtype, per-entity shape, default)
+COMPONENTS: dict[str, tuple[str, tuple[int, ...], object]] = {
+    "pos":        ("f8", (2,), 0.0),
+    "heading":    ("f8", (2,), 0.0),
+    "speed":      ("f8", (),   0.0),
+    "rect":       ("i4", (4,), 0),        # x, y, w, h
+    "hp":         ("i4", (),   0),
+    "max_hp":     ("i4", (),   0),
+    "damage":     ("i4", (),   0),
+    "alive":      ("?",  (),   True),
+    "kind":       ("u1", (),   0),        # index into the owner's type table
+    "decided_at": ("f8", (),   np.nan),   # AI clock of the last think(), nan: never
+}
+
+# --- Archetypes ---
+
+ENEMY  = ("pos", "heading", "speed", "rect", "hp", "max_hp", "damage", "alive", "kind", "decided_at")
+WALL   = ("rect",)
+HAZARD = ("rect", "damage", "kind")
+
+
+class Archetype:
+    __slots__ = ("components", "columns", "eids", "count")
+
+    def __init__(self, components: tuple[str, ...], capacity: int = INITIAL_CAPACITY) -> None:
+        self.components = components
+        self.columns: dict[str, np.ndarray] = {}
+        for name in components:
+            dtype, shape, _ = COMPONENTS[name]
+            self.columns[name] = np.zeros((capacity, *shape), dtype=dtype)
+        self.eids  = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        # live rows only; a view, so in-place ops write through
+        return self.columns[name][:self.count]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def reserve(self, n: int) -> None:
+        capacity = len(self.eids)
+        if self.count + n <= capacity:
+            return
+        while capacity < self.count + n:
+            capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.zeros((capacity, *column.shape[1:]), dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+        eids = np.zeros(capacity, dtype=np.int64)
+        eids[:self.count] = self.eids[:self.count]
+        self.eids = eids
+
+    def _append(self, eid: int, values: dict) -> int:
+        self.reserve(1)
+        row = self.count
+        for name, column in self.columns.items():
+            column[row] = values[name] if name in values else COMPONENTS[name][2]
+        self.eids[row] = eid
+        self.count += 1
+        return row
+
+    def _remove(self, row: int) -> int:
+        # swap the last row into `row`; returns the eid that moved, or -1
+        last = self.count - 1
+        moved = -1
+        if row != last:
+            for column in self.columns.values():
+                column[row] = column[last]
+            moved = int(self.eids[last])
+            self.eids[row] = moved
+        self.count = last
+        return moved
+
+    def row_values(self, row: int) -> dict:
+        return {name: column[row].copy() for name, column in self.columns.items()}
+
+
+class World:
+
+    def __init__(self) -> None:
+        self._archetypes: dict[tuple[str, ...], Archetype] = {}
+        self._where: dict[int, tuple[Archetype, int]] = {}
+        self._next_id = 0
+
+    def archetype(self, components: tuple[str, ...]) -> Archetype:
+        arch = self._archetypes.get(components)
+        if arch is None:
+            arch = self._archetypes[components] = Archetype(components)
+        return arch
+
+    def find(self, components: tuple[str, ...]) -> Optional[Archetype]:
+        # the archetype if it has any entities, without creating it
+        arch = self._archetypes.get(components)
+        return arch if arch is not None and arch.count else None
+
+    def query(self, *components: str) -> Iterator[Archetype]:
+        # every non-empty archetype that has all of `components`
+        for arch in self._archetypes.values():
+            if arch.count and all(c in arch.columns for c in components):
+                yield arch
+
+    # --- Entities ---
+
+    def spawn(self, components: tuple[str, ...], **values) -> int:
+        eid = self._next_id
+        self._next_id += 1
+        arch = self.archetype(components)
+        self._where[eid] = (arch, arch._append(eid, values))
+        return eid
+
+    def spawn_many(self, components: tuple[str, ...], n: int, **columns) -> range:
+        # bulk spawn; each keyword is an array-like with one entry per entity
+        if n == 0:
+            return range(self._next_id, self._next_id)
+        arch = self.archetype(components)
+        arch.reserve(n)
+        start, end = arch.count, arch.count + n
+        for name, column in arch.columns.items():
+            column[start:end] = columns[name] if name in columns else COMPONENTS[name][2]
+        eids = range(self._next_id, self._next_id + n)
+        arch.eids[start:end] = eids
+        arch.count = end
+        for i, eid in enumerate(eids):
+            self._where[eid] = (arch, start + i)
+        self._next_id += n
+        return eids
+
+    def despawn(self, eid: int) -> None:
+        arch, row = self._where.pop(eid)
+        moved = arch._remove(row)
+        if moved >= 0:
+            self._where[moved] = (arch, row)
+
+    def clear(self, components: tuple[str, ...]) -> None:
+        arch = self._archetypes.get(components)
+        if arch is None:
+            return
+        for eid in arch.eids[:arch.count].tolist():
+            del self._where[eid]
+        arch.count = 0
+
+    def locate(self, eid: int) -> tuple[Archetype, int]:
+        return self._where[eid]
+
+    def __contains__(self, eid: int) -> bool:
+        return eid in self._where
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def nbytes(self) -> int:
+        return sum(
+            sum(c.nbytes for c in arch.columns.values()) + arch.eids.nbytes
+            for arch in self._archetypes.values()
+        )
+
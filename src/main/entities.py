@@ -1,5 +1,8 @@
 from __future__ import annotations
+import math
+import numpy as np
 import pygame
+from main.ecs import World, ENEMY
 
 
 # ---------------------------------------------------------------------------
@@ -7,14 +10,20 @@ import pygame
 # ---------------------------------------------------------------------------
 
 class Wall:
+    __slots__ = ("rect",)
 
     COLOR = pygame.Color("#3a3a5c")
 
     def __init__(self, x: int, y: int, w: int, h: int) -> None:
         self.rect = pygame.Rect(x, y, w, h)
 
-    def draw(self, surface: pygame.Surface) -> None:
-        pygame.draw.rect(surface, self.COLOR, self.rect)
+    def reset(self, x: int, y: int, w: int, h: int) -> "Wall":
+        # reuse from EntityPool without allocating a new Rect
+        self.rect.update(x, y, w, h)
+        return self
+
+    def draw(self, surface: pygame.Surface, view=None) -> None:
+        pygame.draw.rect(surface, self.COLOR, self.rect if view is None else view.rect(self.rect))
 
     def collides(self, rect: pygame.Rect) -> bool:
         return self.rect.colliderect(rect)
@@ -29,13 +38,26 @@ class HazardType:
     LAVA  = "lava"
 
 
+# hazard type <-> HAZARD `kind` component; unknown types are added on first use
+HAZARD_TYPES: list[str] = [HazardType.SPIKE, HazardType.LAVA]
+
+
+def hazard_kind(hazard_type: str) -> int:
+    if hazard_type not in HAZARD_TYPES:
+        HAZARD_TYPES.append(hazard_type)
+    return HAZARD_TYPES.index(hazard_type)
+
+
 class Hazard:
     #A floor hazard that damages the player on contact
+    __slots__ = ("rect", "hazard_type", "damage")
 
     COLORS = {
         HazardType.SPIKE: pygame.Color("#b0b0b0"),
         HazardType.LAVA:  pygame.Color("#ff4500"),
     }
+    COLOR_UNKNOWN = pygame.Color("#ff0000")
+    COLOR_SPIKE_X = pygame.Color("#ffffff")
 
     def __init__(self, x: int, y: int, w: int, h: int,
                  hazard_type: str = HazardType.SPIKE,
@@ -44,18 +66,26 @@ class Hazard:
         self.hazard_type = hazard_type
         self.damage      = damage
 
-    def draw(self, surface: pygame.Surface) -> None:
-        color = self.COLORS.get(self.hazard_type, pygame.Color("#ff0000"))
-        pygame.draw.rect(surface, color, self.rect)
+    def reset(self, x: int, y: int, w: int, h: int,
+              hazard_type: str = HazardType.SPIKE,
+              damage: int = 10) -> "Hazard":
+        self.rect.update(x, y, w, h)
+        self.hazard_type = hazard_type
+        self.damage      = damage
+        return self
+
+    def draw(self, surface: pygame.Surface, view=None) -> None:
+        color = self.COLORS.get(self.hazard_type, self.COLOR_UNKNOWN)
+        rect  = self.rect if view is None else view.rect(self.rect)
+        pygame.draw.rect(surface, color, rect)
         # simple cross pattern to make spikes obvious
         if self.hazard_type == HazardType.SPIKE:
-            cx, cy = self.rect.center
-            pygame.draw.line(surface, pygame.Color("#ffffff"),
-                             (self.rect.left, self.rect.top),
-                             (self.rect.right, self.rect.bottom), 1)
-            pygame.draw.line(surface, pygame.Color("#ffffff"),
-                             (self.rect.right, self.rect.top),
-                             (self.rect.left, self.rect.bottom), 1)
+            pygame.draw.line(surface, self.COLOR_SPIKE_X,
+                             (rect.left, rect.top),
+                             (rect.right, rect.bottom), 1)
+            pygame.draw.line(surface, self.COLOR_SPIKE_X,
+                             (rect.right, rect.top),
+                             (rect.left, rect.bottom), 1)
 
     def collides(self, rect: pygame.Rect) -> bool:
         return self.rect.colliderect(rect)
@@ -77,46 +107,199 @@ _ENEMY_STATS = {
     EnemyType.HEAVY: {"hp": 120, "speed": 40,  "damage": 25, "color": "#8e44ad", "size": (36, 36)},
 }
 
+# ENEMY `kind` component -> type, and per-kind tables indexed by it.
+# Colors are shared, never mutate one through an enemy.
+ENEMY_TYPES  = tuple(_ENEMY_STATS)
+ENEMY_COLORS = tuple(pygame.Color(_ENEMY_STATS[t]["color"]) for t in ENEMY_TYPES)
+_ENEMY_KINDS = {t: i for i, t in enumerate(ENEMY_TYPES)}
+
+# facades that were never put in a room live here until they are
+DETACHED = World()
+
 
 class Enemy:
+    """
+    One row of a World's ENEMY archetype (see ecs.py).
+
+    Rooms simulate and draw their enemies through systems.py; this class is
+    for code that deals with one enemy at a time. rect / pos / heading
+    return copies, assign to them to write back. A new or reset() enemy only
+    records its spawn until a Room attaches it to its World, so building a
+    dungeon writes each enemy's row once.
+    """
+    __slots__ = ("world", "eid", "_spawn")
+
+    COLOR_HP_BACK = pygame.Color("#333333")
+    COLOR_HP_FILL = pygame.Color("#00cc44")
 
     def __init__(self, x: int, y: int, enemy_type: str = EnemyType.BASIC) -> None:
-        stats      = _ENEMY_STATS[enemy_type]
-        self.type  = enemy_type
-        self.hp    = stats["hp"]
-        self.speed = stats["speed"]
-        self.damage = stats["damage"]
-        self.color  = pygame.Color(stats["color"])
-        w, h        = stats["size"]
-        self.rect   = pygame.Rect(x - w // 2, y - h // 2, w, h)
-        self.pos    = pygame.Vector2(x, y)
-        self.alive  = True
+        self.world: World | None = None
+        self.eid = -1
+        self.reset(x, y, enemy_type)
 
-    def update(self, dt: float, player_pos: pygame.Vector2) -> None:
-        if not self.alive:
+    def reset(self, x: int, y: int, enemy_type: str = EnemyType.BASIC) -> "Enemy":
+        # (re)initialise, dropping any row from a previous life when pooled
+        self.release()
+        self._spawn = (x, y, enemy_type)
+        return self
+
+    def release(self) -> None:
+        # drop the row without keeping its state (EntityPool), reset() before reuse
+        if self.world is not None:
+            if self.eid in self.world:
+                self.world.despawn(self.eid)
+            self.world = None
+
+    # --- Storage ---
+
+    def attach(self, world: World) -> None:
+        # move this enemy's row into `world`
+        if self.world is world:
+            return
+        if self.world is None:
+            values = _spawn_values(*self._spawn)
+        else:
+            arch, row = self.world.locate(self.eid)
+            values = arch.row_values(row)
+            self.world.despawn(self.eid)
+        self.eid   = world.spawn(ENEMY, **values)
+        self.world = world
+
+    @staticmethod
+    def attach_all(enemies: list["Enemy"], world: World) -> None:
+        # attach in order; fresh enemies (a new room) are spawned in one go
+        if not enemies:
             return
-        direction = player_pos - self.pos
-        if direction.length_squared() > 0:
-            direction = direction.normalize()
-        self.pos  += direction * self.speed * dt
-        self.rect.center = (round(self.pos.x), round(self.pos.y))
+        if any(e.world is not None for e in enemies):
+            for enemy in enemies:
+                enemy.attach(world)
+            return
+        spawns = [_spawn_values(*e._spawn) for e in enemies]
+        eids   = world.spawn_many(ENEMY, len(enemies),
+                                  **{name: [v[name] for v in spawns] for name in _SPAWN_COLUMNS})
+        for enemy, eid in zip(enemies, eids):
+            enemy.world = world
+            enemy.eid   = eid
+
+    def _row(self):
+        if self.world is None:
+            self.attach(DETACHED)
+        return self.world.locate(self.eid)
+
+    def _get(self, name: str):
+        arch, row = self._row()
+        return arch.columns[name][row]
+
+    def _set(self, name: str, value) -> None:
+        arch, row = self._row()
+        arch.columns[name][row] = value
+
+    @property
+    def type(self) -> str:
+        return ENEMY_TYPES[self._get("kind")]
+
+    @property
+    def color(self) -> pygame.Color:
+        return ENEMY_COLORS[self._get("kind")]
+
+    @property
+    def speed(self) -> float:
+        return float(self._get("speed"))
+
+    @property
+    def damage(self) -> int:
+        return int(self._get("damage"))
+
+    @property
+    def hp(self) -> int:
+        return int(self._get("hp"))
+
+    @hp.setter
+    def hp(self, value: int) -> None:
+        self._set("hp", value)
+
+    @property
+    def alive(self) -> bool:
+        return bool(self._get("alive"))
+
+    @alive.setter
+    def alive(self, value: bool) -> None:
+        self._set("alive", value)
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return pygame.Rect(self._get("rect").tolist())
+
+    @property
+    def pos(self) -> pygame.Vector2:
+        return pygame.Vector2(self._get("pos").tolist())
+
+    @pos.setter
+    def pos(self, value) -> None:
+        # keeps the rect centred on it, like move()
+        arch, row = self._row()
+        arch.columns["pos"][row] = value
+        rect = arch.columns["rect"][row]
+        rect[0] = round(value[0]) - rect[2] // 2
+        rect[1] = round(value[1]) - rect[3] // 2
+
+    @property
+    def heading(self) -> pygame.Vector2:
+        return pygame.Vector2(self._get("heading").tolist())
+
+    @heading.setter
+    def heading(self, value) -> None:
+        self._set("heading", value)
+
+    @property
+    def decided_at(self) -> float | None:
+        t = float(self._get("decided_at"))
+        return None if math.isnan(t) else t
+
+    @decided_at.setter
+    def decided_at(self, value: float | None) -> None:
+        self._set("decided_at", math.nan if value is None else value)
+
+    # --- Behaviour (single-row systems) ---
+
+    def update(self, dt: float, player_pos: pygame.Vector2) -> None:
+        # unscheduled path: decide and move every frame
+        self.think(player_pos)
+        self.move(dt)
+
+    def think(self, player_pos: pygame.Vector2) -> None:
+        from main import systems
+        arch, row = self._row()
+        systems.think(arch, player_pos, np.array([row]))
+
+    def move(self, dt: float) -> None:
+        from main import systems
+        arch, row = self._row()
+        systems.move(arch, dt, np.array([row]))
 
     def take_damage(self, amount: int) -> None:
-        self.hp -= amount
-        if self.hp <= 0:
-            self.alive = False
+        from main import systems
+        arch, row = self._row()
+        systems.damage(arch, np.array([row]), amount)
 
-    def draw(self, surface: pygame.Surface) -> None:
-        if not self.alive:
-            return
-        pygame.draw.rect(surface, self.color, self.rect)
-        # small HP bar
-        bar_w = self.rect.width
-        bar_h = 4
-        bar_x = self.rect.left
-        bar_y = self.rect.top - 6
-        pygame.draw.rect(surface, pygame.Color("#333333"),
-                         (bar_x, bar_y, bar_w, bar_h))
-        fill = int(bar_w * max(self.hp, 0) / _ENEMY_STATS[self.type]["hp"])
-        pygame.draw.rect(surface, pygame.Color("#00cc44"),
-                         (bar_x, bar_y, fill, bar_h))
\ No newline at end of file
+    def draw(self, surface: pygame.Surface, hp_bar: bool = True, view=None) -> None:
+        from main import systems
+        arch, row = self._row()
+        systems.draw_enemies(arch, surface, hp_bar, view, np.array([row]))
+
+
+_SPAWN_COLUMNS = ("pos", "speed", "rect", "hp", "max_hp", "damage", "kind")
+
+
+def _spawn_values(x: int, y: int, enemy_type: str) -> dict:
+    stats = _ENEMY_STATS[enemy_type]
+    w, h  = stats["size"]
+    return {
+        "pos":     (x, y),
+        "speed":   stats["speed"],
+        "rect":    (x - w // 2, y - h // 2, w, h),
+        "hp":      stats["hp"],
+        "max_hp":  stats["hp"],
+        "damage":  stats["damage"],
+        "kind":    _ENEMY_KINDS[enemy_type],
+    }
@@ -0,0 +1,65 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Optional
+import pygame
+
+"""
+Font lookup with in-memory and on-disk caching.
+
+pygame.font.SysFont() scans every installed font the first time it is
+called, even for the default font. get_font(size) with no name uses the
+bundled default directly and never scans. Named fonts are resolved with
+match_font() once and the resulting path is cached in FONT_CACHE_PATH so
+later runs skip the scan too.
+"""
+
+FONT_CACHE_PATH = Path("font_cache.json")
+
+_fonts: dict[tuple[Optional[str], int, bool], pygame.font.Font] = {}
+_paths: Optional[dict[str, Optional[str]]] = None
+
+
+def get_font(size: int, name: Optional[str] = None, bold: bool = False) -> pygame.font.Font:
+    key  = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        path = resolve_font(name, bold) if name is not None else None
+        font = pygame.font.Font(path, size)
+        if bold and path is None:
+            font.set_bold(True)
+        _fonts[key] = font
+    return font
+
+
+def resolve_font(name: str, bold: bool = False) -> Optional[str]:
+    paths = _load_paths()
+    key   = f"{name.lower()}|{int(bold)}"
+    if key not in paths:
+        paths[key] = pygame.font.match_font(name, bold=bold)
+        _save_paths()
+    path = paths[key]
+    if path is not None and not Path(path).exists():
+        # font was uninstalled since it was cached
+        del paths[key]
+        return resolve_font(name, bold)
+    return path
+
+
+def _load_paths() -> dict[str, Optional[str]]:
+    global _paths
+    if _paths is None:
+        _paths = {}
+        if FONT_CACHE_PATH.exists():
+            try:
+                _paths = dict(json.loads(FONT_CACHE_PATH.read_text()))
+            except (OSError, ValueError):
+                _paths = {}
+    return _paths
+
+
+def _save_paths() -> None:
+    try:
+        FONT_CACHE_PATH.write_text(json.dumps(_paths, indent=2))
+    except OSError:
+        pass
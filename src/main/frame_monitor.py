@@ -0,0 +1,160 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass, field
+import gc
+import logging
+import time
+
+"""
+GC pause control and frame-hitch detection.
+
+* After dungeon generation everything that is alive is collected once and
+  then gc.freeze()'d, so the long-lived dungeon is never rescanned.
+* Automatic collection is switched off while playing. Instead, the end of
+  each frame spends whatever is left of the frame budget on the youngest
+  generation that needs it (gen2 only with a lot of slack, or when the
+  counts run far past the thresholds).
+* Any frame that goes over budget is logged together with what happened in
+  it: GC generations collected, room transitions, surface builds...
+
+To use (main loop):
+    FRAME_MONITOR.begin_frame()
+    ...update / draw / flip...
+    FRAME_MONITOR.end_frame()
+
+    FRAME_MONITOR.mark("room_transition")     # from anywhere mid-frame
+"""
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MS = 1000.0 / 60
+HITCH_HISTORY     = 32
+
+# slack (ms) needed before collecting each generation in the frame gap
+SLACK_NEEDED_MS = (0.5, 1.5, 4.0)
+# collect anyway once a generation's count passes threshold * this
+FORCE_FACTOR    = 8
+
+
+@dataclass
+class Hitch:
+    frame:   int
+    ms:      float
+    events:  list[str]
+
+
+@dataclass
+class FrameStats:
+    frames:          int   = 0
+    hitches:         int   = 0
+    last_ms:         float = 0.0
+    worst_ms:        float = 0.0
+    gc_in_frame:     list[int] = field(default_factory=lambda: [0, 0, 0])
+    gc_in_slack:     list[int] = field(default_factory=lambda: [0, 0, 0])
+    gc_ms:           float = 0.0
+    frozen:          int   = 0
+
+
+class FrameMonitor:
+
+    def __init__(self, budget_ms: float = DEFAULT_BUDGET_MS) -> None:
+        self.budget_ms = budget_ms
+        self.stats     = FrameStats()
+        self.recent: deque[Hitch] = deque(maxlen=HITCH_HISTORY)
+
+        self._frame_start = 0.0
+        self._events: list[str] = []
+        self._in_slack   = False
+        self._gc_started = 0.0
+        self._managing   = False
+
+        gc.callbacks.append(self._on_gc)
+
+    # --- GC control ---
+
+    def manage_gc(self) -> None:
+        # take over scheduling of collections from the interpreter
+        self._managing = True
+        gc.disable()
+
+    def release_gc(self) -> None:
+        self._managing = False
+        gc.enable()
+
+    def before_generation(self) -> None:
+        # let the previous dungeon become collectable again
+        gc.unfreeze()
+        self.mark("dungeon_generation")
+
+    def after_generation(self) -> None:
+        gc.collect()
+        gc.freeze()
+        self.stats.frozen = gc.get_freeze_count()
+
+    def _collect_in_slack(self, slack_ms: float) -> None:
+        counts     = gc.get_count()
+        thresholds = gc.get_threshold()
+        self._in_slack = True
+        try:
+            for gen in (2, 1, 0):
+                threshold = max(thresholds[gen], 1)
+                due    = counts[gen] >= threshold
+                forced = counts[gen] >= threshold * FORCE_FACTOR
+                if forced or (due and slack_ms >= SLACK_NEEDED_MS[gen]):
+                    gc.collect(gen)
+                    break
+        finally:
+            self._in_slack = False
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+            return
+        gen = info["generation"]
+        self.stats.gc_ms += (time.perf_counter() - self._gc_started) * 1000
+        if self._in_slack:
+            self.stats.gc_in_slack[gen] += 1
+        else:
+            self.stats.gc_in_frame[gen] += 1
+            self._events.append(f"gc{gen}")
+
+    # --- Frames ---
+
+    def mark(self, event: str) -> None:
+        self._events.append(event)
+
+    def begin_frame(self) -> None:
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        stats   = self.stats
+        work_ms = (time.perf_counter() - self._frame_start) * 1000
+        stats.frames  += 1
+        stats.last_ms  = work_ms
+        if work_ms > stats.worst_ms:
+            stats.worst_ms = work_ms
+
+        if work_ms > self.budget_ms:
+            stats.hitches += 1
+            hitch = Hitch(stats.frames, work_ms, self._events)
+            self.recent.append(hitch)
+            self._events = []
+            log.warning("frame %d over budget: %.2fms (%.2fms) [%s]",
+                        hitch.frame, work_ms, self.budget_ms,
+                        ", ".join(hitch.events) or "no events")
+        else:
+            self._events.clear()
+
+        if self._managing:
+            self._collect_in_slack(self.budget_ms - work_ms)
+
+    def overlay_text(self) -> str:
+        s = self.stats
+        return (f"frame {s.last_ms:.1f}ms worst {s.worst_ms:.1f}ms | "
+                f"hitches {s.hitches} | "
+                f"gc frame {'/'.join(map(str, s.gc_in_frame))} "
+                f"slack {'/'.join(map(str, s.gc_in_slack))} "
+                f"{s.gc_ms:.0f}ms | frozen {s.frozen}")
+
+
+FRAME_MONITOR = FrameMonitor()
@@ -7,9 +7,23 @@ import json
 
 import pygame
 from main.player import Player
-from main.dungeon_generator import DungeonGenerator
 from main.ui import TitleScreen, SettingsMenu
 from main.keybindings import KeyBindings
+from main.config import CONFIG, VideoConfig, GameplayConfig
+from main.frame_monitor import FRAME_MONITOR
+from main.fonts import get_font
+from main.startup import STARTUP
+from main.assets import ASSETS
+from main.audio import AUDIO
+from main.memory_telemetry import MEMORY
+from main.profiler import PROFILER
+from main.quality import QualityGovernor
+from main.pacing import FramePacer
+from main.render import RenderScaler
+from main.camera import Camera
+from main.particles import PARTICLES
+from main.timers import TIMERS
+from main.lockstep import LockstepPeer, encode_input, decode_input, state_hash
 
 
 @dataclass(frozen=True)
@@ -19,47 +33,125 @@ class Palette:
 
 PALETTE = Palette()
 
+PARTNER_COLOR = pygame.Color("#ffb74d")
+MAX_CATCHUP   = 4       # lockstep frames simulated per tick when behind
+
 
 class Game:
 
-    def __init__(self):
-        self.fps = 60
-        self.w = 960
+    def __init__(
+        self,
+        pacing:       str | None = None,
+        window_size:  tuple[int, int] | None = None,
+        render_scale: float | None = None,
+        scale_filter: str | None = None,
+        net:          LockstepPeer | None = None,
+        procedural_rooms: bool | None = None,
+        hot_reload:       bool = False,
+        seed:             int | None = None,
+    ):
+        # arguments (command line flags) override the stored settings;
+        # co-op peers must simulate alike, so they use the defaults
+        video = CONFIG.video
+        self.fps = video.fps if net is None else VideoConfig.fps
+        self.w = 960     # logical size, everything in-game is in these units
         self.h = 540
-        self.screen = pygame.display.set_mode((self.w, self.h))
-        self.font = pygame.font.SysFont(None, 24)
+        self.pacer = FramePacer(pacing or video.pacing)
+
+        window_size = window_size or video.window or (self.w, self.h)
+        if self.pacer.wants_vsync:
+            self.window = pygame.display.set_mode(window_size, pygame.SCALED, vsync=1)
+        else:
+            self.window = pygame.display.set_mode(window_size)
+        self.render_scale = render_scale if render_scale is not None else video.render_scale
+        self.scaler = RenderScaler((self.w, self.h), self.window, scale_filter or video.scale_filter)
+        self.screen = self.scaler.canvas(1.0)   # current canvas, see draw()
+        self.view   = None
+        self.camera = Camera(self.w, self.h)    # scrolls rooms bigger than the screen
+        STARTUP.mark("set_mode")
+        self.font = get_font(24)
+        STARTUP.mark("fonts")
 
         self.bindings = KeyBindings.load()
         self.Player = Player((self.w // 2, self.h // 2), self.bindings)
+        STARTUP.mark("settings + player")
 
         self.state: str = "title"   # title | settings | playing | gameover | paused
-        self.seed = random.randrange(0, 2**32)
+        self.seed = seed if seed is not None else random.randrange(0, 2**32)
         self.rng = random.Random(self.seed)
 
         self.debug = False   # toggle with F1 to see loading zones
+        self.show_minimap = CONFIG.gameplay.show_minimap   # toggle with M
+        self.quality = QualityGovernor(budget_ms=1000.0 / self.fps)
 
         self.title_screen = TitleScreen(self.w, self.h, self. font)
         self.settings_menu = SettingsMenu(self.w, self.h, self. font, self.bindings)
 
         self.events: list[pygame.event.Event] = []
-        self._reset_run()
+        self.dungeon = None    # generated lazily when a run starts
+        self.procedural_rooms = procedural_rooms if procedural_rooms is not None else CONFIG.gameplay.procedural_rooms
+        self.reloader = None
+        if hot_reload:
+            from main.hot_reload import LayoutReloader
+            self.reloader = LayoutReloader()
+
+        # --- Co-op (see lockstep.py) ---
+        # both peers simulate both players in the same order, so the
+        # partner is decoded with default bindings on either side
+        self.net = net
+        self.players = [self.Player]
+        if net is not None:
+            self.seed    = net.seed
+            self.partner = Player((self.w // 2, self.h // 2), KeyBindings())
+            self.partner.image.fill(PARTNER_COLOR)
+            self.players = [self.Player, self.partner] if net.index == 0 else [self.partner, self.Player]
+            self._ensure_run()
+            self.state = "playing"
+        STARTUP.mark("menus")
+
+    def _ensure_run(self) -> None:
+        if self.dungeon is None:
+            AUDIO.preload()
+            self._reset_run()
 
     # -------------------------------- reset  -------------------------------------- #
 
     def _reset_run(self) -> None:
-        self.Player._reset()
+        # imported here so the title screen doesn't wait on the dungeon code
+        from main.dungeon_generator import DungeonGenerator
+        from main.pools import ENTITY_POOL
+        from main.interior_generator import INTERIORS
+
+        for player in self.players:
+            player._reset()
+        TIMERS.clear()
+        PARTICLES.clear()
+
+        FRAME_MONITOR.before_generation()
+
+        # Recycle the old dungeon's entities into the pool
+        if self.dungeon is not None:
+            ENTITY_POOL.release_dungeon(self.dungeon)
 
         # --- Generate a fresh dungeon ---
         gen = DungeonGenerator(
             seed             = self.seed,
-            num_normal_rooms = 6,
+            num_normal_rooms = CONFIG.gameplay.num_normal_rooms if self.net is None else GameplayConfig.num_normal_rooms,
             screen_size      = (self.w, self.h),
+            pool             = ENTITY_POOL,
+            interiors        = INTERIORS if self.procedural_rooms else None,
         )
         self.dungeon = gen.generate()
+        FRAME_MONITOR.after_generation()
+        if self.net is not None:
+            # wall-clock AI budgets would make the peers diverge
+            from main.ai_scheduler import AIScheduler
+            self.dungeon.ai = AIScheduler(budget_us=None)
 
-        # Place player at the centre of the start room
-        self.Player.pos = pygame.Vector2(self.w // 2, self.h // 2)
-        self.Player.rect.center = (self.w // 2, self.h // 2)
+        # Place players at the centre of the start room
+        for slot, player in enumerate(self.players):
+            player.pos = pygame.Vector2(self.w // 2 + 48 * slot, self.h // 2)
+            player.rect.center = (round(player.pos.x), round(player.pos.y))
 
     # ------------------------------ Events ---------------------------------------- #
 
@@ -70,47 +162,138 @@ class Game:
                 return
             if event.key == pygame.K_F1:
                 self.debug = not self.debug
-            if event.key == pygame.K_r:
+            if event.key == pygame.K_F3:
+                MEMORY.toggle()
+            if event.key == pygame.K_F4:
+                if event.mod & pygame.KMOD_SHIFT:
+                    PROFILER.capture_transition()
+                else:
+                    PROFILER.capture()
+            if event.key == pygame.K_m:
+                self.show_minimap = not self.show_minimap
+                CONFIG.set("gameplay", show_minimap=self.show_minimap)
+            if event.key == pygame.K_r and self.net is None:
                 self.seed = random.randrange(0, 2**32)
-                self._reset_run()
+                if self.dungeon is not None:
+                    self._reset_run()
         self.events.append(event)
         return 
     
  # ------------------------------ Update ---------------------------------------- #
 
     def update(self, dt: float) -> None:
-       
+        ASSETS.pump()
+
+        if self.reloader is not None and self.dungeon is not None:
+            self.reloader.poll(self.dungeon)
+
         if self.state == "playing":
+            # judged on the previous frame's work time; profiling slows
+            # frames down, so it must not change what is being profiled
+            if not PROFILER.capturing:
+                self.quality.feed(FRAME_MONITOR.stats.last_ms)
             keys = pygame.key.get_pressed()
-            self.Player.update(dt, keys, self.events)
-            self.Player.wall_collisions(self.dungeon.current_room.all_walls)
-            self.dungeon.update(self.Player)
+            if self.net is not None:    # advances TIMERS per lockstep frame
+                with MEMORY.section("coop"):
+                    moved = self._update_coop(keys)
+            else:
+                TIMERS.advance(dt)
+                with MEMORY.section("player"):
+                    self.Player.update(dt, keys, self.events)
+                    self.dungeon.current_room.collide(self.Player)
+                with MEMORY.section("room.update"):
+                    moved = self.dungeon.update(self.Player, dt)
+            if moved:
+                PARTICLES.clear()
+                MEMORY.on_room_transition(self.dungeon)
+                PROFILER.on_room_transition()
+            with MEMORY.section("particles"):
+                PARTICLES.scale = self.quality.level.particle_scale
+                PARTICLES.update(dt)
+
+        AUDIO.flush()
+
+    def _update_coop(self, keys) -> bool:
+        # lockstep: only simulate frames both peers' inputs have arrived for
+        net = self.net
+        net.pump()
+        # one input per tick, so catching up never speeds the game up
+        if net.wants_input():
+            net.send_input(encode_input(keys, self.events, self.bindings))
+        moved = False
+        steps = 0
+        while net.ready() and steps < MAX_CATCHUP:
+            frame  = net.frame
+            moved |= self._step_coop(net.pop_frame())
+            net.check_state(frame, state_hash(self.players, self.dungeon))
+            steps += 1
+        if not steps:
+            net.stalls += 1
+        net.pump()
+        return moved
 
+    def _step_coop(self, inputs: tuple[int, int]) -> bool:
+        dt   = 1.0 / self.fps       # fixed step, never the wall clock
+        room = self.dungeon.current_room
+        TIMERS.advance(dt)
+        for player, bits in zip(self.players, inputs):
+            keys, events = decode_input(bits, player.controls.bindings)
+            player.update(dt, keys, events)
+            room.collide(player)
+        return self.dungeon.update(self.players[0], dt, self.players[1:])
 
     def draw(self) -> None:
+        # Menus render at logical size, the world at the internal render
+        # scale; either way the canvas is upscaled to the window at the end
+        playing = self.state == "playing"
+        scale = self.render_scale * self.quality.level.render_scale if playing else 1.0
+        self.screen = self.scaler.canvas(scale)
+        self.view   = None
+        if playing:
+            # keep everyone on screen: follow the players' midpoint
+            room = self.dungeon.current_room
+            xs   = [p.rect.centerx for p in self.players]
+            ys   = [p.rect.centery for p in self.players]
+            self.camera.follow((sum(xs) / len(xs), sum(ys) / len(ys)), room.screen_w, room.screen_h)
+            self.view = self.camera.view(scale)
+
         self.screen.fill(PALETTE.background)
         if self.state == "title":
-            self._draw_title()
+            with MEMORY.section("ui"):
+                self._draw_title()
         elif self.state == "playing":
-            self._draw_playing()
+            with MEMORY.section("draw"):
+                self._draw_playing()
         elif self.state == "paused":
             self._draw_paused()
         elif self.state == "settings":
-            self._draw_settings()
+            with MEMORY.section("ui"):
+                self._draw_settings()
         else:
             self._draw_gameover()
 
+        self.scaler.present(self.screen)
+        if playing:
+            if self.show_minimap:
+                self.dungeon.minimap.draw(self.window, (self.window.get_width() - 8, 8))
+            self._draw_dungeon_debug()
+
         self.events.clear()
+        MEMORY.end_frame()
 
     def _draw_playing(self) -> None:
         # Draw the active room first, then the player on top for layering
-        self.dungeon.draw(self.screen, debug=self.debug)
-        self.Player.draw(self.screen)
-        self._draw_dungeon_debug()
+        level = self.quality.level
+        self.dungeon.draw(self.screen, debug=self.debug and level.debug_overlay,
+                          hp_bars=level.hp_bars, view=self.view, area=self.camera.area)
+        PARTICLES.draw(self.screen, self.view)
+        for player in self.players:
+            player.draw(self.screen, self.view)
 
     def _draw_title(self) -> None:
         action = self.title_screen.draw(self.screen, self.events)
         if action == "start":
+            self._ensure_run()
             self.state = "playing"
         if action == "settings":
             self.state = "settings"
@@ -129,14 +312,35 @@ class Game:
         pass
 
     def _draw_dungeon_debug(self) -> None:
-        if self.debug:
+        # drawn on the window after upscaling so the text stays readable
+        if not self.debug:
+            return
+        q = self.quality
+        # the governor's own line stays up at every level, so the level that
+        # dropped the rest of the overlay can still be seen
+        quality = (f"quality {q.level.name} | avg {q.average_ms:.1f}ms / {q.budget_ms:.1f}ms | "
+                   f"render {self.screen.get_width()}x{self.screen.get_height()} ({self.scaler.scale_filter})")
+        if not q.level.debug_overlay:
+            lines = [quality]
+        else:
             room = self.dungeon.current_room
-            info = self.font.render(
-                f"Room {room.id} | {room.type.value.upper()} | F1=debug  R=regenerate dungeon",
-                True, pygame.Color("#ffffff"),
-            )
-            self.screen.blit(info, (8, self.h - 28))
-    
+            ai   = self.dungeon.ai.stats
+            lines = [
+                f"Room {room.id} | {room.type.value.upper()} | boss {self.dungeon.distance_to_boss()} rooms away | "
+                f"F1=debug  R=regenerate dungeon",
+                f"AI {ai.decisions} run / {ai.deferred} deferred ({ai.total_deferred} total) | "
+                f"stale max {ai.max_staleness * 1000:.0f}ms avg {ai.mean_staleness * 1000:.0f}ms",
+                FRAME_MONITOR.overlay_text(),
+                quality,
+                self.pacer.overlay_text(),
+            ]
+            if self.net is not None:
+                lines.append(self.net.overlay_text())
+        y = self.window.get_height() - 28
+        for line in lines:
+            self.window.blit(self.font.render(line, True, pygame.Color("#ffffff")), (8, y))
+            y -= 20
+
     def _draw_text(self, text: str, pos: tuple[int, int], color: pygame.Color) -> None:
         s = self.font.render(text, True, color)
         self.screen.blit(s, pos)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Optional
+import logging
+import time
+import main.room_layouts as room_layouts
+from main.layout_templates import reload_templates
+
+"""
+Dev mode hot reload of room_layouts.py.
+
+poll() stats the file a few times a second. When it changes the source is
+executed afresh (not importlib.reload, whose .pyc check can miss quick
+same-size edits), only the layouts whose dicts differ are recompiled
+(reload_templates), and only the rooms using those layouts are rebuilt
+through Dungeon.apply_templates(). That resets each room's walls, cached
+surface, collision list and raycaster; the dungeon graph, the current room
+and the player's position are kept. A broken edit (syntax error, bad tuple)
+is logged and the previous layouts stay in place.
+
+Run with --hot-reload.
+
+To use:
+    reloader = LayoutReloader()
+    reloader.poll(dungeon)          # once per frame, cheap
+"""
+
+log = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.25        # seconds between stat() calls
+
+
+class LayoutReloader:
+
+    def __init__(self, path: Optional[Path] = None, interval: float = POLL_INTERVAL) -> None:
+        self.path       = Path(path or room_layouts.__file__)
+        self.interval   = interval
+        self._mtime     = self._stat()
+        self._next_poll = 0.0
+
+        self.reloads = 0
+        self.last_ms = 0.0
+
+    def _stat(self) -> int:
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    def poll(self, dungeon) -> list[int]:
+        now = time.monotonic()
+        if now < self._next_poll:
+            return []
+        self._next_poll = now + self.interval
+        mtime = self._stat()
+        if mtime == self._mtime:
+            return []
+        self._mtime = mtime
+        return self.reload(dungeon)
+
+    def reload(self, dungeon) -> list[int]:
+        start = time.perf_counter()
+        try:
+            source    = self.path.read_text()
+            namespace: dict = {"__name__": room_layouts.__name__, "__file__": str(self.path)}
+            exec(compile(source, str(self.path), "exec"), namespace)
+            templates = reload_templates(namespace["NORMAL_ROOM_LAYOUTS"])
+        except Exception:
+            log.exception("layout reload failed, keeping the previous layouts")
+            return []
+
+        rebuilt = dungeon.apply_templates(templates) if dungeon is not None else 0
+        self.reloads += 1
+        self.last_ms  = (time.perf_counter() - start) * 1000
+        log.info("reloaded layouts %s, rebuilt %d rooms in %.2fms",
+                 sorted(templates), rebuilt, self.last_ms)
+        return sorted(templates)
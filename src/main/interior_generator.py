@@ -0,0 +1,313 @@
+from __future__ import annotations
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from typing import Optional
+import logging
+import random
+from main.entities import HazardType, EnemyType
+from main.layout_templates import LayoutTemplate, NAV_CELL, compile_layout, rasterize
+from main.room import Room, Direction, border_wall_rects, DOOR_SIZE, ENTRY_PAD, ROOM_W, ROOM_H
+
+"""
+Procedural room interiors.
+
+generate_interior() builds a layout dict (the same format as
+NORMAL_ROOM_LAYOUTS) from (seed, room id, door mask) alone, so every peer and
+every replay of a seed gets the same room. Walls and hazards are placed one
+at a time on the NAV_CELL grid; a piece is kept only if every door's entry
+point can still reach every other one. Reachability is a flood fill over
+the cells where a FOOTPRINT-sized box fits (player / heavy enemy), with
+hazards counted as blocking so no route forces the player through them.
+Enemies spawn on reachable cells away from the doors.
+
+InteriorGenerator runs that on a worker pool ahead of the player (prefetch
+a room's neighbours when it is entered) and caches the compiled
+LayoutTemplates by (seed, room id, door mask).
+
+To use:
+    INTERIORS.prefetch(seed, room)          # background
+    template = INTERIORS.get(seed, room)    # cached, or waits / builds inline
+"""
+
+log = logging.getLogger(__name__)
+
+FOOTPRINT   = (3, 3)        # cells, fits the 32x48 player and 36x36 enemies
+NUM_WORKERS = 2
+CACHE_SIZE  = 256
+
+_DOOR_BITS = {Direction.NORTH: 1, Direction.SOUTH: 2, Direction.EAST: 4, Direction.WEST: 8}
+
+
+def door_mask(doors) -> int:
+    mask = 0
+    for direction in doors:
+        mask |= _DOOR_BITS[direction]
+    return mask
+
+
+@dataclass(frozen=True)
+class InteriorSpec:
+    walls:          tuple[int, int] = (3, 7)      # pieces, inclusive
+    wall_cells:     tuple[int, int] = (2, 8)      # side length in NAV cells
+    mirror_chance:  float = 0.6                   # wall gets a left/right twin
+    hazards:        tuple[int, int] = (0, 4)
+    hazard_cells:   tuple[int, int] = (2, 6)
+    lava_chance:    float = 0.4
+    enemies:        tuple[int, int] = (2, 5)
+    enemy_weights:  dict[str, int] = field(default_factory=lambda: {
+        EnemyType.BASIC: 5, EnemyType.FAST: 3, EnemyType.HEAVY: 1})
+    door_clearance: int = ENTRY_PAD + 48          # px kept empty inside each door
+    spawn_distance: int = 200                     # px from any entry point
+    spawn_spacing:  int = 48                      # px between enemies
+    tries:          int = 12                      # placements per piece
+
+
+DEFAULT_SPEC = InteriorSpec()
+
+
+# --- Reachability ---
+
+def _free_footprints(blocked: bytearray, cols: int, rows: int) -> bytearray:
+    # 1 where a FOOTPRINT box with its top-left cell here touches nothing
+    fw, fh = FOOTPRINT
+    horiz = bytearray(cols * rows)
+    for r in range(rows):
+        base = r * cols
+        run  = 0
+        for c in range(cols - 1, -1, -1):
+            run = 0 if blocked[base + c] else run + 1
+            if run >= fw:
+                horiz[base + c] = 1
+    free = bytearray(cols * rows)
+    for c in range(cols):
+        run = 0
+        for i in range((rows - 1) * cols + c, -1, -cols):
+            run = run + 1 if horiz[i] else 0
+            if run >= fh:
+                free[i] = 1
+    return free
+
+
+def flood_fill(free: bytearray, cols: int, start: int) -> bytearray:
+    seen = bytearray(len(free))
+    if not free[start]:
+        return seen
+    seen[start] = 1
+    stack = [start]
+    n = len(free)
+    while stack:
+        i = stack.pop()
+        c = i % cols
+        for j in ((i - 1) if c > 0 else -1,
+                  (i + 1) if c < cols - 1 else -1,
+                  i - cols, i + cols):
+            if 0 <= j < n and free[j] and not seen[j]:
+                seen[j] = 1
+                stack.append(j)
+    return seen
+
+
+def _entry_cells(doors, width: int, height: int, cols: int) -> list[int]:
+    # footprint cell at each door's arrival point (see Dungeon._entry_position)
+    fw, fh = FOOTPRINT
+    cx, cy = width // 2, height // 2
+    points = {
+        Direction.NORTH: (cx, ENTRY_PAD),
+        Direction.SOUTH: (cx, height - ENTRY_PAD),
+        Direction.WEST:  (ENTRY_PAD, cy),
+        Direction.EAST:  (width - ENTRY_PAD, cy),
+    }
+    cells = []
+    for direction in doors:
+        x, y = points[direction]
+        cells.append((y - fh * NAV_CELL // 2) // NAV_CELL * cols + (x - fw * NAV_CELL // 2) // NAV_CELL)
+    return cells
+
+
+def _door_zones(doors, width: int, height: int, depth: int) -> list[tuple[int, int, int, int]]:
+    # rects in front of each door that must stay empty
+    cx, cy = width // 2, height // 2
+    half   = DOOR_SIZE // 2 + 2 * NAV_CELL
+    zones  = []
+    for direction in doors:
+        if direction == Direction.NORTH:
+            zones.append((cx - half, 0, 2 * half, depth))
+        elif direction == Direction.SOUTH:
+            zones.append((cx - half, height - depth, 2 * half, depth))
+        elif direction == Direction.WEST:
+            zones.append((0, cy - half, depth, 2 * half))
+        else:
+            zones.append((width - depth, cy - half, depth, 2 * half))
+    return zones
+
+
+def _overlaps(a, b) -> bool:
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+# --- Generation ---
+
+def generate_interior(
+    seed:    int,
+    room_id: int,
+    mask:    int,
+    spec:    InteriorSpec = DEFAULT_SPEC,
+    width:   int = ROOM_W,
+    height:  int = ROOM_H,
+) -> dict:
+    # str seeds hash the same in every process
+    rng   = random.Random(f"interior:{seed}:{room_id}:{mask}")
+    doors = [d for d, bit in _DOOR_BITS.items() if mask & bit]
+    cols  = -(-width  // NAV_CELL)
+    rows  = -(-height // NAV_CELL)
+
+    blocked = bytearray(rasterize(border_wall_rects(doors, width, height), cols, rows))
+    entries = _entry_cells(doors, width, height, cols)
+    zones   = _door_zones(doors, width, height, spec.door_clearance)
+
+    def connected(grid: bytearray) -> bool:
+        if not entries:
+            return True
+        reach = flood_fill(_free_footprints(grid, cols, rows), cols, entries[0])
+        return all(reach[e] for e in entries)
+
+    def place(rects: list[tuple[int, int, int, int]]) -> bool:
+        # commit rects to `blocked` if the doors stay connected
+        if any(_overlaps(r, z) for r in rects for z in zones):
+            return False
+        trial = bytearray(a | b for a, b in zip(blocked, rasterize(rects, cols, rows)))
+        if not connected(trial):
+            return False
+        blocked[:] = trial
+        return True
+
+    def random_rect(size: tuple[int, int]) -> tuple[int, int, int, int]:
+        w = rng.randint(*size)
+        h = rng.randint(*size)
+        c = rng.randint(2, cols - 2 - w)
+        r = rng.randint(2, rows - 3 - h)
+        return c * NAV_CELL, r * NAV_CELL, w * NAV_CELL, h * NAV_CELL
+
+    walls: list[tuple[int, int, int, int]] = []
+    for _ in range(rng.randint(*spec.walls)):
+        for _ in range(spec.tries):
+            rect = random_rect(spec.wall_cells)
+            group = [rect]
+            if rng.random() < spec.mirror_chance:
+                twin = (width - rect[0] - rect[2], rect[1], rect[2], rect[3])
+                if twin != rect:
+                    group.append(twin)
+            if place(group):
+                walls.extend(group)
+                break
+
+    hazards: list[tuple[int, int, int, int, str]] = []
+    for _ in range(rng.randint(*spec.hazards)):
+        kind = HazardType.LAVA if rng.random() < spec.lava_chance else HazardType.SPIKE
+        for _ in range(spec.tries):
+            rect = random_rect(spec.hazard_cells)
+            if any(_overlaps(rect, w) for w in walls):
+                continue
+            if place([rect]):
+                hazards.append((*rect, kind))
+                break
+
+    # enemies on cells the doors can reach, away from the entry points
+    fw, fh = FOOTPRINT
+    free  = _free_footprints(blocked, cols, rows)
+    reach = flood_fill(free, cols, entries[0]) if entries else free
+    half  = (fw * NAV_CELL // 2, fh * NAV_CELL // 2)
+    entry_points = [((e % cols) * NAV_CELL + half[0], (e // cols) * NAV_CELL + half[1]) for e in entries]
+    candidates = [
+        ((i % cols) * NAV_CELL + half[0], (i // cols) * NAV_CELL + half[1])
+        for i in range(cols * rows) if reach[i]
+    ]
+    candidates = [
+        p for p in candidates
+        if all((p[0] - x) ** 2 + (p[1] - y) ** 2 >= spec.spawn_distance ** 2 for x, y in entry_points)
+    ]
+    types, weights = zip(*spec.enemy_weights.items())
+    enemies: list[tuple[int, int, str]] = []
+    for _ in range(rng.randint(*spec.enemies)):
+        for _ in range(spec.tries):
+            if not candidates:
+                break
+            x, y = rng.choice(candidates)
+            if all((x - ex) ** 2 + (y - ey) ** 2 >= spec.spawn_spacing ** 2 for ex, ey, _ in enemies):
+                enemies.append((x, y, rng.choices(types, weights)[0]))
+                break
+
+    return {"walls": walls, "hazards": hazards, "enemies": enemies}
+
+
+# --- Worker pool + cache ---
+
+class InteriorGenerator:
+
+    def __init__(
+        self,
+        spec:       InteriorSpec = DEFAULT_SPEC,
+        workers:    int = NUM_WORKERS,
+        cache_size: int = CACHE_SIZE,
+    ) -> None:
+        self.spec       = spec
+        self.workers    = workers
+        self.cache_size = cache_size
+        self._cache:   OrderedDict[tuple[int, int, int], LayoutTemplate] = OrderedDict()
+        self._pending: dict[tuple[int, int, int], Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.hits     = 0      # already cached when needed
+        self.waits    = 0      # still generating when needed
+        self.inline   = 0      # never prefetched, built on the spot
+        self.built    = 0
+
+    @staticmethod
+    def key(seed: int, room: Room) -> tuple[int, int, int]:
+        return seed, room.id, door_mask(room.doors)
+
+    def _build(self, key: tuple[int, int, int]) -> LayoutTemplate:
+        seed, room_id, mask = key
+        layout = generate_interior(seed, room_id, mask, self.spec)
+        return compile_layout(-1, layout)
+
+    def prefetch(self, seed: int, room: Room) -> None:
+        key = self.key(seed, room)
+        if key in self._cache or key in self._pending:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="interiors")
+        self._pending[key] = self._executor.submit(self._build, key)
+
+    def get(self, seed: int, room: Room) -> LayoutTemplate:
+        key = self.key(seed, room)
+        template = self._cache.get(key)
+        if template is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return template
+
+        future = self._pending.pop(key, None)
+        if future is not None:
+            if not future.done():
+                self.waits += 1
+            template = future.result()
+        else:
+            self.inline += 1
+            template = self._build(key)
+        self.built += 1
+
+        self._cache[key] = template
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return template
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+
+INTERIORS = InteriorGenerator()
@@ -1,9 +1,7 @@
 from __future__ import annotations
-import json
-from pathlib import Path
 import pygame
 
-_DEFAULTS: dict[str, dict[str, int]] = {
+DEFAULT_BINDINGS: dict[str, dict[str, int]] = {
     "move": {
         "left":  pygame.K_a,
         "right": pygame.K_d,
@@ -24,13 +22,11 @@ _DEFAULTS: dict[str, dict[str, int]] = {
     },
 }
 
-SETTINGS_PATH = Path("settings.json")
-
 
 class KeyBindings:
     def __init__(self, data: dict[str, dict[str, int]] | None = None) -> None:
         self._bindings: dict[str, dict[str, int]] = {
-            group: dict(keys) for group, keys in _DEFAULTS.items()
+            group: dict(keys) for group, keys in DEFAULT_BINDINGS.items()
         }
         if data:
             for group, keys in data.items():
@@ -39,16 +35,14 @@ class KeyBindings:
 
     @classmethod
     def load(cls) -> "KeyBindings":
-        #loading from settings.json for controls
-        if SETTINGS_PATH.exists():
-            try:
-                return cls(json.loads(SETTINGS_PATH.read_text()))
-            except Exception:
-                pass
-        return cls()
+        # the bindings section of settings.json, validated by the config store
+        from main.config import CONFIG
+        return cls(CONFIG.bindings)
 
     def save(self) -> None:
-        SETTINGS_PATH.write_text(json.dumps(self._bindings, indent=2))
+        # returns straight away, the file is written in the background
+        from main.config import CONFIG
+        CONFIG.set_bindings(self._bindings)
 
     def get(self, group: str, action: str) -> int:
         return self._bindings[group][action]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from main.entities import Wall, Hazard
+from main.room_layouts import NORMAL_ROOM_LAYOUTS, W, H
+
+"""
+Immutable, precompiled room layouts.
+
+Every dict in NORMAL_ROOM_LAYOUTS is compiled once at import time into a
+LayoutTemplate. Rooms that pick a layout share its walls, hazards and
+rasters by reference; only the enemies (hp, position, AI state) are
+instantiated per room, as a small mutable overlay on top of the template.
+
+Static Wall / Hazard objects held by a template must never be mutated or
+released to an EntityPool. Templates themselves are only ever replaced,
+by reload_templates() when the layouts change on disk (see hot_reload.py).
+"""
+
+NAV_CELL = 16       # raster cell size in px (== WALL_THICKNESS)
+
+
+@dataclass(frozen=True)
+class LayoutTemplate:
+    index:       int
+    width:       int
+    height:      int
+
+    # packed x, y, w, h per wall / hazard
+    wall_rects:   tuple[int, ...]
+    hazard_rects: tuple[int, ...]
+
+    # shared static entities
+    walls:       tuple[Wall, ...]
+    hazards:     tuple[Hazard, ...]
+
+    # enemy spawn arrays (parallel)
+    spawn_xs:    tuple[int, ...]
+    spawn_ys:    tuple[int, ...]
+    spawn_types: tuple[str, ...]
+
+    # NAV_CELL rasters, row-major, 1 = blocked / hazardous
+    cols:        int
+    rows:        int
+    blocked:     bytes
+    hazardous:   bytes
+
+    @property
+    def num_enemies(self) -> int:
+        return len(self.spawn_types)
+
+    def cell_blocked(self, col: int, row: int) -> bool:
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return True
+        return self.blocked[row * self.cols + col] != 0
+
+    def point_blocked(self, x: float, y: float) -> bool:
+        return self.cell_blocked(int(x // NAV_CELL), int(y // NAV_CELL))
+
+
+def rasterize(rects: list[tuple[int, int, int, int]], cols: int, rows: int) -> bytes:
+    grid = bytearray(cols * rows)
+    for x, y, w, h in rects:
+        if w <= 0 or h <= 0:
+            continue
+        c0 = max(0, x // NAV_CELL)
+        c1 = min(cols - 1, (x + w - 1) // NAV_CELL)
+        r0 = max(0, y // NAV_CELL)
+        r1 = min(rows - 1, (y + h - 1) // NAV_CELL)
+        for row in range(r0, r1 + 1):
+            base = row * cols
+            grid[base + c0:base + c1 + 1] = b"\x01" * (c1 - c0 + 1)
+    return bytes(grid)
+
+
+def compile_layout(index: int, layout: dict, width: int = W, height: int = H) -> LayoutTemplate:
+    wall_rects   = [tuple(w[:4]) for w in layout["walls"]]
+    hazard_rects = [tuple(h[:4]) for h in layout["hazards"]]
+    cols = -(-width  // NAV_CELL)
+    rows = -(-height // NAV_CELL)
+
+    return LayoutTemplate(
+        index        = index,
+        width        = width,
+        height       = height,
+        wall_rects   = tuple(v for r in wall_rects   for v in r),
+        hazard_rects = tuple(v for r in hazard_rects for v in r),
+        walls        = tuple(Wall(*w)   for w in layout["walls"]),
+        hazards      = tuple(Hazard(*h) for h in layout["hazards"]),
+        spawn_xs     = tuple(e[0] for e in layout["enemies"]),
+        spawn_ys     = tuple(e[1] for e in layout["enemies"]),
+        spawn_types  = tuple(e[2] for e in layout["enemies"]),
+        cols         = cols,
+        rows         = rows,
+        blocked      = rasterize(wall_rects,   cols, rows),
+        hazardous    = rasterize(hazard_rects, cols, rows),
+    )
+
+
+NORMAL_ROOM_TEMPLATES: list[LayoutTemplate] = [
+    compile_layout(i, layout) for i, layout in enumerate(NORMAL_ROOM_LAYOUTS)
+]
+_SOURCES: list[dict] = list(NORMAL_ROOM_LAYOUTS)     # what each template was compiled from
+
+
+def reload_templates(layouts: list[dict]) -> dict[int, LayoutTemplate]:
+    # recompile only the layouts that differ from last time, in place, and
+    # return them by index; nothing changes if any layout fails to compile
+    fresh = {
+        i: compile_layout(i, layout)
+        for i, layout in enumerate(layouts)
+        if i >= len(_SOURCES) or _SOURCES[i] != layout
+    }
+    for i, template in fresh.items():
+        if i < len(NORMAL_ROOM_TEMPLATES):
+            NORMAL_ROOM_TEMPLATES[i] = template
+            _SOURCES[i] = layouts[i]
+        else:
+            NORMAL_ROOM_TEMPLATES.append(template)
+            _SOURCES.append(layouts[i])
+    del NORMAL_ROOM_TEMPLATES[len(layouts):]
+    del _SOURCES[len(layouts):]
+    return fresh
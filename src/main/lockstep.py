@@ -0,0 +1,354 @@
+from __future__ import annotations
+from typing import Optional
+import logging
+import random
+import socket
+import struct
+import time
+import zlib
+import pygame
+
+"""
+Deterministic lockstep for two-player co-op over TCP.
+
+DungeonGenerator is deterministic per seed, so the peers only exchange the
+seed (in the handshake) and their inputs. Every frame each peer samples its
+local input, schedules it `delay` frames ahead and sends it; a frame is only
+simulated once both inputs for it have arrived, with a fixed dt, in the same
+player order on both sides. The input delay hides up to delay / fps of
+latency before the simulation has to stall.
+
+Inputs are a 12-bit mask (move, aim, action presses). On the wire each frame
+is either MSG_SAME (1 byte, unchanged from the previous frame) or MSG_INPUT
+plus the new mask (3 bytes); frame numbers are implicit in the ordered
+stream. Every `hash_interval` frames both peers send a CRC of the player and
+enemy positions and hp; a mismatch records the first desynced frame.
+Payload bandwidth is measured per second in both directions.
+
+To use:
+    net = LockstepPeer.host(47321)            # or LockstepPeer.join("192.168.1.5")
+    net.pump()
+    if net.wants_input():                     # once per tick
+        net.send_input(encode_input(keys, events, bindings))
+    while net.ready():
+        frame = net.frame
+        p0_bits, p1_bits = net.pop_frame()
+        ...simulate one fixed step...
+        net.check_state(frame, state_hash(players, dungeon))
+"""
+
+log = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = 1
+MAGIC            = b"LS"
+DEFAULT_PORT     = 47321
+DEFAULT_DELAY    = 3          # frames
+HASH_INTERVAL    = 30         # frames between state hashes
+CONNECT_TIMEOUT  = 30.0       # seconds
+CLOSE_TIMEOUT    = 1.0        # seconds to flush the goodbye on quit
+
+MSG_SAME  = 0x00
+MSG_INPUT = 0x01              # + u16 mask
+MSG_HASH  = 0x02              # + u32 frame, u32 crc
+MSG_BYE   = 0x03
+
+_HELLO = struct.Struct("!2sBIBH")     # magic, version, seed, delay, hash interval
+_U16   = struct.Struct("!H")
+_HASH  = struct.Struct("!II")
+
+# --- Input encoding ---
+
+MOVE_DIRS    = ("left", "right", "up", "down")                                   # bits 0-3
+AIM_DIRS     = ("left", "right", "up", "down")                                   # bits 4-7
+ACTION_NAMES = ("weapon_next", "weapon_prev", "weapon_slot1", "weapon_slot2")    # bits 8-11
+
+
+def encode_input(keys, events: list[pygame.event.Event], bindings) -> int:
+    move    = bindings.move_keys()
+    aim     = bindings.aim_keys()
+    actions = bindings.action_keys()
+    bits = 0
+    for i, d in enumerate(MOVE_DIRS):
+        if any(keys[k] for k in move[d]):
+            bits |= 1 << i
+    for i, d in enumerate(AIM_DIRS):
+        if any(keys[k] for k in aim[d]):
+            bits |= 1 << (4 + i)
+    for event in events:
+        if event.type != pygame.KEYDOWN:
+            continue
+        for i, name in enumerate(ACTION_NAMES):
+            if event.key in actions.get(name, ()):
+                bits |= 1 << (8 + i)
+    return bits
+
+
+class InputKeys:
+    # stands in for pygame.key.get_pressed() when replaying a mask
+    __slots__ = ("_down",)
+
+    def __init__(self, down: set[int]) -> None:
+        self._down = down
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self._down
+
+
+def decode_input(bits: int, bindings) -> tuple[InputKeys, list[pygame.event.Event]]:
+    move    = bindings.move_keys()
+    aim     = bindings.aim_keys()
+    actions = bindings.action_keys()
+    down: set[int] = set()
+    for i, d in enumerate(MOVE_DIRS):
+        if bits >> i & 1:
+            down |= move[d]
+    for i, d in enumerate(AIM_DIRS):
+        if bits >> (4 + i) & 1:
+            down |= aim[d]
+    events = [
+        pygame.event.Event(pygame.KEYDOWN, key=next(iter(actions[name])))
+        for i, name in enumerate(ACTION_NAMES)
+        if bits >> (8 + i) & 1 and actions.get(name)
+    ]
+    return InputKeys(down), events
+
+
+def state_hash(players, dungeon) -> int:
+    # only the current room simulates, the others can't drift
+    crc = zlib.crc32(struct.pack("!I", dungeon.current_id))
+    for p in players:
+        crc = zlib.crc32(struct.pack("!ddi", p.pos.x, p.pos.y, p.currHealth), crc)
+    for e in dungeon.current_room.enemies:
+        crc = zlib.crc32(struct.pack("!ddi?", e.pos.x, e.pos.y, e.hp, e.alive), crc)
+    return crc
+
+
+# --- Connection ---
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    data = b""
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError("peer closed during handshake")
+        data += chunk
+    return data
+
+
+class LockstepPeer:
+
+    def __init__(
+        self,
+        sock:          socket.socket,
+        index:         int,
+        seed:          int,
+        delay:         int = DEFAULT_DELAY,
+        hash_interval: int = HASH_INTERVAL,
+    ) -> None:
+        self.sock  = sock
+        self.index = index            # 0 = host, 1 = guest; also the player slot
+        self.seed  = seed
+        self.delay = delay
+        self.hash_interval = hash_interval
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self.frame = 0                # next frame to simulate
+        # the first `delay` frames have no input from anyone
+        self._local:  dict[int, int] = {f: 0 for f in range(delay)}
+        self._remote: dict[int, int] = {f: 0 for f in range(delay)}
+        self._next_local  = delay
+        self._next_remote = delay
+        self._last_sent   = 0
+        self._last_recv   = 0
+
+        self._out = bytearray()
+        self._in  = bytearray()
+        self._hashes:        dict[int, int] = {}
+        self._remote_hashes: dict[int, int] = {}
+        self.desync_frame: Optional[int] = None
+        self.connected = True
+        self.stalls    = 0            # ticks where no frame could be simulated
+
+        self.bytes_sent = 0
+        self.bytes_recv = 0
+        self.sent_per_s = 0.0
+        self.recv_per_s = 0.0
+        self._window_t    = time.monotonic()
+        self._window_sent = 0
+        self._window_recv = 0
+
+    @classmethod
+    def host(
+        cls,
+        port:          int = DEFAULT_PORT,
+        seed:          Optional[int] = None,
+        delay:         int = DEFAULT_DELAY,
+        hash_interval: int = HASH_INTERVAL,
+        bind:          str = "0.0.0.0",
+        timeout:       float = CONNECT_TIMEOUT,
+    ) -> "LockstepPeer":
+        seed = random.randrange(0, 2**32) if seed is None else seed
+        with socket.create_server((bind, port)) as server:
+            server.settimeout(timeout)
+            log.info("waiting for co-op peer on port %d", port)
+            sock, addr = server.accept()
+        sock.settimeout(timeout)
+        sock.sendall(_HELLO.pack(MAGIC, PROTOCOL_VERSION, seed, delay, hash_interval))
+        magic, version, *_ = _HELLO.unpack(_recv_exact(sock, _HELLO.size))
+        if magic != MAGIC or version != PROTOCOL_VERSION:
+            sock.close()
+            raise ConnectionError(f"peer {addr} speaks a different protocol")
+        log.info("co-op peer %s joined (seed %d, input delay %d)", addr, seed, delay)
+        return cls(sock, 0, seed, delay, hash_interval)
+
+    @classmethod
+    def join(
+        cls,
+        address: str,
+        port:    int = DEFAULT_PORT,
+        timeout: float = CONNECT_TIMEOUT,
+    ) -> "LockstepPeer":
+        sock = socket.create_connection((address, port), timeout=timeout)
+        magic, version, seed, delay, hash_interval = _HELLO.unpack(_recv_exact(sock, _HELLO.size))
+        if magic != MAGIC or version != PROTOCOL_VERSION:
+            sock.close()
+            raise ConnectionError(f"{address}:{port} speaks a different protocol")
+        sock.sendall(_HELLO.pack(MAGIC, PROTOCOL_VERSION, seed, delay, hash_interval))
+        log.info("joined co-op host %s:%d (seed %d, input delay %d)", address, port, seed, delay)
+        return cls(sock, 1, seed, delay, hash_interval)
+
+    # --- Inputs ---
+
+    def wants_input(self) -> bool:
+        # keep exactly `delay` frames of local input in flight
+        return self.connected and self._next_local <= self.frame + self.delay
+
+    def send_input(self, bits: int) -> None:
+        self._local[self._next_local] = bits
+        self._next_local += 1
+        if bits == self._last_sent:
+            self._out.append(MSG_SAME)
+        else:
+            self._out.append(MSG_INPUT)
+            self._out += _U16.pack(bits)
+            self._last_sent = bits
+
+    def ready(self) -> bool:
+        return self.frame in self._local and self.frame in self._remote
+
+    def pop_frame(self) -> tuple[int, int]:
+        # (player 0 bits, player 1 bits), the same order on both peers
+        local  = self._local.pop(self.frame)
+        remote = self._remote.pop(self.frame)
+        self.frame += 1
+        return (local, remote) if self.index == 0 else (remote, local)
+
+    # --- Desync detection ---
+
+    def check_state(self, frame: int, crc: int) -> None:
+        # call after simulating `frame`
+        if frame % self.hash_interval:
+            return
+        self._hashes[frame] = crc
+        self._out.append(MSG_HASH)
+        self._out += _HASH.pack(frame, crc)
+        self._compare(frame)
+
+    def _compare(self, frame: int) -> None:
+        if frame not in self._hashes or frame not in self._remote_hashes:
+            return
+        ours, theirs = self._hashes.pop(frame), self._remote_hashes.pop(frame)
+        if ours != theirs and self.desync_frame is None:
+            self.desync_frame = frame
+            log.error("co-op desync at frame %d (local %08x, remote %08x)", frame, ours, theirs)
+
+    # --- Socket ---
+
+    def pump(self) -> None:
+        if not self.connected:
+            return
+        try:
+            if self._out:
+                sent = self.sock.send(self._out)
+                del self._out[:sent]
+                self.bytes_sent += sent
+            while True:
+                data = self.sock.recv(4096)
+                if not data:
+                    self._disconnect("peer closed the connection")
+                    break
+                self.bytes_recv += len(data)
+                self._in += data
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            self._disconnect(str(e))
+        self._parse()
+        self._update_rates()
+
+    def _parse(self) -> None:
+        buf, i = self._in, 0
+        while i < len(buf):
+            kind = buf[i]
+            if kind == MSG_SAME:
+                self._remote[self._next_remote] = self._last_recv
+                self._next_remote += 1
+                i += 1
+            elif kind == MSG_INPUT:
+                if i + 1 + _U16.size > len(buf):
+                    break
+                (self._last_recv,) = _U16.unpack_from(buf, i + 1)
+                self._remote[self._next_remote] = self._last_recv
+                self._next_remote += 1
+                i += 1 + _U16.size
+            elif kind == MSG_HASH:
+                if i + 1 + _HASH.size > len(buf):
+                    break
+                frame, crc = _HASH.unpack_from(buf, i + 1)
+                self._remote_hashes[frame] = crc
+                self._compare(frame)
+                i += 1 + _HASH.size
+            elif kind == MSG_BYE:
+                self._disconnect("peer left")
+                i = len(buf)
+            else:
+                self._disconnect(f"bad message type {kind}")
+                i = len(buf)
+        del buf[:i]
+
+    def _update_rates(self) -> None:
+        now     = time.monotonic()
+        elapsed = now - self._window_t
+        if elapsed < 1.0:
+            return
+        self.sent_per_s   = (self.bytes_sent - self._window_sent) / elapsed
+        self.recv_per_s   = (self.bytes_recv - self._window_recv) / elapsed
+        self._window_t    = now
+        self._window_sent = self.bytes_sent
+        self._window_recv = self.bytes_recv
+
+    def _disconnect(self, reason: str) -> None:
+        if self.connected:
+            log.warning("co-op connection lost: %s", reason)
+        self.connected = False
+
+    def close(self) -> None:
+        if self.connected:
+            try:
+                # a hung peer must not keep the game from quitting;
+                # socket.timeout is an OSError
+                self.sock.settimeout(CLOSE_TIMEOUT)
+                self.sock.sendall(bytes(self._out) + bytes([MSG_BYE]))
+            except OSError:
+                pass
+            self.connected = False
+        self.sock.close()
+
+    def overlay_text(self) -> str:
+        state = "ok" if self.desync_frame is None else f"DESYNC@{self.desync_frame}"
+        if not self.connected:
+            state += " disconnected"
+        return (f"net p{self.index + 1} frame {self.frame} delay {self.delay} | "
+                f"out {self.sent_per_s:.0f} B/s in {self.recv_per_s:.0f} B/s | "
+                f"stalls {self.stalls} | {state}")
@@ -0,0 +1,229 @@
+from __future__ import annotations
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from pathlib import Path
+import logging
+import sys
+import tracemalloc
+
+"""
+Optional per-frame allocation and memory telemetry (off by default).
+
+start() turns telemetry mode on, and keeps tracemalloc running until
+stop(). While it is on, every room transition records the live Room
+surfaces, entities and their bytes, plus the traced heap, and warns when
+the heap has grown across several transitions in a row. Growth shows up
+over minutes of play, so this is not tied to any capture window.
+
+capture(frames) is the allocation-site window: for the next N frames
+(start() opens one) it logs
+  * per subsystem section (player, room.update, draw...): the average and
+    worst transient high-water mark, i.e. how much was allocated and freed
+    again inside that section each frame
+  * the top net allocation sites over the window, grouped per module
+
+F3 in game toggles telemetry mode, or run with --memtrace.
+
+To use:
+    MEMORY.toggle()
+    with MEMORY.section("room.update"):
+        ...
+    MEMORY.end_frame()
+    MEMORY.on_room_transition(dungeon)
+"""
+
+log = logging.getLogger(__name__)
+
+DEFAULT_FRAMES   = 300
+TOP_SITES        = 5
+TRACE_DEPTH      = 1
+GROWTH_WINDOW    = 5          # transitions in a row that must all grow
+GROWTH_MIN_BYTES = 16 * 1024  # ...by at least this much in total
+
+_SRC_ROOT = Path(__file__).resolve().parent.parent
+_NULL     = nullcontext()
+
+
+def _subsystem(filename: str) -> str:
+    path = Path(filename)
+    try:
+        rel = path.resolve().relative_to(_SRC_ROOT)
+    except ValueError:
+        return "pygame" if "pygame" in path.parts else "other"
+    return ".".join(rel.with_suffix("").parts)
+
+
+class _Section:
+    # sections must not nest, each one resets the tracemalloc peak
+
+    def __init__(self, telemetry: "MemoryTelemetry", name: str) -> None:
+        self.telemetry = telemetry
+        self.name      = name
+        self.start     = 0
+
+    def __enter__(self) -> None:
+        self.start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def __exit__(self, *exc) -> None:
+        peak = tracemalloc.get_traced_memory()[1]
+        self.telemetry._record(self.name, peak - self.start)
+
+
+class MemoryTelemetry:
+
+    def __init__(self) -> None:
+        self.tracking    = False        # telemetry mode: transitions are recorded
+        self.enabled     = False        # an allocation-site window is running
+        self.frames_left = 0
+        self._sections:  dict[str, _Section] = {}
+        self._transient: dict[str, list[int]] = defaultdict(list)
+        self._start_snapshot = None
+        self._owns_trace = False
+
+        self.transitions: deque[tuple[int, int, int, int]] = deque(maxlen=GROWTH_WINDOW + 1)
+        self.transition_count = 0
+
+    # --- Telemetry mode ---
+
+    def start(self, frames: int = DEFAULT_FRAMES) -> None:
+        if self.tracking:
+            return
+        self._trace()
+        self.tracking = True
+        self.transitions.clear()
+        self.transition_count = 0
+        log.info("memory telemetry: on")
+        self.capture(frames)
+
+    def stop(self) -> None:
+        if not self.tracking:
+            return
+        if self.enabled:
+            self._finish()
+        self.tracking = False
+        self._untrace()
+        log.info("memory telemetry: off")
+
+    def toggle(self) -> None:
+        if self.tracking:
+            self.stop()
+        else:
+            self.start()
+
+    def _trace(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_DEPTH)
+            self._owns_trace = True
+
+    def _untrace(self) -> None:
+        if self._owns_trace and not (self.tracking or self.enabled):
+            tracemalloc.stop()
+            self._owns_trace = False
+
+    # --- Capture window ---
+
+    def capture(self, frames: int = DEFAULT_FRAMES) -> None:
+        if self.enabled:
+            return
+        self._trace()
+        self.enabled     = True
+        self.frames_left = frames
+        self._transient.clear()
+        self._start_snapshot = tracemalloc.take_snapshot()
+        log.info("memory telemetry: capturing %d frames", frames)
+
+    def section(self, name: str):
+        if not self.enabled:
+            return _NULL
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(self, name)
+        return section
+
+    def _record(self, name: str, transient: int) -> None:
+        self._transient[name].append(transient)
+
+    def end_frame(self) -> None:
+        if not self.enabled:
+            return
+        self.frames_left -= 1
+        if self.frames_left <= 0:
+            self._finish()
+
+    def _finish(self) -> None:
+        end = tracemalloc.take_snapshot()
+        log.info(self.report(end))
+        self.enabled = False
+        self._start_snapshot = None
+        self._untrace()
+
+    def report(self, end_snapshot) -> str:
+        lines = ["memory telemetry report", "  transient bytes per frame (avg / max):"]
+        for name, values in sorted(self._transient.items()):
+            avg = sum(values) / len(values)
+            lines.append(f"    {name:<16} {avg:10.0f} / {max(values):8d}")
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+                   tracemalloc.Filter(False, __file__)]
+        diff = end_snapshot.filter_traces(filters).compare_to(
+            self._start_snapshot.filter_traces(filters), "lineno")
+        by_sub: dict[str, list] = defaultdict(list)
+        for stat in diff:
+            if stat.size_diff <= 0 and stat.count_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            by_sub[_subsystem(frame.filename)].append(stat)
+
+        lines.append("  top net allocation sites:")
+        for sub, stats in sorted(by_sub.items(), key=lambda kv: -sum(s.size_diff for s in kv[1])):
+            lines.append(f"    [{sub}]")
+            for stat in sorted(stats, key=lambda s: -s.size_diff)[:TOP_SITES]:
+                frame = stat.traceback[0]
+                lines.append(f"      {Path(frame.filename).name}:{frame.lineno:<5} "
+                             f"{stat.size_diff:+9d} B  {stat.count_diff:+6d} blocks")
+        return "\n".join(lines)
+
+    # --- Room transitions ---
+
+    def on_room_transition(self, dungeon) -> None:
+        if not self.tracking:
+            return
+        self.transition_count += 1
+        surfaces, surface_bytes, entities, entity_bytes = self.live_counts(dungeon)
+        heap = tracemalloc.get_traced_memory()[0]
+        # surfaces live in SDL memory, outside tracemalloc, so count them too
+        self.transitions.append((heap + surface_bytes, surfaces, entities, entity_bytes))
+        log.info("room transition %d: heap %d B, %d surfaces (%d B), %d entities (%d B)",
+                 self.transition_count, heap, surfaces, surface_bytes, entities, entity_bytes)
+
+        if len(self.transitions) > GROWTH_WINDOW:
+            heaps = [t[0] for t in self.transitions]   # heap + surfaces
+            growing = all(b > a for a, b in zip(heaps, heaps[1:]))
+            if growing and heaps[-1] - heaps[0] >= GROWTH_MIN_BYTES:
+                log.warning("memory grew across the last %d room transitions (+%d B)",
+                            GROWTH_WINDOW, heaps[-1] - heaps[0])
+
+    @staticmethod
+    def live_counts(dungeon) -> tuple[int, int, int, int]:
+        surfaces = surface_bytes = entities = entity_bytes = 0
+        seen: set[int] = set()     # template walls/hazards are shared
+        for room in dungeon.rooms.values():
+            static = room._static
+            if static is not None:
+                surfaces      += len(static)
+                surface_bytes += static.nbytes()
+            for group in (room.all_walls, room.hazards):
+                for entity in group:
+                    if id(entity) in seen:
+                        continue
+                    seen.add(id(entity))
+                    entities += 1
+                    entity_bytes += sys.getsizeof(entity) + sys.getsizeof(entity.rect)
+            # enemy state lives in the room's World, the objects are facades
+            entities     += len(room.enemies)
+            entity_bytes += sum(sys.getsizeof(e) for e in room.enemies) + room.world.nbytes()
+        return surfaces, surface_bytes, entities, entity_bytes
+
+
+MEMORY = MemoryTelemetry()
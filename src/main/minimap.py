@@ -0,0 +1,145 @@
+from __future__ import annotations
+from typing import Optional
+import pygame
+from main.room import Room, RoomType, Direction
+
+"""
+Dungeon minimap with fog of war.
+
+The map is one cached surface covering the bounding box of the room grid,
+one cell per grid position. Visited and seen (a door away from a visited
+room) state lives in two bitsets indexed by grid cell. enter() runs on a
+room transition and redraws only the cells that changed, so per frame the
+minimap is a single blit whatever the dungeon size: cells shrink to fit
+MAX_PX, down to MIN_CELL_PX on a 128x128 grid.
+
+Unseen rooms are not drawn at all, seen rooms are drawn dim, visited rooms
+in their RoomType colour and the current room highlighted.
+
+To use:
+    minimap = Minimap(dungeon.rooms, dungeon.current_id)
+    minimap.enter(room_id)                 # on each room transition
+    minimap.draw(window, topright=(w - 8, 8))
+"""
+
+CELL_PX     = 14
+MIN_CELL_PX = 2
+MAX_PX      = 192       # longest side of the map surface
+
+COL_BACK    = (0, 0, 0, 150)
+COL_SEEN    = pygame.Color("#3a3a5c")
+COL_CURRENT = pygame.Color("#ffffff")
+COL_ROOM = {
+    RoomType.NORMAL:    pygame.Color("#8a8aa8"),
+    RoomType.START:     pygame.Color("#4fc3f7"),
+    RoomType.BOSS:      pygame.Color("#e74c3c"),
+    RoomType.MINI_GAME: pygame.Color("#2ecc71"),
+}
+
+
+class _Bitset:
+    __slots__ = ("_bits", "count")
+
+    def __init__(self, size: int) -> None:
+        self._bits = bytearray((size + 7) >> 3)
+        self.count = 0
+
+    def __contains__(self, i: int) -> bool:
+        return bool(self._bits[i >> 3] & (1 << (i & 7)))
+
+    def add(self, i: int) -> bool:
+        # True if the bit was newly set
+        byte, mask = i >> 3, 1 << (i & 7)
+        if self._bits[byte] & mask:
+            return False
+        self._bits[byte] |= mask
+        self.count += 1
+        return True
+
+
+class Minimap:
+
+    def __init__(self, rooms: dict[int, Room], start_id: int) -> None:
+        self.rooms = rooms
+        cols = [r.grid_pos[0] for r in rooms.values()]
+        rows = [r.grid_pos[1] for r in rooms.values()]
+        self.col0, self.row0 = min(cols), min(rows)
+        self.cols = max(cols) - self.col0 + 1
+        self.rows = max(rows) - self.row0 + 1
+        self.cell = max(MIN_CELL_PX, min(CELL_PX, MAX_PX // max(self.cols, self.rows)))
+
+        self.visited = _Bitset(self.cols * self.rows)
+        self.seen    = _Bitset(self.cols * self.rows)
+        self.current_id = start_id
+
+        self._surface: Optional[pygame.Surface] = None
+        self._dirty: set[int] = set()        # room ids to redraw
+        self.enter(start_id)
+
+    def _index(self, room: Room) -> int:
+        col, row = room.grid_pos
+        return (row - self.row0) * self.cols + (col - self.col0)
+
+    # --- Fog of war ---
+
+    def enter(self, room_id: int) -> None:
+        self._dirty.add(self.current_id)     # drop the old highlight
+        self.current_id = room_id
+        room = self.rooms[room_id]
+        self._dirty.add(room_id)
+        if self.visited.add(self._index(room)):
+            self.seen.add(self._index(room))
+            for door in room.doors.values():
+                if self.seen.add(self._index(self.rooms[door.target_room_id])):
+                    self._dirty.add(door.target_room_id)
+
+    # --- Drawing ---
+
+    def _build_surface(self) -> pygame.Surface:
+        surf = pygame.Surface((self.cols * self.cell, self.rows * self.cell), pygame.SRCALPHA)
+        surf.fill(COL_BACK)
+        self._dirty = {rid for rid, room in self.rooms.items() if self._index(room) in self.seen}
+        return surf
+
+    def _draw_cell(self, surf: pygame.Surface, room: Room) -> None:
+        c = self.cell
+        x = (room.grid_pos[0] - self.col0) * c
+        y = (room.grid_pos[1] - self.row0) * c
+        surf.fill(COL_BACK, (x, y, c, c))
+        i = self._index(room)
+        if i not in self.seen:
+            return
+
+        if room.id == self.current_id:
+            color = COL_CURRENT
+        elif i in self.visited:
+            color = COL_ROOM[room.type]
+        else:
+            color = COL_SEEN
+
+        inset = c // 5
+        surf.fill(color, (x + inset, y + inset, c - 2 * inset, c - 2 * inset))
+        if inset == 0:
+            return
+        # door stubs run to the cell edge and meet the neighbour's stub
+        mid = c // 2
+        half = max(1, c // 8)
+        for direction in room.doors:
+            if direction == Direction.NORTH:
+                r = (x + mid - half, y, 2 * half, inset)
+            elif direction == Direction.SOUTH:
+                r = (x + mid - half, y + c - inset, 2 * half, inset)
+            elif direction == Direction.WEST:
+                r = (x, y + mid - half, inset, 2 * half)
+            else:
+                r = (x + c - inset, y + mid - half, inset, 2 * half)
+            surf.fill(color, r)
+
+    def draw(self, surface: pygame.Surface, topright: tuple[int, int]) -> None:
+        if self._surface is None:
+            self._surface = self._build_surface()
+        if self._dirty:
+            for rid in self._dirty:
+                self._draw_cell(self._surface, self.rooms[rid])
+            self._dirty.clear()
+        surface.blit(self._surface, self._surface.get_rect(topright=topright))
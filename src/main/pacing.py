@@ -0,0 +1,154 @@
+from __future__ import annotations
+import logging
+import math
+import time
+import pygame
+
+"""
+Frame pacing strategies and jitter statistics.
+
+    sleep   clock.tick(fps). Lowest CPU, but wakes up with OS timer
+            granularity, so intervals wobble by a millisecond or more.
+    busy    clock.tick_busy_loop(fps). Precise, burns a core.
+    hybrid  sleep until SPIN_MARGIN before the deadline, then spin. Nearly
+            as precise as busy at a fraction of the CPU.
+    vsync   display opened with SCALED + vsync and flip() does the waiting.
+            Capped at twice the target as a safety net for drivers that
+            ignore vsync.
+
+tick() is a drop-in for Clock.tick() (returns elapsed ms) and records every
+frame interval in a histogram, plus jitter, missed deadlines (intervals over
+MISS_FACTOR * period) and the process CPU share, so strategies can be
+compared at 60/120/144 Hz.
+"""
+
+log = logging.getLogger(__name__)
+
+STRATEGIES   = ("sleep", "busy", "hybrid", "vsync")
+SPIN_MARGIN  = 0.002      # seconds left to spin in hybrid mode
+MISS_FACTOR  = 1.5
+BUCKET_MS    = 0.5
+NUM_BUCKETS  = 80         # 0..40ms, the last bucket also catches overflow
+
+
+class FramePacer:
+
+    def __init__(self, strategy: str = "sleep") -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown pacing strategy {strategy!r}, expected one of {STRATEGIES}")
+        self.strategy = strategy
+        self.clock    = pygame.time.Clock()
+        self.reset_stats()
+        self._deadline = 0.0
+
+    @property
+    def wants_vsync(self) -> bool:
+        return self.strategy == "vsync"
+
+    def reset_stats(self) -> None:
+        self.histogram = [0] * NUM_BUCKETS
+        self.count     = 0
+        self.missed    = 0
+        self._mean     = 0.0
+        self._m2       = 0.0
+        self._target_dev = 0.0
+        self._last     = None
+        self._wall0    = time.perf_counter()
+        self._cpu0     = time.process_time()
+        self.period_ms = 0.0
+
+    # --- Waiting ---
+
+    def tick(self, fps: int) -> int:
+        if self.strategy == "sleep":
+            ms = self.clock.tick(fps)
+        elif self.strategy == "busy":
+            ms = self.clock.tick_busy_loop(fps)
+        elif self.strategy == "hybrid":
+            self._hybrid_wait(fps)
+            ms = self.clock.tick()
+        else:
+            ms = self.clock.tick(fps * 2)
+
+        self._record(fps)
+        return ms
+
+    def _hybrid_wait(self, fps: int) -> None:
+        if fps <= 0:
+            return
+        period = 1.0 / fps
+        now    = time.perf_counter()
+        self._deadline += period
+        if self._deadline < now - period:
+            # fell far behind, don't try to catch up with a burst of frames
+            self._deadline = now
+            return
+        remaining = self._deadline - now - SPIN_MARGIN
+        if remaining > 0:
+            time.sleep(remaining)
+        while time.perf_counter() < self._deadline:
+            pass
+
+    # --- Stats ---
+
+    def _record(self, fps: int) -> None:
+        now = time.perf_counter()
+        if self._last is None:
+            self._last = now
+            return
+        interval = (now - self._last) * 1000
+        self._last = now
+
+        self.period_ms = 1000.0 / fps if fps > 0 else 0.0
+        self.count += 1
+        delta       = interval - self._mean
+        self._mean += delta / self.count
+        self._m2   += delta * (interval - self._mean)
+        self._target_dev += abs(interval - self.period_ms)
+        if self.period_ms and interval > self.period_ms * MISS_FACTOR:
+            self.missed += 1
+        self.histogram[min(int(interval / BUCKET_MS), NUM_BUCKETS - 1)] += 1
+
+    @property
+    def mean_ms(self) -> float:
+        return self._mean
+
+    @property
+    def jitter_ms(self) -> float:
+        # standard deviation of the frame interval
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    @property
+    def deviation_ms(self) -> float:
+        # mean absolute distance from the target period
+        return self._target_dev / self.count if self.count else 0.0
+
+    @property
+    def cpu_share(self) -> float:
+        wall = time.perf_counter() - self._wall0
+        return (time.process_time() - self._cpu0) / wall if wall > 0 else 0.0
+
+    def percentile_ms(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        target = p * self.count
+        seen = 0
+        for i, n in enumerate(self.histogram):
+            seen += n
+            if seen >= target:
+                return (i + 1) * BUCKET_MS
+        return NUM_BUCKETS * BUCKET_MS
+
+    def overlay_text(self) -> str:
+        return (f"pacing {self.strategy} | interval {self.mean_ms:.2f}ms "
+                f"jitter {self.jitter_ms:.2f}ms p99 {self.percentile_ms(0.99):.1f}ms | "
+                f"missed {self.missed} | cpu {self.cpu_share * 100:.0f}%")
+
+    def report(self) -> str:
+        lines = [self.overlay_text(), f"  mean |interval - target| {self.deviation_ms:.2f}ms over {self.count} frames"]
+        peak = max(self.histogram) or 1
+        for i, n in enumerate(self.histogram):
+            if n:
+                label = f">={i * BUCKET_MS:.1f}" if i == NUM_BUCKETS - 1 else f"{i * BUCKET_MS:5.1f}"
+                lines.append(f"  {label:>6}ms {n:7d} {'#' * max(1, 40 * n // peak)}")
+        return "\n".join(lines)
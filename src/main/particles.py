@@ -0,0 +1,183 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional
+import math
+import numpy as np
+import pygame
+
+"""
+NumPy particle system for short-lived hit, death and hazard effects.
+
+All particles live in fixed-capacity arrays (position, velocity, life, color)
+with the live ones packed at the front. update() integrates and culls every
+particle in one vectorised step, and draw() writes them straight into the
+canvas pixels through pygame.surfarray, fading each one into whatever is
+underneath as its life runs out. Nothing is allocated per particle.
+
+Emitters are configured per event type in EMITTERS. The total is capped at
+`capacity`; emits past the cap are dropped (and counted), never queued.
+`scale` thins every burst, the quality governor drives it through
+QualityLevel.particle_scale.
+
+To use:
+    PARTICLES.emit("enemy_death", enemy.rect.center, color=enemy.color)
+    PARTICLES.update(dt)                    # once per frame
+    PARTICLES.draw(canvas, view)
+"""
+
+MAX_PARTICLES = 4096
+
+
+@dataclass(frozen=True)
+class EmitterDef:
+    count:  int                          # particles per emit at scale 1.0
+    speed:  tuple[float, float]          # px/s, uniform in [lo, hi)
+    life:   tuple[float, float]          # seconds
+    colors: tuple[str, ...]              # picked at random per particle
+    spread: float = 360.0                # degrees around `angle`
+    angle:  float = 0.0                  # degrees, 0 = east, 90 = south
+    drag:   float = 3.0                  # velocity lost per second (exponential)
+    gravity: float = 0.0                 # px/s^2, positive is down
+    size:   int   = 2                    # square size in logical pixels
+
+
+EMITTERS: dict[str, EmitterDef] = {
+    "enemy_hit":   EmitterDef(6,  (60, 160),  (0.15, 0.30), ("#ffffff", "#ffd27f")),
+    "enemy_death": EmitterDef(48, (80, 260),  (0.35, 0.80), ("#ffffff",), drag=4.0, size=3),
+    "lava":        EmitterDef(3,  (40, 120),  (0.30, 0.60), ("#ff4500", "#ffa500", "#ffd700"),
+                              spread=100.0, angle=270.0, gravity=240.0),
+    "spike":       EmitterDef(2,  (60, 140),  (0.10, 0.25), ("#ffffff", "#b0b0b0")),
+    "impact":      EmitterDef(10, (80, 200),  (0.10, 0.30), ("#ffffff", "#cccccc"), drag=6.0),
+}
+
+
+class ParticleSystem:
+
+    def __init__(self, capacity: int = MAX_PARTICLES, seed: Optional[int] = None) -> None:
+        self.capacity = capacity
+        self.count    = 0              # live particles are [0, count)
+        self.scale    = 1.0
+        self.dropped  = 0
+
+        self.pos      = np.zeros((capacity, 2), np.float32)
+        self.vel      = np.zeros((capacity, 2), np.float32)
+        self.gravity  = np.zeros(capacity, np.float32)
+        self.drag     = np.zeros(capacity, np.float32)
+        self.life     = np.zeros(capacity, np.float32)
+        self.max_life = np.ones(capacity, np.float32)
+        self.color    = np.zeros((capacity, 3), np.float32)
+        self.size     = np.zeros(capacity, np.int16)
+
+        self._rng = np.random.default_rng(seed)
+        self._palettes: dict[str, np.ndarray] = {}
+
+    # --- Emitting ---
+
+    def emit(
+        self,
+        name:  str,
+        pos:   tuple[float, float],
+        color: Optional[pygame.Color] = None,
+        count: Optional[int] = None,
+    ) -> int:
+        # returns how many particles were actually spawned
+        edef = EMITTERS.get(name)
+        if edef is None:
+            return 0
+        wanted = round((edef.count if count is None else count) * self.scale)
+        n = min(wanted, self.capacity - self.count)
+        self.dropped += wanted - max(n, 0)
+        if n <= 0:
+            return 0
+
+        rng = self._rng
+        s   = slice(self.count, self.count + n)
+        half  = math.radians(edef.spread) / 2
+        theta = rng.uniform(-half, half, n) + math.radians(edef.angle)
+        speed = rng.uniform(edef.speed[0], edef.speed[1], n)
+        life  = rng.uniform(edef.life[0], edef.life[1], n)
+
+        self.pos[s]      = pos
+        self.vel[s, 0]   = np.cos(theta) * speed
+        self.vel[s, 1]   = np.sin(theta) * speed
+        self.gravity[s]  = edef.gravity
+        self.drag[s]     = edef.drag
+        self.life[s]     = life
+        self.max_life[s] = life
+        self.size[s]     = edef.size
+        if color is not None:
+            self.color[s] = tuple(color)[:3]
+        else:
+            palette = self._palette(name, edef)
+            self.color[s] = palette[rng.integers(0, len(palette), n)]
+
+        self.count += n
+        return n
+
+    def _palette(self, name: str, edef: EmitterDef) -> np.ndarray:
+        palette = self._palettes.get(name)
+        if palette is None:
+            palette = np.array([tuple(pygame.Color(c))[:3] for c in edef.colors], np.float32)
+            self._palettes[name] = palette
+        return palette
+
+    def clear(self) -> None:
+        self.count = 0
+
+    # --- Simulation ---
+
+    def update(self, dt: float) -> None:
+        n = self.count
+        if n == 0 or dt <= 0:
+            return
+        pos, vel, life = self.pos[:n], self.vel[:n], self.life[:n]
+
+        vel *= np.exp(-self.drag[:n] * dt)[:, None]
+        vel[:, 1] += self.gravity[:n] * dt
+        pos += vel * dt
+        life -= dt
+
+        alive = life > 0
+        live  = int(np.count_nonzero(alive))
+        if live == n:
+            return
+        # pack the survivors to the front, in order
+        for arr in (self.pos, self.vel, self.gravity, self.drag,
+                    self.life, self.max_life, self.color, self.size):
+            arr[:live] = arr[:n][alive]
+        self.count = live
+
+    # --- Drawing ---
+
+    def draw(self, surface: pygame.Surface, view=None) -> None:
+        n = self.count
+        if n == 0 or surface.get_bytesize() < 3:
+            return
+        scale, ox, oy = (1.0, 0, 0) if view is None else (view.scale, view.x, view.y)
+        w, h  = surface.get_size()
+
+        xs    = (self.pos[:n, 0] * scale).astype(np.int32) - ox
+        ys    = (self.pos[:n, 1] * scale).astype(np.int32) - oy
+        sizes = np.maximum(1, (self.size[:n] * scale).astype(np.int32))
+        alpha = (self.life[:n] / self.max_life[:n])[:, None]
+        color = self.color[:n]
+
+        pixels = pygame.surfarray.pixels3d(surface)
+        try:
+            # one pass per pixel offset inside the largest square
+            for dy in range(int(sizes.max())):
+                for dx in range(int(sizes.max())):
+                    px = xs + dx
+                    py = ys + dy
+                    mask = (sizes > max(dx, dy)) & (px >= 0) & (px < w) & (py >= 0) & (py < h)
+                    if not mask.any():
+                        continue
+                    px, py = px[mask], py[mask]
+                    under  = pixels[px, py].astype(np.float32)
+                    a      = alpha[mask]
+                    pixels[px, py] = (under + (color[mask] - under) * a).astype(np.uint8)
+        finally:
+            del pixels      # unlocks the surface
+
+
+PARTICLES = ParticleSystem()
@@ -2,6 +2,8 @@ import pygame
 from main.weapon import Weapon
 from main.item import Item
 from main.keybindings import KeyBindings
+from main.assets import normalize_surface
+from main.timers import TIMERS
 
 class ControlScheme:
     def __init__(self, bindings: KeyBindings) -> None:
@@ -38,6 +40,8 @@ class Player(pygame.sprite.Sprite):
     MAX_WEAPONS = 2
     PLAYER_SIZE = (32, 48)
     COLOR = pygame.Color("#4fc3f7")
+    INVULN_S      = 0.4     # no damage for this long after a hit
+    HAZARD_TICK_S = 0.5     # standing in hazards hurts once per tick
 
 
     def __init__(self, pos: tuple[int, int], bindings: KeyBindings) -> None:
@@ -47,6 +51,9 @@ class Player(pygame.sprite.Sprite):
         self.maxHealth: int = 200
         self.currHealth: int  = self.maxHealth
         self.speed : int = 400
+        # cooldowns are timers on TIMERS (timers.py), None when not running
+        self._invuln_timer = None
+        self._hazard_timer = None
 
         self.controls = ControlScheme(bindings)
 
@@ -60,6 +67,8 @@ class Player(pygame.sprite.Sprite):
         # --- sprite + position ---
         self.image = pygame.Surface(self.PLAYER_SIZE, pygame.SRCALPHA)
         self.image.fill(self.COLOR)
+        self.image = normalize_surface(self.image)
+        self._scaled_image = None     # image at the last render scale
         self.rect = self.image.get_rect(center=pos)
         self.pos = pygame.Vector2(pos)
         self.aim_dir = pygame.Vector2(1,0)
@@ -137,8 +146,30 @@ class Player(pygame.sprite.Sprite):
         return self.weaponInv[self.currWeaponIndex] if self.weaponInv else None
     
     # --- Health ---
-    def take_damage(self, amount: int) -> None:
+    def take_damage(self, amount: int) -> bool:
+        # ignored while invulnerable; returns whether it landed
+        if self._invuln_timer is not None:
+            return False
         self.currHealth = max(0, self.currHealth - amount)
+        self._invuln_timer = TIMERS.schedule(self.INVULN_S, self._end_invulnerability)
+        return True
+
+    def _end_invulnerability(self) -> None:
+        self._invuln_timer = None
+
+    @property
+    def invulnerable(self) -> bool:
+        return self._invuln_timer is not None
+
+    @property
+    def hazard_ready(self) -> bool:
+        return self._hazard_timer is None
+
+    def start_hazard_tick(self) -> None:
+        self._hazard_timer = TIMERS.schedule(self.HAZARD_TICK_S, self._end_hazard_tick)
+
+    def _end_hazard_tick(self) -> None:
+        self._hazard_timer = None
 
     def heal(self, amount: int) -> None:
         self.currHealth = min(self.maxHealth, self.currHealth + amount)
@@ -148,14 +179,29 @@ class Player(pygame.sprite.Sprite):
         return self.currHealth <= 0
     
     def _reset(self) -> None:
-        pass
+        TIMERS.cancel(self._invuln_timer)
+        TIMERS.cancel(self._hazard_timer)
+        self._invuln_timer = None
+        self._hazard_timer = None
+        for weapon in self.weaponInv:
+            weapon.cancel()
     
     # --- Drawing --- 
-    def draw(self, surface: pygame.Surface) -> None:
-        surface.blit(self.image, self.rect)
-        self._draw_aim_line(surface)
-
-    def _draw_aim_line(self, surface: pygame.Surface) -> None:
+    def draw(self, surface: pygame.Surface, view=None) -> None:
+        if view is None:
+            surface.blit(self.image, self.rect)
+        else:
+            rect = view.rect(self.rect)
+            if self._scaled_image is None or self._scaled_image.get_size() != rect.size:
+                self._scaled_image = pygame.transform.scale(self.image, rect.size)
+            surface.blit(self._scaled_image, rect)
+        self._draw_aim_line(surface, view)
+
+    def _draw_aim_line(self, surface: pygame.Surface, view=None) -> None:
         start = pygame.Vector2(self.rect.center)
         end = start + self.aim_dir * 28
-        pygame.draw.line(surface, pygame.Color("#ffffff"), start, end, 2)
\ No newline at end of file
+        if view is None:
+            pygame.draw.line(surface, pygame.Color("#ffffff"), start, end, 2)
+        else:
+            pygame.draw.line(surface, pygame.Color("#ffffff"),
+                             view.point(start), view.point(end), view.length(2))
\ No newline at end of file
@@ -0,0 +1,91 @@
+from __future__ import annotations
+from typing import Iterable
+from main.entities import Wall, Hazard, Enemy
+from main.ecs import ENEMY
+
+"""
+Reset-and-reuse pool for room entities.
+
+Regenerating the dungeon (R) used to throw away every Wall / Hazard / Enemy
+and their Rect / Vector2 members. Entities are now handed back to the pool
+when a dungeon (or a failed generation attempt) is discarded, and
+DungeonGenerator draws from it through reset() instead of allocating.
+
+To use:
+    wall  = ENTITY_POOL.wall(x, y, w, h)
+    enemy = ENTITY_POOL.enemy(x, y, EnemyType.FAST)
+    ENTITY_POOL.release_dungeon(old_dungeon)
+"""
+
+DEFAULT_MAX_FREE = 2048     # per type, anything past this is left to the GC
+
+
+class EntityPool:
+
+    def __init__(self, max_free: int = DEFAULT_MAX_FREE) -> None:
+        self.max_free = max_free
+        self._free: dict[type, list] = {Wall: [], Hazard: [], Enemy: []}
+        self.created  = 0
+        self.reused   = 0
+
+    # --- Acquire ---
+
+    def wall(self, x: int, y: int, w: int, h: int) -> Wall:
+        free = self._free[Wall]
+        if free:
+            self.reused += 1
+            return free.pop().reset(x, y, w, h)
+        self.created += 1
+        return Wall(x, y, w, h)
+
+    def hazard(self, *args) -> Hazard:
+        free = self._free[Hazard]
+        if free:
+            self.reused += 1
+            return free.pop().reset(*args)
+        self.created += 1
+        return Hazard(*args)
+
+    def enemy(self, *args) -> Enemy:
+        free = self._free[Enemy]
+        if free:
+            self.reused += 1
+            return free.pop().reset(*args)
+        self.created += 1
+        return Enemy(*args)
+
+    # --- Release ---
+
+    def release(self, entities: Iterable) -> None:
+        for entity in entities:
+            if type(entity) is Enemy:
+                entity.release()
+            free = self._free.get(type(entity))
+            if free is not None and len(free) < self.max_free:
+                free.append(entity)
+
+    def release_room(self, room) -> None:
+        # template walls/hazards are shared between rooms, never pool those
+        if room.template is None:
+            self.release(room.walls)
+            self.release(room.hazards)
+        self.release(room._border_walls)
+        room.world.clear(ENEMY)            # whole archetype at once, not row by row
+        self.release(room.enemies)
+        room.walls         = ()
+        room.hazards       = ()
+        room.enemies       = []
+        room._border_walls = []
+        room._all_walls    = None
+        room.invalidate_surface()
+
+    def release_dungeon(self, dungeon) -> None:
+        for room in dungeon.rooms.values():
+            self.release_room(room)
+
+    @property
+    def free_counts(self) -> dict[str, int]:
+        return {cls.__name__: len(items) for cls, items in self._free.items()}
+
+
+ENTITY_POOL = EntityPool()
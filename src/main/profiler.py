@@ -0,0 +1,246 @@
+from __future__ import annotations
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+import cProfile
+import io
+import logging
+import pstats
+import time
+
+"""
+On-demand cProfile capture from a running session (off by default).
+
+capture(frames) profiles the next N frames. capture_transition() waits for
+the next room transition and profiles that frame plus the one after it
+(the first full frame in the new room). Until the transition comes, every
+frame is profiled and thrown away, so the profile covers the transition
+itself rather than the frames around it.
+
+Each frame is tagged with the game state and, while playing, the current
+room type ("playing/boss", "title"), and frames with the same tag share
+a profile. When the capture ends, two files go to PROFILE_DIR:
+
+    <stamp>-<what>.pstats     every tag merged: pstats.Stats(path), snakeviz...
+    <stamp>-<what>.collapsed  one "tag;caller;...;callee microseconds" line
+                              per stack, for flamegraph.pl / speedscope
+
+cProfile records caller -> callee edges, not whole stacks, so the collapsed
+stacks are rebuilt from the edges. A function reached from several callers
+has its time split between them in proportion to each caller's share.
+The log gets the time per tag and the top functions.
+
+`capturing` is only set once frames count toward the capture, not while
+a transition capture waits. Quitting mid-capture writes what was recorded
+so far (flush()).
+
+F4 in game profiles frames and Shift+F4 profiles the next room transition;
+or run with --profile.
+
+To use:
+    PROFILER.capture(120)
+    PROFILER.begin_frame(game.state, room_type)     # around each frame
+    PROFILER.on_room_transition()
+    PROFILER.end_frame()
+    PROFILER.flush()                                # on shutdown
+"""
+
+log = logging.getLogger(__name__)
+
+PROFILE_DIR       = Path("profiles")
+DEFAULT_FRAMES    = 120
+TRANSITION_FRAMES = 2           # the transition frame and the next one
+TOP_FUNCTIONS     = 15
+MAX_DEPTH         = 96          # collapsed stacks are cut off below this
+MIN_SHARE         = 1e-5        # ...and dropped under this share of their tag's time
+
+
+def _label(func: tuple[str, int, str]) -> str:
+    filename, lineno, name = func
+    if filename == "~":                         # builtins
+        label = name
+    else:
+        label = f"{Path(filename).stem}.{name}:{lineno}"
+    return label.replace(";", ",")
+
+
+def collapse(stats: pstats.Stats, root: str) -> dict[str, float]:
+    # "root;outer;...;inner" -> self time in seconds, rebuilt from the
+    # caller/callee edges (see the module docstring)
+    entries  = stats.stats
+    children: dict[tuple, list[tuple[tuple, float]]] = defaultdict(list)
+    roots = []
+    for func, (_, _, _, ct, callers) in entries.items():
+        known = [c for c in callers if c in entries and c != func]
+        for caller in known:
+            children[caller].append((func, callers[caller][3]))
+        if not known:
+            roots.append(func)
+
+    total  = sum(entries[f][3] for f in roots)
+    cutoff = total * MIN_SHARE
+    stacks: dict[str, float] = defaultdict(float)
+
+    def expand(func, path: str, on_path: set, weight: float, depth: int) -> None:
+        _, _, tt, ct, _ = entries[func]
+        share = weight / ct if ct > 0 else 0.0
+        path  = f"{path};{_label(func)}"
+        if tt * share > 0:
+            stacks[path] += tt * share
+        if depth >= MAX_DEPTH:
+            return
+        on_path.add(func)
+        for child, edge_ct in children.get(func, ()):
+            w = edge_ct * share
+            if w > cutoff and child not in on_path:     # recursion is folded in
+                expand(child, path, on_path, w, depth + 1)
+        on_path.discard(func)
+
+    for func in roots:
+        expand(func, root, set(), entries[func][3], 0)
+    return stacks
+
+
+class Profiler:
+
+    def __init__(self, out_dir: Path = PROFILE_DIR) -> None:
+        self.out_dir     = out_dir
+        self.enabled     = False        # a capture is armed or running
+        self.capturing   = False        # ...and frames now count toward it
+        self.frames_left = 0
+        self.what        = ""
+        self.last_paths: tuple[Path, ...] = ()
+
+        self._waiting    = False        # transition capture, before the transition
+        self._saw_transition = False
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._frames:   dict[str, int]   = defaultdict(int)
+        self._seconds:  dict[str, float] = defaultdict(float)
+        self._current: Optional[cProfile.Profile] = None
+        self._tag        = ""
+        self._started    = 0.0
+        self._stats: Optional[pstats.Stats] = None
+
+    # --- Capture window ---
+
+    def capture(self, frames: int = DEFAULT_FRAMES) -> None:
+        if self.enabled:
+            return
+        self._start(f"{frames}frames", frames, waiting=False)
+        log.info("profiler: profiling the next %d frames", frames)
+
+    def capture_transition(self) -> None:
+        if self.enabled:
+            return
+        self._start("transition", TRANSITION_FRAMES, waiting=True)
+        log.info("profiler: waiting for the next room transition")
+
+    def _start(self, what: str, frames: int, waiting: bool) -> None:
+        self.enabled     = True
+        self.what        = what
+        self.frames_left = frames
+        self._waiting    = waiting
+        self.capturing   = not waiting
+        self._profiles.clear()
+        self._frames.clear()
+        self._seconds.clear()
+
+    def on_room_transition(self) -> None:
+        if self.enabled:
+            self._saw_transition = True
+
+    # --- Frames ---
+
+    def begin_frame(self, state: str, room_type: Optional[str] = None) -> None:
+        if not self.enabled:
+            return
+        self._tag = f"{state}/{room_type}" if room_type else state
+        if self._waiting:
+            profile = cProfile.Profile()        # kept only if a transition happens
+        else:
+            profile = self._profiles.get(self._tag)
+            if profile is None:
+                profile = self._profiles[self._tag] = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:                      # python -m cProfile, a debugger...
+            log.warning("profiler: another profiler is active, capture cancelled")
+            self.enabled = self.capturing = False
+            return
+        self._current = profile
+        self._started = time.perf_counter()
+
+    def end_frame(self) -> None:
+        profile = self._current
+        if profile is None:
+            return
+        profile.disable()
+        self._current = None
+        elapsed = time.perf_counter() - self._started
+
+        if self._waiting:
+            if not self._saw_transition:
+                return                          # not the frame we are after
+            self._waiting = False
+            self.capturing = True
+            self._profiles[self._tag] = profile     # frames after it add to it
+        self._saw_transition = False
+        self._frames[self._tag]  += 1
+        self._seconds[self._tag] += elapsed
+        self.frames_left -= 1
+        if self.frames_left <= 0:
+            self._finish()
+
+    def flush(self) -> None:
+        # end a capture early, writing the frames recorded so far
+        if self._current is not None:
+            self._current.disable()
+            self._current = None
+        if self.capturing and self._frames:
+            self._finish()
+        self.enabled = self.capturing = False
+
+    def _finish(self) -> None:
+        self.enabled = self.capturing = False
+        try:
+            self.last_paths = self.write()
+        except (OSError, ValueError):
+            log.exception("profiler: could not write the profile")
+            return
+        log.info(self.report())
+
+    # --- Output ---
+
+    def write(self, stem: Optional[str] = None) -> tuple[Path, Path]:
+        stem = stem or f"{time.strftime('%Y%m%d-%H%M%S')}-{self.what}"
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        stats_path     = self.out_dir / f"{stem}.pstats"
+        collapsed_path = self.out_dir / f"{stem}.collapsed"
+
+        if not self._profiles:
+            raise ValueError("nothing was profiled")
+        lines = []
+        for tag, profile in sorted(self._profiles.items()):
+            for stack, seconds in collapse(pstats.Stats(profile), tag).items():
+                us = round(seconds * 1e6)
+                if us > 0:
+                    lines.append(f"{stack} {us}")
+        merged = pstats.Stats(*self._profiles.values())
+        merged.dump_stats(stats_path)
+        collapsed_path.write_text("\n".join(lines) + "\n")
+        self._stats = merged
+        return stats_path, collapsed_path
+
+    def report(self) -> str:
+        lines = [f"profile {self.what} -> {', '.join(str(p) for p in self.last_paths)}"]
+        for tag in sorted(self._frames):
+            frames = self._frames[tag]
+            lines.append(f"  {tag:<22} {frames:4d} frames  {self._seconds[tag] * 1000 / frames:7.2f} ms/frame")
+        out = io.StringIO()
+        self._stats.stream = out
+        self._stats.sort_stats("tottime").print_stats(TOP_FUNCTIONS)
+        lines.append(out.getvalue().rstrip())
+        return "\n".join(lines)
+
+
+PROFILER = Profiler()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+import logging
+
+"""
+Adaptive quality governor.
+
+Watches the rolling average frame time and steps through QUALITY_LEVELS
+(0 = best). Hysteresis keeps it from flapping:
+  * step down when the average stays over budget * DOWN_RATIO for
+    DOWN_HOLD frames
+  * step up only when it stays under budget * UP_RATIO for UP_HOLD frames
+  * after any change, wait COOLDOWN frames before judging again
+
+Every decision is logged and kept in `decisions`.
+
+To use:
+    governor = QualityGovernor(budget_ms=16.6)
+    governor.feed(frame_ms)          # once per frame
+    if governor.level.hp_bars: ...
+"""
+
+log = logging.getLogger(__name__)
+
+WINDOW     = 30        # frames in the rolling average
+DOWN_RATIO = 1.0
+UP_RATIO   = 0.7
+DOWN_HOLD  = 30
+UP_HOLD    = 180
+COOLDOWN   = 120
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    name:           str
+    hp_bars:        bool    # enemy HP bars
+    debug_overlay:  bool    # full F1 overlay (the quality line is always shown)
+    particle_scale: float   # fraction of particles emitted
+    render_scale:   float   # internal render resolution (see render scaling)
+
+
+QUALITY_LEVELS: tuple[QualityLevel, ...] = (
+    QualityLevel("high",    True,  True,  1.00, 1.00),
+    QualityLevel("medium",  True,  True,  0.50, 1.00),
+    QualityLevel("low",     False, True,  0.25, 0.75),
+    QualityLevel("minimal", False, False, 0.00, 0.50),
+)
+
+
+class QualityGovernor:
+
+    def __init__(self, budget_ms: float, levels: tuple[QualityLevel, ...] = QUALITY_LEVELS) -> None:
+        self.budget_ms = budget_ms
+        self.levels    = levels
+        self.index     = 0
+        self.enabled   = True
+
+        self._window: deque[float] = deque(maxlen=WINDOW)
+        self._sum     = 0.0
+        self._over    = 0
+        self._under   = 0
+        self._cooldown = 0
+        self.frames   = 0
+        self.decisions: deque[tuple[int, str, str, float]] = deque(maxlen=32)
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.index]
+
+    @property
+    def average_ms(self) -> float:
+        return self._sum / len(self._window) if self._window else 0.0
+
+    def feed(self, frame_ms: float) -> None:
+        self.frames += 1
+        if len(self._window) == self._window.maxlen:
+            self._sum -= self._window[0]
+        self._window.append(frame_ms)
+        self._sum += frame_ms
+
+        if not self.enabled or len(self._window) < WINDOW:
+            return
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return
+
+        avg = self.average_ms
+        if avg > self.budget_ms * DOWN_RATIO:
+            self._over  += 1
+            self._under  = 0
+        elif avg < self.budget_ms * UP_RATIO:
+            self._under += 1
+            self._over   = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= DOWN_HOLD and self.index < len(self.levels) - 1:
+            self._change(self.index + 1, avg)
+        elif self._under >= UP_HOLD and self.index > 0:
+            self._change(self.index - 1, avg)
+
+    def set_level(self, index: int) -> None:
+        self._change(max(0, min(index, len(self.levels) - 1)), self.average_ms)
+
+    def _change(self, index: int, avg: float) -> None:
+        old = self.level.name
+        self.index     = index
+        self._over     = self._under = 0
+        self._cooldown = COOLDOWN
+        self.decisions.append((self.frames, old, self.level.name, avg))
+        log.info("quality %s -> %s (avg frame %.2fms, budget %.2fms)",
+                 old, self.level.name, avg, self.budget_ms)
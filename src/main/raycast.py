@@ -0,0 +1,230 @@
+from __future__ import annotations
+import math
+from typing import NamedTuple, Optional, Sequence
+
+"""
+Line-of-sight / raycast queries against a room's static walls.
+
+The walls are rasterized once into a uniform grid of CELL_SIZE buckets, each
+bucket holding the indices of the wall rects that overlap it. A ray walks the
+grid with a DDA and only slab-tests the walls in the cells it passes through,
+so the cost depends on how far the ray travels, not on how many walls the
+room has.
+
+To use:
+    caster = RayCaster(room.all_walls, room.screen_w, room.screen_h)
+    hit    = caster.raycast((x, y), (dx, dy))          # RayHit or None
+    hits   = caster.raycast_many(origins, dirs)         # list[RayHit | None]
+    seen   = caster.visible_many(enemy_points, player_point)
+
+Rooms build one lazily, see Room.raycaster.
+"""
+
+CELL_SIZE = 32
+
+Point = tuple[float, float]
+
+
+class RayHit(NamedTuple):
+    distance: float
+    x:        float
+    y:        float
+    wall:     int       # index into the walls the caster was built from
+
+
+class RayCaster:
+
+    def __init__(self, walls: Sequence, width: int, height: int,
+                 cell_size: int = CELL_SIZE) -> None:
+        self.width     = width
+        self.height    = height
+        self.cell_size = cell_size
+        self.cols      = max(1, math.ceil(width  / cell_size))
+        self.rows      = max(1, math.ceil(height / cell_size))
+        self.max_dist  = math.hypot(width, height)
+
+        # packed (left, top, right, bottom) per wall
+        self.rects: list[tuple[int, int, int, int]] = [
+            (w.rect.left, w.rect.top, w.rect.right, w.rect.bottom) for w in walls
+        ]
+        self.cells: list[tuple[int, ...]] = self._rasterize()
+
+    def _rasterize(self) -> list[tuple[int, ...]]:
+        cs     = self.cell_size
+        cols   = self.cols
+        rows   = self.rows
+        bucket: list[list[int]] = [[] for _ in range(cols * rows)]
+
+        for i, (l, t, r, b) in enumerate(self.rects):
+            if r <= l or b <= t:
+                continue
+            c0 = max(0, l // cs)
+            c1 = min(cols - 1, (r - 1) // cs)
+            r0 = max(0, t // cs)
+            r1 = min(rows - 1, (b - 1) // cs)
+            for row in range(r0, r1 + 1):
+                base = row * cols
+                for col in range(c0, c1 + 1):
+                    bucket[base + col].append(i)
+
+        return [tuple(ids) for ids in bucket]
+
+    # --- Queries ---
+
+    def raycast(self, origin: Point, direction: Point,
+                max_dist: Optional[float] = None) -> Optional[RayHit]:
+        dx, dy = direction
+        length = math.hypot(dx, dy)
+        if length == 0:
+            return None
+        return self._cast(origin[0], origin[1], dx / length, dy / length,
+                          self.max_dist if max_dist is None else max_dist)
+
+    def raycast_many(self, origins: Sequence[Point], dirs: Sequence[Point],
+                     max_dist: Optional[float] = None) -> list[Optional[RayHit]]:
+        limit = self.max_dist if max_dist is None else max_dist
+        cast  = self._cast
+        hypot = math.hypot
+        out: list[Optional[RayHit]] = []
+        append = out.append
+        for (ox, oy), (dx, dy) in zip(origins, dirs):
+            length = hypot(dx, dy)
+            if length == 0:
+                append(None)
+            else:
+                append(cast(ox, oy, dx / length, dy / length, limit))
+        return out
+
+    def line_of_sight(self, a: Point, b: Point) -> bool:
+        dx = b[0] - a[0]
+        dy = b[1] - a[1]
+        dist = math.hypot(dx, dy)
+        if dist == 0:
+            return True
+        return self._cast(a[0], a[1], dx / dist, dy / dist, dist) is None
+
+    def visible_many(self, origins: Sequence[Point], target: Point) -> list[bool]:
+        # one LOS check per origin against a shared target (e.g. the player)
+        tx, ty = target
+        cast   = self._cast
+        hypot  = math.hypot
+        out: list[bool] = []
+        append = out.append
+        for ox, oy in origins:
+            dx = tx - ox
+            dy = ty - oy
+            dist = hypot(dx, dy)
+            append(dist == 0 or cast(ox, oy, dx / dist, dy / dist, dist) is None)
+        return out
+
+    # --- DDA ---
+
+    def _cast(self, ox: float, oy: float, dx: float, dy: float,
+              max_dist: float) -> Optional[RayHit]:
+        cs    = self.cell_size
+        cols  = self.cols
+        rows  = self.rows
+        cells = self.cells
+        rects = self.rects
+        inf   = math.inf
+
+        inv_dx = 1.0 / dx if dx != 0 else inf
+        inv_dy = 1.0 / dy if dy != 0 else inf
+
+        # clip the ray to the grid bounds
+        t = 0.0
+        if not (0 <= ox < self.width and 0 <= oy < self.height):
+            t = self._enter_bounds(ox, oy, dx, dy, inv_dx, inv_dy)
+            if t is None or t > max_dist:
+                return None
+
+        px = ox + dx * t
+        py = oy + dy * t
+        col = min(cols - 1, max(0, int(px // cs)))
+        row = min(rows - 1, max(0, int(py // cs)))
+
+        if dx > 0:
+            step_c, t_max_x, t_dx = 1,  ((col + 1) * cs - ox) * inv_dx, cs * inv_dx
+        elif dx < 0:
+            step_c, t_max_x, t_dx = -1, (col * cs - ox) * inv_dx, -cs * inv_dx
+        else:
+            step_c, t_max_x, t_dx = 0, inf, inf
+        if dy > 0:
+            step_r, t_max_y, t_dy = 1,  ((row + 1) * cs - oy) * inv_dy, cs * inv_dy
+        elif dy < 0:
+            step_r, t_max_y, t_dy = -1, (row * cs - oy) * inv_dy, -cs * inv_dy
+        else:
+            step_r, t_max_y, t_dy = 0, inf, inf
+
+        best_t    = inf
+        best_wall = -1
+        while True:
+            for i in cells[row * cols + col]:
+                l, tp, r, b = rects[i]
+                # slab test
+                if dx != 0:
+                    t0 = (l - ox) * inv_dx
+                    t1 = (r - ox) * inv_dx
+                    if t0 > t1:
+                        t0, t1 = t1, t0
+                elif l <= ox <= r:
+                    t0, t1 = -inf, inf
+                else:
+                    continue
+                if dy != 0:
+                    u0 = (tp - oy) * inv_dy
+                    u1 = (b  - oy) * inv_dy
+                    if u0 > u1:
+                        u0, u1 = u1, u0
+                elif tp <= oy <= b:
+                    u0, u1 = -inf, inf
+                else:
+                    continue
+                near = t0 if t0 > u0 else u0
+                far  = t1 if t1 < u1 else u1
+                if near > far or far < 0:
+                    continue
+                if near < 0:
+                    near = 0.0
+                if near < best_t:
+                    best_t    = near
+                    best_wall = i
+
+            t_exit = t_max_x if t_max_x < t_max_y else t_max_y
+            if best_t <= t_exit:
+                break
+            if t_exit > max_dist:
+                return None
+
+            if t_max_x < t_max_y:
+                col     += step_c
+                t_max_x += t_dx
+                if not 0 <= col < cols:
+                    break
+            else:
+                row     += step_r
+                t_max_y += t_dy
+                if not 0 <= row < rows:
+                    break
+
+        if best_t > max_dist:
+            return None
+        return RayHit(best_t, ox + dx * best_t, oy + dy * best_t, best_wall)
+
+    def _enter_bounds(self, ox: float, oy: float, dx: float, dy: float,
+                      inv_dx: float, inv_dy: float) -> Optional[float]:
+        if dx != 0:
+            t0, t1 = sorted(((0 - ox) * inv_dx, (self.width - ox) * inv_dx))
+        elif 0 <= ox < self.width:
+            t0, t1 = -math.inf, math.inf
+        else:
+            return None
+        if dy != 0:
+            u0, u1 = sorted(((0 - oy) * inv_dy, (self.height - oy) * inv_dy))
+        elif 0 <= oy < self.height:
+            u0, u1 = -math.inf, math.inf
+        else:
+            return None
+        near = max(t0, u0, 0.0)
+        far  = min(t1, u1)
+        return near if near < far else None
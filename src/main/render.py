@@ -0,0 +1,98 @@
+from __future__ import annotations
+import math
+import pygame
+
+"""
+Internal render resolution.
+
+Gameplay, room layouts and collision all stay in logical coordinates
+(960x540). While playing, the world is drawn into an internal canvas of
+logical size * render scale; RenderScaler.present() then upscales that canvas
+to the window in a single pass:
+
+    "smooth"   smoothscale to fill the window
+    "integer"  nearest-neighbour by the largest whole factor that fits,
+               centred with black borders (crisp pixels)
+
+When the canvas already matches the window it *is* the window surface and
+present() does nothing, so the default setup pays no extra cost.
+
+Draw code takes an optional View that maps logical coordinates to the
+canvas (render scale, then the camera's scroll, see camera.py); None means
+identity.
+"""
+
+SCALE_FILTERS = ("smooth", "integer")
+
+
+class View:
+    """Logical -> canvas transform: uniform scale around the origin, then a
+    shift of (x, y) canvas pixels to the camera."""
+
+    __slots__ = ("scale", "x", "y")
+
+    def __init__(self, scale: float = 1.0, x: int = 0, y: int = 0) -> None:
+        self.scale = scale
+        self.x     = x
+        self.y     = y
+
+    def rect(self, r) -> pygame.Rect:
+        s = self.scale
+        x = round(r[0] * s) - self.x
+        y = round(r[1] * s) - self.y
+        return pygame.Rect(x, y, max(1, math.ceil(r[2] * s)), max(1, math.ceil(r[3] * s)))
+
+    def point(self, p) -> tuple[int, int]:
+        return round(p[0] * self.scale) - self.x, round(p[1] * self.scale) - self.y
+
+    def length(self, n: float) -> int:
+        return max(1, round(n * self.scale))
+
+
+class RenderScaler:
+
+    def __init__(
+        self,
+        logical_size: tuple[int, int],
+        window:       pygame.Surface,
+        scale_filter: str = "smooth",
+    ) -> None:
+        if scale_filter not in SCALE_FILTERS:
+            raise ValueError(f"unknown scale filter {scale_filter!r}, expected one of {SCALE_FILTERS}")
+        self.logical_size = logical_size
+        self.window       = window
+        self.scale_filter = scale_filter
+        self._canvases: dict[tuple[int, int], pygame.Surface] = {}
+
+    def canvas_size(self, scale: float) -> tuple[int, int]:
+        lw, lh = self.logical_size
+        return max(1, round(lw * scale)), max(1, round(lh * scale))
+
+    def canvas(self, scale: float) -> pygame.Surface:
+        size = self.canvas_size(scale)
+        if size == self.window.get_size():
+            return self.window
+        surf = self._canvases.get(size)
+        if surf is None:
+            surf = pygame.Surface(size).convert(self.window)
+            self._canvases[size] = surf
+        return surf
+
+    def present(self, canvas: pygame.Surface) -> None:
+        if canvas is self.window:
+            return
+        ww, wh = self.window.get_size()
+        if self.scale_filter == "smooth":
+            pygame.transform.smoothscale(canvas, (ww, wh), self.window)
+            return
+
+        cw, ch = canvas.get_size()
+        factor = max(1, min(ww // cw, wh // ch))
+        dest   = pygame.Rect(0, 0, cw * factor, ch * factor)
+        dest.center = (ww // 2, wh // 2)
+        dest   = dest.clip(self.window.get_rect())
+        self.window.fill((0, 0, 0))
+        if factor == 1:
+            self.window.blit(canvas, dest)
+        else:
+            pygame.transform.scale(canvas, dest.size, self.window.subsurface(dest))
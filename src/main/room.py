@@ -1,8 +1,17 @@
 from __future__ import annotations
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Optional
-from main.entities import Wall, Hazard, Enemy
+from typing import Optional, Sequence
+from main.entities import Wall, Hazard, Enemy, hazard_kind, DETACHED
+from main.ecs import World, ENEMY, WALL, HAZARD
+from main.ai_scheduler import AIScheduler
+from main import systems
+from main.raycast import RayCaster
+from main.layout_templates import LayoutTemplate
+from main.frame_monitor import FRAME_MONITOR
+from main.fonts import get_font
+from main.render import View
+from main.camera import StaticLayer
 import pygame
 
 
@@ -29,12 +38,13 @@ class Direction(Enum):
 
 
 ROOM_W, ROOM_H     = 960, 540        # normal room pixel size (matches screen)
-BOSS_W, BOSS_H     = 960, 540        # boss room is same screen size; we just
-                                      # mark it visually differently
+BOSS_SCALE         = 2               # the boss room is 2x2 screens, scrolled by the Camera
+BOSS_W, BOSS_H     = ROOM_W * BOSS_SCALE, ROOM_H * BOSS_SCALE
 
 DOOR_SIZE          = 64              # width/height of the door opening
 LOADING_ZONE_DEPTH = 20             # how deep the trigger rect is
 WALL_THICKNESS     = 16
+ENTRY_PAD          = 80              # how far inside a door the player arrives
 
 # Colors
 COL_FLOOR_NORMAL   = pygame.Color("#1a1a2e")
@@ -47,6 +57,46 @@ COL_DOOR_FRAME     = pygame.Color("#7a5c2e")
 COL_LOADING_ZONE   = pygame.Color("#ffffff")   # debug so alpha low
 COL_LABEL          = pygame.Color("#ffffff")
 
+HP_BAR_MARGIN      = 8               # px above an enemy its hp bar can reach
+
+
+def border_wall_rects(doors, sw: int, sh: int) -> list[tuple[int, int, int, int]]:
+    # outer wall segments with a DOOR_SIZE gap wherever `doors` has a door
+    wt = WALL_THICKNESS
+    ds = DOOR_SIZE
+    cx = sw // 2
+    cy = sh // 2
+
+    rects: list[tuple[int, int, int, int]] = []
+    def side(has_door: bool, horizontal: bool, fixed: int, lo: int, hi: int) -> None:
+        if has_door:
+            mid = cx if horizontal else cy
+            gap_lo = mid - ds // 2
+            gap_hi = mid + ds // 2
+            # segment before gap
+            if lo < gap_lo:
+                if horizontal:
+                    rects.append((lo, fixed, gap_lo - lo, wt))
+                else:
+                    rects.append((fixed, lo, wt, gap_lo - lo))
+            # segment after gap
+            if gap_hi < hi:
+                if horizontal:
+                    rects.append((gap_hi, fixed, hi - gap_hi, wt))
+                else:
+                    rects.append((fixed, gap_hi, wt, hi - gap_hi))
+        else:
+            if horizontal:
+                rects.append((lo, fixed, hi - lo, wt))
+            else:
+                rects.append((fixed, lo, wt, hi - lo))
+
+    side(Direction.NORTH in doors, True, 0, 0, sw)         # top
+    side(Direction.SOUTH in doors, True, sh - wt, 0, sw)   # bottom
+    side(Direction.WEST  in doors, False, 0, 0, sh)        # left
+    side(Direction.EAST  in doors, False, sw - wt, 0, sh)  # right
+    return rects
+
 
 @dataclass
 class Door:
@@ -88,9 +138,10 @@ class Room:
         grid_pos:  tuple[int, int],
         screen_w:  int = ROOM_W,
         screen_h:  int = ROOM_H,
-        walls:     list[Wall]   = None,
-        hazards:   list[Hazard] = None,
-        enemies:   list[Enemy]  = None,
+        walls:     Sequence[Wall]   = None,
+        hazards:   Sequence[Hazard] = None,
+        enemies:   list[Enemy]      = None,
+        template:  Optional[LayoutTemplate] = None,
     ) -> None:
         self.id        = room_id
         self.type      = room_type
@@ -98,59 +149,95 @@ class Room:
         self.screen_w  = screen_w
         self.screen_h  = screen_h
 
-        self.walls   : list[Wall]   = walls   or []
-        self.hazards : list[Hazard] = hazards or []
-        self.enemies : list[Enemy]  = enemies or []
+        # walls/hazards are shared with the template when there is one,
+        # enemies are this room's own mutable overlay. The room simulates
+        # all of them through its World (see ecs.py / systems.py), filled
+        # in the first time the room is updated or drawn.
+        self.template = template
+        self.walls   : Sequence[Wall]   = walls   or ()
+        self.hazards : Sequence[Hazard] = hazards or ()
+        self.enemies : list[Enemy]      = []
+        self.world = World()
+        self._packed_enemies: Optional[list[Enemy]]      = None
+        self._packed_walls:   Optional[list[Wall]]       = None
+        self._packed_hazards: Optional[Sequence[Hazard]] = None
+        self._set_enemies(enemies or [])
 
         self.doors: dict[Direction, Door] = {}
-        self._surface: Optional[pygame.Surface] = None
+        self._static: Optional[StaticLayer] = None      # floor / walls / doors, see camera.py
+        self._border_walls: list[Wall] = []
+        self._all_walls: Optional[list[Wall]] = None
+        self._raycaster: Optional[RayCaster] = None
 
  # --- Walls ---
-    def build_border_walls(self) -> None:
-        wt = WALL_THICKNESS
-        ds = DOOR_SIZE
-        sw = self.screen_w
-        sh = self.screen_h
-        cx = sw // 2
-        cy = sh // 2
-
-        walls: list[Wall] = []
-        def side(has_door: bool, horizontal: bool, fixed: int, lo: int, hi: int) -> None:
-            if has_door:
-                mid = cx if horizontal else cy
-                gap_lo = mid - ds // 2
-                gap_hi = mid + ds // 2
-                # segment before gap
-                if lo < gap_lo:
-                    if horizontal:
-                        walls.append(Wall(lo, fixed, gap_lo - lo, wt))
-                    else:
-                        walls.append(Wall(fixed, lo, wt, gap_lo - lo))
-                # segment after gap
-                if gap_hi < hi:
-                    if horizontal:
-                        walls.append(Wall(gap_hi, fixed, hi - gap_hi, wt))
-                    else:
-                        walls.append(Wall(fixed, gap_hi, wt, hi - gap_hi))
-            else:
-                if horizontal:
-                    walls.append(Wall(lo, fixed, hi - lo, wt))
-                else:
-                    walls.append(Wall(fixed, lo, wt, hi - lo))
-
-
+    def build_border_walls(self, pool=None) -> None:
+        make = pool.wall if pool is not None else Wall
+        self._border_walls = [make(*r) for r in border_wall_rects(self.doors, self.screen_w, self.screen_h)]
+        self._all_walls = None
+        self._raycaster = None
 
-        side(Direction.NORTH in self.doors, True, 0,0,sw)  # top
-        side(Direction.SOUTH in self.doors, True, sh - wt, 0, sw)  # bottom
-        side(Direction.WEST  in self.doors, False, 0, 0, sh)  # left
-        side(Direction.EAST  in self.doors, False, sw - wt, 0, sh)  # right
-
-        self._border_walls = walls
+    def set_layout(
+        self,
+        template: Optional[LayoutTemplate],
+        walls:    Sequence[Wall],
+        hazards:  Sequence[Hazard],
+        enemies:  list[Enemy],
+    ) -> None:
+        # swap the interior after construction, e.g. a procedural one
+        self.template = template
+        self.walls    = walls
+        self.hazards  = hazards
+        self._set_enemies(enemies)
+        self._all_walls = None
+        self._raycaster = None
+        self.invalidate_surface()
+
+    def _set_enemies(self, enemies: list[Enemy]) -> None:
+        # rows of enemies that are no longer ours leave the world
+        keep = {id(e) for e in enemies}
+        for enemy in self.enemies:
+            if id(enemy) not in keep and enemy.world is self.world:
+                enemy.attach(DETACHED)
+        self.enemies = enemies
+
+    def _sync_world(self) -> None:
+        # (re)pack enemies / walls / hazards into the world when the lists change
+        if self._packed_enemies is not self.enemies:
+            Enemy.attach_all(self.enemies, self.world)
+            self._packed_enemies = self.enemies
+        walls = self.all_walls
+        if self._packed_walls is not walls:
+            self.world.clear(WALL)
+            self.world.spawn_many(WALL, len(walls), rect=[tuple(w.rect) for w in walls])
+            self._packed_walls = walls
+        if self._packed_hazards is not self.hazards:
+            hazards = self.hazards
+            self.world.clear(HAZARD)
+            self.world.spawn_many(
+                HAZARD, len(hazards),
+                rect   = [tuple(h.rect) for h in hazards],
+                damage = [h.damage for h in hazards],
+                kind   = [hazard_kind(h.hazard_type) for h in hazards],
+            )
+            self._packed_hazards = hazards
 
     @property
     def all_walls(self) -> list[Wall]:
-        border = self._border_walls or []
-        return border + self.walls
+        # walls are static, so build the combined list once
+        if self._all_walls is None:
+            self._all_walls = [*self._border_walls, *self.walls]
+        return self._all_walls
+
+    # --- Line of sight ---
+    @property
+    def raycaster(self) -> RayCaster:
+        # built once from the static walls, see raycast.py
+        if self._raycaster is None:
+            self._raycaster = RayCaster(self.all_walls, self.screen_w, self.screen_h)
+        return self._raycaster
+
+    def can_see(self, a: tuple[float, float], b: tuple[float, float]) -> bool:
+        return self.raycaster.line_of_sight(a, b)
     
     #  --- Doors ---
     def add_door(self, direction: Direction, target_room_id: int) -> None:
@@ -168,18 +255,33 @@ class Room:
                 return direction, door.target_room_id
         return None
 
-    def update(self, dt: float, player) -> None:
-        player_pos = pygame.Vector2(player.rect.center)
-        for enemy in self.enemies:
-            enemy.update(dt, player_pos)
-
-        for hazard in self.hazards:
-            if hazard.collides(player.rect):
-                player.take_damage(hazard.damage)
-
-
-    def _build_surface(self) -> pygame.Surface:
-        surf = pygame.Surface((self.screen_w, self.screen_h))
+    def update(self, dt: float, player, ai: Optional[AIScheduler] = None) -> None:
+        player_pos = player.rect.center
+        self._sync_world()
+        if ai is not None:
+            ai.update(dt, self.world, player_pos)
+        else:
+            enemies = self.world.find(ENEMY)
+            if enemies is not None:
+                systems.think(enemies, player_pos)
+                systems.move(enemies, dt)
+        self.apply_hazards(player)
+
+    def apply_hazards(self, player) -> None:
+        self._sync_world()
+        systems.apply_hazards(self.world, player)
+
+    def collide(self, player) -> None:
+        # push the player out of the walls, see systems.push_out
+        self._sync_world()
+        if systems.push_out(self.world, player.rect):
+            player.pos.update(player.rect.center)
+
+
+    def _paint_static(self, surf: pygame.Surface, area: pygame.Rect) -> None:
+        # the logical rect `area` of the floor, walls, doors and label,
+        # drawn onto `surf` (one StaticLayer tile) shifted to its top left
+        shift = View(1.0, area.x, area.y)
         floor_col = {
             RoomType.NORMAL:    COL_FLOOR_NORMAL,
             RoomType.START:     COL_FLOOR_START,
@@ -196,42 +298,58 @@ class Room:
             pygame.Rect(self.screen_w - wt,0, wt,self.screen_h),  # right
         ]
         for r in wall_rects:
-            pygame.draw.rect(surf, COL_WALL, r)
+            if r.colliderect(area):
+                pygame.draw.rect(surf, COL_WALL, shift.rect(r))
 
         for wall in self.walls:
-                    wall.draw(surf)
-      
+            if wall.rect.colliderect(area):
+                wall.draw(surf, shift)
+
         for door in self.doors.values():
-            pygame.draw.rect(surf, floor_col,    door.rect)  # erase wall
-            pygame.draw.rect(surf, COL_DOOR_FRAME, door.rect, 2)    # frame outline
+            if door.rect.colliderect(area):
+                pygame.draw.rect(surf, floor_col,    shift.rect(door.rect))  # erase wall
+                pygame.draw.rect(surf, COL_DOOR_FRAME, shift.rect(door.rect), 2)    # frame outline
 
         if pygame.font.get_init():
-            font  = pygame.font.SysFont(None, 28)
-            label = font.render(f"[{self.type.value.upper()}]  id:{self.id}", True, COL_LABEL)
-            surf.blit(label, (wt + 8, wt + 8))
-
-        return surf
-
-    def draw(self, surface: pygame.Surface, debug: bool = False) -> None:
-       
-        if self._surface is None:
-            self._surface = self._build_surface()
-        surface.blit(self._surface, (0, 0))
-
-        for hazard in self.hazards:
-            hazard.draw(surface)
-        for enemy in self.enemies:
-            enemy.draw(surface)
+            font  = get_font(28)
+            text  = f"[{self.type.value.upper()}]  id:{self.id}"
+            label = pygame.Rect((wt + 8, wt + 8), font.size(text))
+            if label.colliderect(area):
+                surf.blit(font.render(text, True, COL_LABEL), shift.point(label.topleft))
+
+    def draw(self, surface: pygame.Surface, debug: bool = False, hp_bars: bool = True,
+             view: Optional[View] = None, area: Optional[pygame.Rect] = None) -> None:
+        # `area` is the logical rect on screen (Camera.area); the static
+        # layer, hazards and enemies outside it are skipped. None: everything
+        if self._static is None:
+            self._static = StaticLayer(self.screen_w, self.screen_h, self._paint_static)
+        whole = area is None or area.contains(0, 0, self.screen_w, self.screen_h)
+        if whole:
+            area = pygame.Rect(0, 0, self.screen_w, self.screen_h)
+        if self._static.draw(surface, view, area):
+            FRAME_MONITOR.mark("surface_build")
+
+        self._sync_world()
+        hazards = self.world.find(HAZARD)
+        if hazards is not None:
+            rows = None if whole else systems.visible(hazards, area)
+            for i in (range(len(self.hazards)) if rows is None else rows.tolist()):
+                self.hazards[i].draw(surface, view)
+        enemies = self.world.find(ENEMY)
+        if enemies is not None:
+            rows = None if whole else systems.visible(enemies, area, HP_BAR_MARGIN)
+            systems.draw_enemies(enemies, surface, hp_bars, view, rows)
 
         if debug:
-            overlay = pygame.Surface((self.screen_w, self.screen_h), pygame.SRCALPHA)
+            overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
             for door in self.doors.values():
-                pygame.draw.rect(overlay, (*COL_LOADING_ZONE[:3], 40), door.loading_zone)
-                pygame.draw.rect(overlay, (*COL_LOADING_ZONE[:3], 120), door.loading_zone, 2)
+                zone = door.loading_zone if view is None else view.rect(door.loading_zone)
+                pygame.draw.rect(overlay, (*COL_LOADING_ZONE[:3], 40), zone)
+                pygame.draw.rect(overlay, (*COL_LOADING_ZONE[:3], 120), zone, 2)
             surface.blit(overlay, (0, 0))
 
     def invalidate_surface(self) -> None:
-        self._surface = None
+        self._static = None
         
     #  Helpers                                                                 
     def __repr__(self) -> str:
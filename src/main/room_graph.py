@@ -0,0 +1,102 @@
+from __future__ import annotations
+from collections import deque
+from typing import Optional
+import numpy as np
+from main.room import Room, Direction
+
+"""
+Room-level routing: the dungeon's door graph with all-pairs tables.
+
+Built once per dungeon from the rooms' doors. One BFS per room fills three
+(rooms x rooms) tables, indexed [from room id, to room id]:
+
+    dist   doors to walk through on the shortest way, -1: unreachable
+    hop    the next room on that way (from itself: itself)
+    door   the door to take out of `from`, an index into DIRECTIONS
+
+A dungeon has at most a few dozen rooms, so the tables are a few KB and
+every routing question is one lookup. Ties break in door order and the
+tables never change during a run, so the same seed routes the same way
+on every machine and lockstep peers stay in step.
+
+Anything that has to cross rooms (an enemy or a companion following the
+player, the "distance to boss" hint) asks for the next door here, then
+navigates inside the room on its own. The tables are plain numpy arrays,
+so a whole archetype can be routed at once (graph.hop[rooms, target]).
+
+To use:
+    graph = RoomGraph(dungeon.rooms)
+    graph.distance(a, b)                 # doors between a and b
+    graph.exit_towards(a, b)             # Direction of the door to take, None if a == b
+    graph.path(a, b)                     # [a, ..., b]
+"""
+
+UNREACHABLE = -1
+DIRECTIONS  = tuple(Direction)
+
+
+class RoomGraph:
+
+    def __init__(self, rooms: dict[int, Room]) -> None:
+        size = max(rooms) + 1 if rooms else 0
+        self.size = size
+        self.dist = np.full((size, size), UNREACHABLE, dtype=np.int16)
+        self.hop  = np.full((size, size), UNREACHABLE, dtype=np.int16)
+        self.door = np.full((size, size), UNREACHABLE, dtype=np.int8)
+
+        # neighbours in door order, so ties break the same way on every run
+        links = {
+            rid: [(door.target_room_id, DIRECTIONS.index(direction))
+                  for direction, door in room.doors.items() if door.target_room_id in rooms]
+            for rid, room in rooms.items()
+        }
+        for source in rooms:
+            self._fill(source, links)
+
+    def _fill(self, source: int, links: dict[int, list[tuple[int, int]]]) -> None:
+        # BFS from `source`; every room inherits the first step of its parent
+        dist = [UNREACHABLE] * self.size
+        hop  = [UNREACHABLE] * self.size
+        door = [UNREACHABLE] * self.size
+        dist[source] = 0
+        hop[source]  = source
+        queue = deque([source])
+        while queue:
+            rid = queue.popleft()
+            for nb, direction in links[rid]:
+                if dist[nb] != UNREACHABLE:
+                    continue
+                dist[nb] = dist[rid] + 1
+                if rid == source:
+                    hop[nb], door[nb] = nb, direction
+                else:
+                    hop[nb], door[nb] = hop[rid], door[rid]
+                queue.append(nb)
+        self.dist[source] = dist
+        self.hop[source]  = hop
+        self.door[source] = door
+
+    # --- Queries ---
+
+    def distance(self, a: int, b: int) -> int:
+        return int(self.dist[a, b])
+
+    def next_hop(self, a: int, b: int) -> int:
+        return int(self.hop[a, b])
+
+    def exit_towards(self, a: int, b: int) -> Optional[Direction]:
+        d = int(self.door[a, b])
+        return DIRECTIONS[d] if d != UNREACHABLE else None
+
+    def path(self, a: int, b: int) -> list[int]:
+        # rooms from a to b inclusive, [] if b can't be reached
+        if self.dist[a, b] == UNREACHABLE:
+            return []
+        path = [a]
+        while a != b:
+            a = int(self.hop[a, b])
+            path.append(a)
+        return path
+
+    def nbytes(self) -> int:
+        return self.dist.nbytes + self.hop.nbytes + self.door.nbytes
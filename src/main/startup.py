@@ -0,0 +1,53 @@
+from __future__ import annotations
+import os
+import sys
+import time
+
+"""
+Cold-start instrumentation. Deliberately stdlib only so it can be imported
+before pygame and time the pygame import itself.
+
+Marks are only recorded until the first frame is presented. Run with
+--startup-report (or STARTUP_REPORT=1) to print the breakdown:
+
+    python main.py --startup-report
+"""
+
+
+class StartupTimer:
+
+    def __init__(self) -> None:
+        self.t0   = time.perf_counter()
+        self.last = self.t0
+        self.marks: list[tuple[str, float]] = []
+        self.done = False
+        self.enabled = "--startup-report" in sys.argv or os.environ.get("STARTUP_REPORT") == "1"
+
+    def mark(self, name: str) -> None:
+        if self.done:
+            return
+        now = time.perf_counter()
+        self.marks.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    def first_frame(self) -> None:
+        if self.done:
+            return
+        self.mark("first frame")
+        self.done = True
+        if self.enabled:
+            print(self.report())
+
+    @property
+    def total_ms(self) -> float:
+        return (self.last - self.t0) * 1000
+
+    def report(self) -> str:
+        lines = ["Cold start (ms):"]
+        for name, ms in self.marks:
+            lines.append(f"  {name:<24} {ms:8.2f}")
+        lines.append(f"  {'time to first frame':<24} {self.total_ms:8.2f}")
+        return "\n".join(lines)
+
+
+STARTUP = StartupTimer()
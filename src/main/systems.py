@@ -0,0 +1,188 @@
+from __future__ import annotations
+from typing import Optional
+import numpy as np
+import pygame
+from main.ecs import Archetype, World, WALL, HAZARD
+from main.entities import ENEMY_COLORS, HAZARD_TYPES, Enemy
+from main.audio import AUDIO
+from main.particles import PARTICLES
+
+"""
+Systems: one pass over an archetype's packed columns (see ecs.py).
+
+    think         enemies face the target (the expensive AI step)
+    move          enemies follow their heading, rects follow pos
+    damage        hp, death, hit / death effects
+    push_out      resolve a rect against the room's walls
+    visible       the rows on screen, for culling draws
+    apply_hazards player damage from the hazards they stand on, per tick
+    draw_enemies  enemy boxes and hp bars
+
+The math matches the old per-object methods operation for operation
+(pygame's Vector2 is float64 too), so lockstep peers and replays see the
+same positions whether an enemy is moved here or through its facade.
+`rows` selects a subset of an archetype's rows; None means all of them.
+
+To use:
+    arch = room.world.find(ENEMY)
+    systems.think(arch, player.rect.center)
+    systems.move(arch, dt)
+"""
+
+PUSH_MARGIN = 32        # px, see push_out
+
+
+def _alive_rows(arch: Archetype, rows: Optional[np.ndarray]) -> np.ndarray:
+    alive = arch["alive"]
+    return np.flatnonzero(alive) if rows is None else rows[alive[rows]]
+
+
+def _overlapping(rects: np.ndarray, x: int, y: int, w: int, h: int) -> np.ndarray:
+    # pygame.Rect.colliderect against every row, as a mask
+    if w <= 0 or h <= 0:
+        return np.zeros(len(rects), dtype=bool)
+    rx, ry, rw, rh = rects[:, 0], rects[:, 1], rects[:, 2], rects[:, 3]
+    return (rw > 0) & (rh > 0) & (rx < x + w) & (x < rx + rw) & (ry < y + h) & (y < ry + rh)
+
+
+def visible(arch: Archetype, area, margin: int = 0) -> np.ndarray:
+    # rows whose rect overlaps `area` grown by `margin` on every side (culling)
+    x, y, w, h = area
+    return np.flatnonzero(_overlapping(arch["rect"], x - margin, y - margin, w + 2 * margin, h + 2 * margin))
+
+
+# --- Enemies ---
+
+def think(arch: Archetype, target, rows: Optional[np.ndarray] = None) -> None:
+    rows = _alive_rows(arch, rows)
+    if not len(rows):
+        return
+    direction = np.asarray(target, dtype=np.float64) - arch["pos"][rows]
+    length_sq = direction[:, 0] * direction[:, 0] + direction[:, 1] * direction[:, 1]
+    nonzero   = length_sq > 0
+    direction[nonzero] /= np.sqrt(length_sq[nonzero])[:, None]
+    arch["heading"][rows] = direction
+
+
+def move(arch: Archetype, dt: float, rows: Optional[np.ndarray] = None) -> None:
+    rows = _alive_rows(arch, rows)
+    if not len(rows):
+        return
+    pos  = arch["pos"]
+    rect = arch["rect"]
+    pos[rows] += arch["heading"][rows] * arch["speed"][rows, None] * dt
+    centre = np.rint(pos[rows]).astype(np.int32)
+    rect[rows, 0] = centre[:, 0] - rect[rows, 2] // 2
+    rect[rows, 1] = centre[:, 1] - rect[rows, 3] // 2
+
+
+def damage(arch: Archetype, rows: np.ndarray, amount: int) -> None:
+    hp = arch["hp"]
+    hp[rows] -= amount
+    for row in rows.tolist():
+        AUDIO.play("hit")
+        x, y, w, h = arch["rect"][row].tolist()
+        centre = (x + w // 2, y + h // 2)
+        if hp[row] <= 0:
+            arch["alive"][row] = False
+            PARTICLES.emit("enemy_death", centre, color=ENEMY_COLORS[arch["kind"][row]])
+        else:
+            PARTICLES.emit("enemy_hit", centre)
+
+
+def draw_enemies(arch: Optional[Archetype], surface: pygame.Surface, hp_bars: bool = True,
+                 view=None, rows: Optional[np.ndarray] = None) -> None:
+    if arch is None:
+        return
+    rows = _alive_rows(arch, rows)
+    rects  = arch["rect"][rows].tolist()
+    kinds  = arch["kind"][rows].tolist()
+    hps    = arch["hp"][rows].tolist()
+    max_hp = arch["max_hp"][rows].tolist()
+    back_color, fill_color = Enemy.COLOR_HP_BACK, Enemy.COLOR_HP_FILL
+    for (x, y, w, h), kind, hp, top in zip(rects, kinds, hps, max_hp):
+        pygame.draw.rect(surface, ENEMY_COLORS[kind], (x, y, w, h) if view is None else view.rect((x, y, w, h)))
+        if not hp_bars:
+            continue
+        fill = int(w * max(hp, 0) / top)
+        back = (x, y - 6, w, 4)
+        bar  = (x, y - 6, fill, 4)
+        if view is not None:
+            back = view.rect(back)
+            bar  = view.rect(bar) if fill > 0 else (0, 0, 0, 0)
+        pygame.draw.rect(surface, back_color, back)
+        pygame.draw.rect(surface, fill_color, bar)
+
+
+# --- Static geometry ---
+
+def push_out(world: World, rect: pygame.Rect) -> bool:
+    # Player.wall_collisions over the WALL rows: walls are tried in order
+    # and each overlap pushes `rect` out along the shallower axis. Only walls
+    # near the start position can be hit while the rect stays within
+    # PUSH_MARGIN of it, so those are picked out with one array test and
+    # walked in Python; past the margin it falls back to scanning the rest.
+    # Either way the result is the same as testing every wall one by one.
+    arch = world.find(WALL)
+    if arch is None:
+        return False
+    walls  = arch["rect"]
+    x0, y0 = rect.x, rect.y
+    m      = PUSH_MARGIN
+    near   = np.flatnonzero(_overlapping(walls, x0 - m, y0 - m, rect.w + 2 * m, rect.h + 2 * m))
+    moved  = False
+    for i, wall in zip(near.tolist(), walls[near].tolist()):
+        if _push(rect, *wall):
+            moved = True
+            if abs(rect.x - x0) >= m or abs(rect.y - y0) >= m:
+                _push_scan(rect, walls, i + 1)
+                break
+    return moved
+
+
+def _push(rect: pygame.Rect, wx: int, wy: int, ww: int, wh: int) -> bool:
+    if not (ww > 0 and wh > 0 and wx < rect.right and rect.left < wx + ww
+            and wy < rect.bottom and rect.top < wy + wh):
+        return False
+    dx_left  = rect.right - wx
+    dx_right = wx + ww - rect.left
+    dy_up    = rect.bottom - wy
+    dy_down  = wy + wh - rect.top
+
+    min_x = dx_left if dx_left < dx_right else -dx_right
+    min_y = dy_up   if dy_up   < dy_down  else -dy_down
+
+    if abs(min_x) < abs(min_y):
+        rect.x -= min_x
+    else:
+        rect.y -= min_y
+    return True
+
+
+def _push_scan(rect: pygame.Rect, walls: np.ndarray, start: int) -> None:
+    # the slow exact path: next overlapping wall after `start`, repeatedly
+    while start < len(walls):
+        hits = np.flatnonzero(_overlapping(walls[start:], *rect))
+        if not len(hits):
+            return
+        i = start + int(hits[0])
+        _push(rect, *walls[i].tolist())
+        start = i + 1
+
+
+def apply_hazards(world: World, player) -> None:
+    # once per Player.HAZARD_TICK_S while standing in hazards, not every
+    # frame: one tick deals the damage of every hazard under the player
+    if not player.hazard_ready:
+        return
+    arch = world.find(HAZARD)
+    if arch is None:
+        return
+    rows = np.flatnonzero(_overlapping(arch["rect"], *player.rect))
+    if not len(rows):
+        return
+    player.start_hazard_tick()
+    player.take_damage(int(arch["damage"][rows].sum()))
+    AUDIO.play("hazard")
+    for kind in arch["kind"][rows].tolist():
+        PARTICLES.emit(HAZARD_TYPES[kind], player.rect.midbottom)
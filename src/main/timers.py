@@ -0,0 +1,165 @@
+from __future__ import annotations
+from typing import Callable, Optional
+
+"""
+Hierarchical timer wheel on the simulation clock.
+
+Cooldowns (invulnerability, hazard ticks, fire rate, reloads) are one
+timer each rather than a counter every entity decrements every frame.
+schedule() and cancel() are O(1). advance() touches only the slots the
+clock passes through and runs the callbacks that came due, so a thousand
+idle cooldowns cost nothing per frame.
+
+The wheel has LEVELS levels of SLOTS slots each. Level 0 holds timers due
+in the next SLOTS ticks (TICK_MS ms each). Level n holds timers due within
+SLOTS ** (n + 1) ticks, one slot per SLOTS ** n ticks. A higher slot is
+emptied into the levels below when the clock reaches it. Anything further
+out than the top level waits in the top level's last slot and is placed
+again when that slot comes round.
+
+Time only moves in advance(), with the same dt the simulation steps by.
+Lockstep peers step with the same dt, so their timers fire on the same
+frame. Callbacks run in due order, and in schedule order within a tick.
+
+To use:
+    timer = TIMERS.schedule(0.5, player.end_invulnerability)
+    TIMERS.schedule(0.25, gate.open, every=0.25)        # repeats until cancelled
+    timer.cancel()
+    TIMERS.advance(dt)                                  # once per simulation step
+"""
+
+TICK_MS = 1
+BITS    = 6
+SLOTS   = 1 << BITS
+MASK    = SLOTS - 1
+LEVELS  = 4             # 64**4 ms: timers up to 4.6 hours out in one placement
+
+
+class Timer:
+    __slots__ = ("due", "interval", "callback", "args", "_wheel", "_bucket")
+
+    def __init__(self, wheel: "TimerWheel", due: int, interval: int, callback: Callable, args: tuple) -> None:
+        self.due      = due             # tick
+        self.interval = interval        # ticks between repeats, 0: fires once
+        self.callback = callback
+        self.args     = args
+        self._wheel   = wheel
+        self._bucket: Optional[dict[Timer, None]] = None
+
+    @property
+    def active(self) -> bool:
+        return self._bucket is not None
+
+    def cancel(self) -> None:
+        if self._bucket is not None:
+            del self._bucket[self]
+            self._bucket = None
+            self._wheel._count -= 1
+
+
+class TimerWheel:
+
+    def __init__(self, tick_ms: int = TICK_MS) -> None:
+        self.tick_ms = tick_ms
+        # dicts rather than sets: O(1) removal and they keep insertion order
+        self._wheel: list[list[dict[Timer, None]]] = [[{} for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self._now   = 0           # last tick processed
+        self._time  = 0.0         # simulation seconds, fractional ticks included
+        self._count = 0
+        self.fired  = 0
+
+    @property
+    def now(self) -> float:
+        return self._now * self.tick_ms / 1000
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _ticks(self, seconds: float) -> int:
+        return max(1, round(seconds * 1000 / self.tick_ms))
+
+    # --- Scheduling ---
+
+    def schedule(self, delay: float, callback: Callable, *args, every: Optional[float] = None) -> Timer:
+        # run callback(*args) `delay` seconds from now (at least one tick);
+        # with `every`, again each `every` seconds until cancelled
+        interval = self._ticks(every) if every is not None else 0
+        timer = Timer(self, self._now + self._ticks(delay), interval, callback, args)
+        self._place(timer)
+        self._count += 1
+        return timer
+
+    def cancel(self, timer: Optional[Timer]) -> None:
+        # None is fine, so `TIMERS.cancel(self._timer)` needs no check
+        if timer is not None:
+            timer.cancel()
+
+    def _place(self, timer: Timer) -> None:
+        due   = timer.due
+        delta = due - self._now
+        for level in range(LEVELS):
+            if delta < SLOTS << (BITS * level):
+                bucket = self._wheel[level][(due >> (BITS * level)) & MASK]
+                break
+        else:
+            # further out than the wheel spans: park it in the top level's
+            # last slot before wrapping round, it is placed again from there
+            top    = BITS * (LEVELS - 1)
+            bucket = self._wheel[-1][((self._now >> top) - 1) & MASK]
+        bucket[timer] = None
+        timer._bucket = bucket
+
+    # --- Time ---
+
+    def advance(self, dt: float) -> int:
+        # move the clock on by dt seconds; returns how many timers fired
+        self._time += dt
+        target = int(self._time * 1000 / self.tick_ms)
+        fired  = 0
+        if not self._count:
+            self._now = max(self._now, target)      # nothing to cascade or fire
+            return 0
+        wheel = self._wheel
+        while self._now < target:
+            now = self._now = self._now + 1
+            # a level wraps round: empty the next level's current slot downwards
+            level = 0
+            while level < LEVELS - 1 and (now >> (BITS * level)) & MASK == 0:
+                level += 1
+                bucket = wheel[level][(now >> (BITS * level)) & MASK]
+                if bucket:
+                    timers = list(bucket)
+                    bucket.clear()
+                    for timer in timers:
+                        self._place(timer)
+            bucket = wheel[0][now & MASK]
+            while bucket:
+                timer = next(iter(bucket))
+                del bucket[timer]
+                timer._bucket = None
+                if timer.interval:
+                    timer.due += timer.interval
+                    self._place(timer)
+                else:
+                    self._count -= 1
+                timer.callback(*timer.args)
+                fired += 1
+            if not self._count:
+                self._now = target
+                break
+        self.fired += fired
+        return fired
+
+    def clear(self) -> None:
+        # drop every timer and restart the clock, e.g. for a new run
+        for level in self._wheel:
+            for bucket in level:
+                for timer in bucket:
+                    timer._bucket = None
+                bucket.clear()
+        self._now   = 0
+        self._time  = 0.0
+        self._count = 0
+
+
+TIMERS = TimerWheel()
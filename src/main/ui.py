@@ -1,5 +1,6 @@
 from __future__ import annotations
 import pygame
+from main.fonts import get_font
 
 
 
@@ -27,12 +28,12 @@ class TitleScreen:
         screen.fill(pygame.Color("#1a1a2e"))
 
         # Title
-        title_font = pygame.font.SysFont(None, 64)
+        title_font = get_font(64)
         title_surf = title_font.render("super cool game title", True, pygame.Color("#e0e0e0"))
         screen.blit(title_surf, (self.w // 2 - title_surf.get_width() // 2, self.h // 6))
 
         # Subtitle / hint
-        hint_font = pygame.font.SysFont(None, 20)
+        hint_font = get_font(20)
         hint = hint_font.render("SPACE Select", True, pygame.Color("#555555"))
         screen.blit(hint, (self.w // 2 - hint.get_width() // 2, self.h - 28))
 
@@ -222,9 +223,9 @@ class SettingsMenu:
         return None
 
     def _reset_row(self) -> None:
-        from main.keybindings import _DEFAULTS
+        from main.keybindings import DEFAULT_BINDINGS
         group, action, _ = _BIND_ROWS[self.selected]
-        default_key = _DEFAULTS[group][action]
+        default_key = DEFAULT_BINDINGS[group][action]
         # Only reset if the default isn't already taken by something else
         conflict = self.bindings.is_key_used(default_key,
                                              exclude_group=group,
@@ -255,6 +256,6 @@ class SettingsMenu:
         screen.blit(text_surface, text_rect)
 
     def _draw_centered(self, screen, text, y, color, big=False):
-        font = pygame.font.SysFont(None, 32 if big else 20)
+        font = get_font(32 if big else 20)
         s = font.render(text, True, color)
         screen.blit(s, (self.w // 2 - s.get_width() // 2, y))
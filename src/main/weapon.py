@@ -1,42 +1,75 @@
 import pygame
 from main.bullet import Bullet
+from main.assets import ASSETS
+from main.audio import AUDIO
+from main.timers import TIMERS
 
 class Weapon:
-    def __init__(self, name: str, damage: int, maxAmmo: int, clipSize: int, range: int, isProj: bool, bullet: Bullet, fireRate: int) -> None:
+    def __init__(self, name: str, damage: int, maxAmmo: int, clipSize: int, range: int, isProj: bool, bullet: Bullet, fireRate: int,
+                 reloadTime: float = 1.0) -> None:
         self.name = name
         self.damage = damage
         self.range = range
-        self.fireRate = fireRate
-        self.sprite = pygame.rect((16, 16)) # TODO : replace with actual sprite
+        self.fireRate = fireRate        # shots per second
+        self.reloadTime = reloadTime    # seconds
+        self.sprite = ASSETS.placeholder(f"weapon:{name}", (16, 16), "#cccccc") # TODO : replace with actual sprite
 
         #A max ammo of -1 is used for a melee/infinite ammo weapon
-        self.currAmmo : int
         self.maxAmmo = maxAmmo
-
-        self.reserveClips : int 
         self.clipSize = clipSize
+        self.currAmmo : int = clipSize
+        self.reserveClips : int = max(0, maxAmmo // clipSize - 1) if maxAmmo != -1 else 0
 
         self.bullet: Bullet = bullet
-  
+
+        # fire rate gate and reload, as timers on TIMERS (timers.py)
+        self._shot_timer = None
+        self._reload_timer = None
+
+    @property
+    def ready(self) -> bool:
+        return self._shot_timer is None and self._reload_timer is None
+
+    @property
+    def reloading(self) -> bool:
+        return self._reload_timer is not None
+
     def reload(self) -> None:
-        if self.maxAmmo == -1:
+        # takes reloadTime; the clip is refilled when it finishes
+        if self.maxAmmo == -1 or self.reloading:
             return
         if self.reserveClips <= 0:
             return
         if self.currAmmo == self.clipSize:
             return
+        self._reload_timer = TIMERS.schedule(self.reloadTime, self._finish_reload)
+
+    def _finish_reload(self) -> None:
+        self._reload_timer = None
         self.reserveClips -= 1
         self.currAmmo = self.clipSize
-        
-    def shoot(self) -> None:
+
+    def shoot(self) -> bool:
+        # returns whether a shot went off; at most fireRate a second
         if self.maxAmmo == -1:
-            return
+            return False
+        if not self.ready:
+            return False
         if self.currAmmo > 0:
             # TODO : spawn bullet here
-            
+            AUDIO.play("shoot")
             self.currAmmo -= 1
-        else:
-            reload()
-        
-        
-        
\ No newline at end of file
+            self._shot_timer = TIMERS.schedule(1.0 / self.fireRate, self._end_shot)
+            return True
+        self.reload()
+        return False
+
+    def _end_shot(self) -> None:
+        self._shot_timer = None
+
+    def cancel(self) -> None:
+        # drop a pending shot gate / reload, e.g. when the weapon is put away
+        TIMERS.cancel(self._shot_timer)
+        TIMERS.cancel(self._reload_timer)
+        self._shot_timer = None
+        self._reload_timer = None
@@ -0,0 +1,118 @@
+from __future__ import annotations
+import argparse
+import sys
+import time
+from pathlib import Path
+
+"""
+Offline dungeon seed index.
+
+Run from src/:
+    python -m seed_index build --seeds 0:200000 --workers 4     # only adds missing seeds
+    python -m seed_index query "start_boss>=8" leaves=3:4 --limit 20
+    python -m seed_index query mini_dist=1 --order branching --desc
+    python -m seed_index query "span_cols>=6" --count
+    python -m seed_index info
+
+Conditions are col>=v, col<=v, col=v or col=a:b (inclusive); see
+seed_index.features.COLUMNS for the columns. A seed found here plays the
+same dungeon in the game (same room count) with --seed=<seed>.
+"""
+
+import numpy as np
+
+from seed_index.features import COLUMNS
+from seed_index.store import SeedIndex, DEFAULT_PATH, SEGMENT_SIZE, parse_condition
+
+
+def _seed_range(text: str) -> tuple[int, int]:
+    start, _, stop = text.partition(":")
+    return int(start or 0), int(stop)
+
+
+def _print_rows(rows: dict[str, np.ndarray]) -> None:
+    names = list(rows)
+    print("  ".join(f"{n:>10}" for n in names))
+    for i in range(len(rows["seed"])):
+        cells = []
+        for n in names:
+            v = rows[n][i]
+            cells.append(f"{v:>10.2f}" if COLUMNS[n].startswith("f") else f"{v:>10d}")
+        print("  ".join(cells))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m seed_index")
+    parser.add_argument("--index", type=Path, default=DEFAULT_PATH, help="index directory")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_build = sub.add_parser("build", help="index a seed range")
+    p_build.add_argument("--seeds", type=_seed_range, required=True, help="start:stop")
+    p_build.add_argument("--workers", type=int, help="default: one per CPU")
+    p_build.add_argument("--rooms", type=int, help="normal rooms per dungeon (new index only)")
+    p_build.add_argument("--segment", type=int, default=SEGMENT_SIZE, help="seeds per segment")
+
+    p_query = sub.add_parser("query", help="find seeds by feature")
+    p_query.add_argument("where", nargs="*", help="conditions, all must hold")
+    p_query.add_argument("--order", help="sort matches by this column")
+    p_query.add_argument("--desc", action="store_true", help="largest first")
+    p_query.add_argument("--limit", type=int, default=20)
+    p_query.add_argument("--count", action="store_true", help="only print the number of matches")
+
+    sub.add_parser("info", help="describe the index")
+
+    args = parser.parse_args(argv)
+
+    try:
+        index = SeedIndex(args.index, num_normal_rooms=getattr(args, "rooms", None))
+        where = {}
+        for text in getattr(args, "where", []):
+            name, lo, hi = parse_condition(text)
+            where[name] = (lo, hi)
+    except ValueError as e:
+        print(e)
+        return 2
+
+    if args.cmd == "build":
+        start = time.perf_counter()
+        def progress(done: int, total: int) -> None:
+            print(f"\r{done}/{total} seeds", end="", flush=True)
+        try:
+            added = index.build(*args.seeds, workers=args.workers,
+                                segment_size=args.segment, progress=progress)
+        except ValueError as e:
+            print(e)
+            return 2
+        elapsed = time.perf_counter() - start
+        print(f"\nadded {added} seeds in {elapsed:.1f}s, index holds {len(index)}")
+        return 0
+
+    if args.cmd == "info":
+        print(f"{index.path}: {len(index)} seeds in {len(index.segments)} segments, {index.params}")
+        print(f"covered: {', '.join(f'{a}:{b}' for a, b in index.covered()) or 'nothing'}")
+        if index.stale():
+            print("STALE: the dungeon generator changed since this index was built")
+        return 0
+
+    start = time.perf_counter()
+    limit = None if (args.count or args.order) else args.limit
+    rows  = index.query(where, limit=limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.count:
+        print(f"{len(rows['seed'])} matches ({elapsed:.1f}ms)")
+        return 0
+    if args.order:
+        if args.order not in COLUMNS:
+            print(f"unknown column {args.order!r}")
+            return 2
+        order = np.argsort(rows[args.order], kind="stable")
+        if args.desc:
+            order = order[::-1]
+        rows = {n: v[order[:args.limit]] for n, v in rows.items()}
+    _print_rows(rows)
+    print(f"({len(rows['seed'])} shown, {elapsed:.1f}ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+from __future__ import annotations
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+"""
+Columnar on-disk seed index.
+
+An index is a directory: meta.json plus one .npy file per column per
+segment, where a segment is a contiguous seed range built in one go
+(SEGMENT_SIZE seeds by default). meta.json lists the segments with each
+column's min/max ("zone map"), so a query skips whole segments without
+opening them, then tests the rest vectorised over memory-mapped columns.
+
+Building only generates the seeds no segment covers yet, in parallel on a
+process pool, and rewrites meta.json (atomically) after every segment; an
+interrupted or extended build picks up where the last one stopped.
+
+An index is tied to its generator params (normal room count, grid size)
+and to the generator itself through a fingerprint of the first seeds'
+features. If dungeon generation changes, the index reports stale() and
+must be rebuilt from scratch.
+
+To use:
+    index = SeedIndex(path)
+    index.build(0, 100_000, workers=4)
+    hits  = index.query({"start_boss": (8, None), "leaves": (4, 5)})
+    hits["seed"]
+"""
+
+from seed_index.features import COLUMNS, features_for_range
+from main.dungeon_generator import GRID_COLS, GRID_ROWS
+
+DEFAULT_PATH  = Path(__file__).resolve().parent / "index"
+SEGMENT_SIZE  = 10_000
+FORMAT        = 1
+DEFAULT_ROOMS = 6           # what Game generates
+_CHECK_SEEDS  = 64          # seeds hashed into the fingerprint
+
+
+def fingerprint(params: dict) -> int:
+    cols = features_for_range(0, _CHECK_SEEDS, **params)
+    crc  = 0
+    for name in COLUMNS:
+        crc = zlib.crc32(cols[name].tobytes(), crc)
+    return crc
+
+
+def _merge(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def parse_condition(text: str) -> tuple[str, Optional[float], Optional[float]]:
+    # "col>=a", "col<=b", "col=a", "col=a:b" (inclusive, either side may be empty)
+    for op in (">=", "<=", "==", "="):
+        name, sep, value = text.partition(op)
+        if sep:
+            break
+    else:
+        raise ValueError(f"bad condition {text!r}, expected col>=v, col<=v, col=v or col=a:b")
+    name = name.strip()
+    if name not in COLUMNS:
+        raise ValueError(f"unknown column {name!r}, one of: {', '.join(COLUMNS)}")
+    value = value.strip()
+    if op == ">=":
+        return name, float(value), None
+    if op == "<=":
+        return name, None, float(value)
+    lo, colon, hi = value.partition(":")
+    if not colon:
+        return name, float(lo), float(lo)
+    return name, float(lo) if lo else None, float(hi) if hi else None
+
+
+class SeedIndex:
+
+    def __init__(
+        self,
+        path:             Path = DEFAULT_PATH,
+        num_normal_rooms: Optional[int] = None,
+        grid_cols:        int = GRID_COLS,
+        grid_rows:        int = GRID_ROWS,
+    ) -> None:
+        self.path  = Path(path)
+        self._maps: dict[tuple[str, str], np.ndarray] = {}
+
+        meta_path = self.path / "meta.json"
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            if meta.get("format") != FORMAT or list(meta["columns"]) != list(COLUMNS):
+                raise ValueError(f"{self.path} was written by another version, rebuild it")
+            self.params   = meta["params"]
+            self.check    = meta["check"]
+            self.segments = meta["segments"]
+            wanted = dict(num_normal_rooms=num_normal_rooms or self.params["num_normal_rooms"],
+                          grid_cols=grid_cols, grid_rows=grid_rows)
+            if wanted != self.params:
+                raise ValueError(f"{self.path} indexes {self.params}, not {wanted}")
+        else:
+            self.params   = dict(num_normal_rooms=num_normal_rooms or DEFAULT_ROOMS,
+                                 grid_cols=grid_cols, grid_rows=grid_rows)
+            self.check    = None
+            self.segments = []
+
+    # --- Layout ---
+
+    def __len__(self) -> int:
+        return sum(seg["rows"] for seg in self.segments)
+
+    def covered(self) -> list[tuple[int, int]]:
+        return _merge([(seg["start"], seg["stop"]) for seg in self.segments])
+
+    def missing(self, start: int, stop: int) -> list[tuple[int, int]]:
+        gaps, cursor = [], start
+        for lo, hi in self.covered():
+            if hi <= cursor:
+                continue
+            if lo >= stop:
+                break
+            if lo > cursor:
+                gaps.append((cursor, lo))
+            cursor = max(cursor, hi)
+        if cursor < stop:
+            gaps.append((cursor, stop))
+        return gaps
+
+    def stale(self) -> bool:
+        return self.check is not None and self.check != fingerprint(self.params)
+
+    def column(self, segment: dict, name: str) -> np.ndarray:
+        key = (segment["name"], name)
+        if key not in self._maps:
+            self._maps[key] = np.load(self.path / f"{segment['name']}.{name}.npy", mmap_mode="r")
+        return self._maps[key]
+
+    # --- Build ---
+
+    def build(
+        self,
+        start:        int,
+        stop:         int,
+        workers:      Optional[int] = None,
+        segment_size: int = SEGMENT_SIZE,
+        progress:     Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        # index seeds [start, stop) not covered yet; returns how many were added
+        if self.stale():
+            raise ValueError(f"{self.path} was built by a different dungeon generator, rebuild it")
+        chunks = [
+            (lo, min(lo + segment_size, hi))
+            for gap_lo, hi in self.missing(start, stop)
+            for lo in range(gap_lo, hi, segment_size)
+        ]
+        if not chunks:
+            return 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        if self.check is None:
+            self.check = fingerprint(self.params)
+
+        total = sum(hi - lo for lo, hi in chunks)
+        added = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(features_for_range, lo, hi, **self.params): (lo, hi)
+                for lo, hi in chunks
+            }
+            for future in as_completed(futures):
+                lo, hi = futures[future]
+                self._write_segment(lo, hi, future.result())
+                added += hi - lo
+                if progress is not None:
+                    progress(added, total)
+        return added
+
+    def _write_segment(self, start: int, stop: int, cols: dict[str, np.ndarray]) -> None:
+        name = f"{start:010d}-{stop:010d}"
+        for col, values in cols.items():
+            np.save(self.path / f"{name}.{col}.npy", values)
+        zones = {col: [values.min().item(), values.max().item()] for col, values in cols.items()}
+        self.segments.append({"name": name, "start": start, "stop": stop,
+                              "rows": stop - start, "zones": zones})
+        self.segments.sort(key=lambda seg: seg["start"])
+        self._save_meta()
+
+    def _save_meta(self) -> None:
+        meta = {
+            "format":   FORMAT,
+            "params":   self.params,
+            "check":    self.check,
+            "columns":  COLUMNS,
+            "segments": self.segments,
+        }
+        tmp = self.path / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta, indent=1))
+        os.replace(tmp, self.path / "meta.json")
+
+    # --- Query ---
+
+    def query(
+        self,
+        where:   dict[str, tuple[Optional[float], Optional[float]]],
+        columns: Optional[list[str]] = None,
+        limit:   Optional[int] = None,
+    ) -> dict[str, np.ndarray]:
+        # rows with lo <= col <= hi for every condition, in seed order
+        columns = columns or list(COLUMNS)
+        parts: dict[str, list[np.ndarray]] = {name: [] for name in columns}
+        found = 0
+        for seg in self.segments:
+            if limit is not None and found >= limit:
+                break
+            zones = seg["zones"]
+            if any((lo is not None and zones[name][1] < lo) or (hi is not None and zones[name][0] > hi)
+                   for name, (lo, hi) in where.items()):
+                continue
+            mask = np.ones(seg["rows"], dtype=bool)
+            for name, (lo, hi) in where.items():
+                values = self.column(seg, name)
+                if lo is not None:
+                    mask &= values >= lo
+                if hi is not None:
+                    mask &= values <= hi
+            rows = np.flatnonzero(mask)
+            if limit is not None:
+                rows = rows[:limit - found]
+            found += len(rows)
+            for name in columns:
+                parts[name].append(self.column(seg, name)[rows])
+
+        return {
+            name: np.concatenate(chunks) if chunks else np.empty(0, dtype=COLUMNS[name])
+            for name, chunks in parts.items()
+        }